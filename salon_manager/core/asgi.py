@@ -4,4 +4,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
+# Long-lived responses such as the reservation stream
+# (reservations.api.reservation_stream) are only served through this entry
+# point; each open stream costs a coroutine here instead of a worker thread.
+
 application = get_asgi_application()
@@ -110,6 +110,29 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+if os.getenv("REDIS_CACHE_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_CACHE_URL"),
+    }
+
+AVAILABILITY_CACHE_TIMEOUT = int(os.getenv("AVAILABILITY_CACHE_TIMEOUT", 60 * 60))
+SLOT_HOLD_TIMEOUT = int(os.getenv("SLOT_HOLD_TIMEOUT", 15 * 60))
+LIVE_UPDATES_REDIS_URL = os.getenv("LIVE_UPDATES_REDIS_URL")
+# "auto" uses orjson when installed, "stdlib" forces the json module.
+JSON_ENCODER_BACKEND = os.getenv("JSON_ENCODER_BACKEND", "auto")
+CALENDAR_FEED_PAST_DAYS = int(os.getenv("CALENDAR_FEED_PAST_DAYS", 30))
+CALENDAR_TOMBSTONE_RETENTION_DAYS = int(
+    os.getenv("CALENDAR_TOMBSTONE_RETENTION_DAYS", 7)
+)
+SCHEDULE_HORIZON_DAYS = int(os.getenv("SCHEDULE_HORIZON_DAYS", 90))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -191,8 +214,12 @@ CELERY_BEAT_SCHEDULE = {
         "task": "reservations.tasks.change_reservation_status",
         "schedule": crontab(hour=1, minute=0),
     },
-    "cleanup-expired-requests": {
-        "task": "reservations.tasks.cleanup_expired_requests",
-        "schedule": crontab(minute="*/20"),
+    "prune-calendar-tombstones": {
+        "task": "reservations.tasks.prune_calendar_tombstones",
+        "schedule": crontab(hour=2, minute=0),
+    },
+    "extend-availability-horizon": {
+        "task": "reservations.tasks.extend_availability_horizon",
+        "schedule": crontab(hour=0, minute=5),
     },
 }
@@ -1,5 +1,5 @@
 from django.contrib import admin
 
-from .models import Reservation, WorkDay
+from .models import Reservation, ScheduleException, WeeklySchedule, WorkDay
 
-admin.site.register((Reservation, WorkDay))
+admin.site.register((Reservation, WorkDay, WeeklySchedule, ScheduleException))
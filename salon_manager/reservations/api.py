@@ -1,23 +1,71 @@
+import hashlib
 import json
 import logging
-from datetime import date, datetime
-
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max, OuterRef, Q, QuerySet, Subquery
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.utils.translation import gettext as _
 from django.views.decorators.http import require_POST
+from services.models import Service
 from users.models import CustomUser, Employee
+from utils import live_updates
 from utils.error_codes import ErrorCode
+from utils.ical import CalendarEvent, build_calendar, local_datetime
+from utils.json_encoding import FastJsonResponse
 from utils.support_functions import (
     _build_request_reservation_context,
     _calculate_non_working_days,
-    check_for_conflicting_reservation,
-    generate_available_slots,
+    check_for_conflicting_work_day,
     handle_invalid_form,
     json_response,
+    streaming_json_response,
 )
 
-from .forms import SlotForm
-from .models import Reservation, WorkDay
+from .bulk_workdays import WorkDayChanges, WorkDayConflict, apply_work_day_changes
+from .calendar_events import (
+    RESERVATION_EVENT_FIELDS,
+    RESERVATIONS_CHANNEL,
+    WORKDAY_EVENT_FIELDS,
+    reservation_event,
+    scheduled_hours_event,
+    workday_event,
+)
+from .capacity import free_slot_matrix
+from .forms import (
+    AnyStaffSlotForm,
+    BulkWorkDayCreateForm,
+    BulkWorkDayMoveForm,
+    CalendarRangeForm,
+    CapacityForm,
+    CopyWeekForm,
+    ReservationFeedForm,
+    SlotForm,
+    SlotRangeForm,
+)
+from .models import (
+    CalendarTombstone,
+    Reservation,
+    ScheduleException,
+    WeeklySchedule,
+    WorkDay,
+)
+from .schedules import expand_schedules, horizon_end
 from .service import SlotAvailabilityService
 
 logger = logging.getLogger(__name__)
@@ -57,6 +105,86 @@ def get_available_slots(request):
         )
 
 
+def get_available_slots_any_staff(request: HttpRequest) -> JsonResponse:
+    slot_form = AnyStaffSlotForm(request.GET)
+    if not slot_form.is_valid():
+        return handle_invalid_form(slot_form)
+
+    selected_date = slot_form.cleaned_data["selected_date"]
+    slot_service = SlotAvailabilityService()
+
+    try:
+        result = slot_service.get_available_slots_any_staff(
+            selected_date, slot_form.cleaned_data["service_id"]
+        )
+    except Service.DoesNotExist:
+        return json_response(
+            message=_("Service not found"),
+            custom_data={"error": True, "available_slots": []},
+            success=False,
+            error_code=ErrorCode.SERVICE_NOT_FOUND,
+        )
+    except ValueError as e:
+        return json_response(
+            message=str(e),
+            custom_data={
+                "error": True,
+                "available_slots": [],
+                "date_chosen": selected_date.strftime("%a, %B %d, %Y"),
+            },
+            success=False,
+            error_code=ErrorCode.INVALID_DATE,
+        )
+
+    return json_response(
+        message=_("Successfully retrieved available slots"),
+        custom_data=result,
+        success=True,
+    )
+
+
+def get_available_slots_range(request: HttpRequest) -> JsonResponse:
+    range_form = SlotRangeForm(request.GET)
+    custom_data = {"error": True, "slots": {}, "non_working_days": []}
+
+    if not range_form.is_valid():
+        error_code = ErrorCode.INVALID_DATE
+        if "staff_member" in range_form.errors:
+            error_code = ErrorCode.STAFF_ID_REQUIRED
+        elif "service_id" in range_form.errors:
+            error_code = ErrorCode.SERVICE_ID_REQUIRED
+        message = list(range_form.errors.as_data().items())[0][1][0].messages[0]
+        return json_response(
+            message=message,
+            custom_data=custom_data,
+            success=False,
+            error_code=error_code,
+        )
+
+    slot_service = SlotAvailabilityService()
+
+    try:
+        result = slot_service.get_available_slots_range(
+            range_form.cleaned_data["start"],
+            range_form.cleaned_data["end"],
+            range_form.cleaned_data["staff_member"],
+            range_form.cleaned_data["service_id"],
+        )
+    except Service.DoesNotExist:
+        return json_response(
+            message=_("Service not found"),
+            custom_data=custom_data,
+            success=False,
+            error_code=ErrorCode.SERVICE_NOT_FOUND,
+        )
+
+    return json_response(
+        message=_("Successfully retrieved available slots"),
+        custom_data=result,
+        success=True,
+    )
+
+
 def get_next_available_date(request: HttpRequest, service_id) -> JsonResponse:
     staff_id = request.GET.get("staff_member")
 
@@ -142,28 +270,182 @@ def get_non_working_days(request):
     )
 
 
-def workday_api(request: HttpRequest) -> JsonResponse:
-    workdays = WorkDay.objects.all()
-    # workdays = WorkDay.objects.select_related('employee').all()
+# Full feeds are streamed, reading this many rows per database round trip.
+FEED_CHUNK_SIZE = 2000
+
+# Rows are stamped when saved but only become visible on commit, so the
+# cursor handed out lags the clock a little. Changes near the cursor are
+# sent twice, which clients absorb by replacing events with the same id.
+SYNC_CURSOR_OVERLAP = timedelta(seconds=30)
+
+
+def _calendar_window(
+    queryset: QuerySet, date_field: str, window: Dict[str, Any]
+) -> QuerySet:
+    """Limit a feed to FullCalendar's visible ``[start, end)`` range."""
+    if window["start"]:
+        queryset = queryset.filter(**{f"{date_field}__gte": window["start"]})
+    if window["end"]:
+        queryset = queryset.filter(**{f"{date_field}__lt": window["end"]})
+    return queryset
+
+
+def _in_calendar_window(day: date, window: Dict[str, Any]) -> bool:
+    return (not window["start"] or day >= window["start"]) and (
+        not window["end"] or day < window["end"]
+    )
+
+
+def _invalid_calendar_feed(feed_form: CalendarRangeForm) -> JsonResponse:
+    if "employee" in feed_form.errors:
+        message, error_code = _("Employee ids must be integers"), ErrorCode.INVALID_DATA
+    elif "updated_since" in feed_form.errors:
+        message, error_code = _("Invalid sync cursor"), ErrorCode.INVALID_DATA
+    else:
+        message, error_code = _("Invalid date range"), ErrorCode.INVALID_DATE
+    return json_response(
+        message=message, status=400, success=False, error_code=error_code
+    )
+
+
+def _calendar_delta(
+    feed: str,
+    changed_rows: Iterable[Dict[str, Any]],
+    in_feed: Callable[[Dict[str, Any]], bool],
+    to_event: Callable[[Dict[str, Any]], Dict[str, Any]],
+    updated_since: datetime,
+    derived: Optional[Callable[[], tuple[list[Dict[str, Any]], set[str]]]] = None,
+) -> JsonResponse:
+    """Events changed after ``updated_since`` and ids of events to drop.
+
+    A changed row that no longer matches the requested window or filters is
+    reported as deleted, just like a row that is gone. ``derived`` adds events
+    that have no rows of their own, with the synthetic ids to drop.
+    """
+    cursor = timezone.now() - SYNC_CURSOR_OVERLAP
+    retention = timedelta(days=settings.CALENDAR_TOMBSTONE_RETENTION_DAYS)
+    if updated_since < timezone.now() - retention:
+        return json_response(
+            message=_("Sync cursor expired, reload the calendar"),
+            status=410,
+            success=False,
+            error_code=ErrorCode.SYNC_CURSOR_EXPIRED,
+        )
+
     events = []
+    deleted = set(
+        CalendarTombstone.objects.filter(
+            feed=feed, deleted_at__gt=updated_since
+        ).values_list("object_id", flat=True)
+    )
+    for row in changed_rows:
+        if in_feed(row):
+            events.append(to_event(row))
+        else:
+            deleted.add(row["pk"])
+    derived_deleted: set[str] = set()
+    if derived is not None:
+        derived_events, derived_deleted = derived()
+        events.extend(derived_events)
+    return FastJsonResponse(
+        {
+            "events": events,
+            "deleted": sorted(deleted) + sorted(derived_deleted),
+            "cursor": cursor.isoformat(),
+        }
+    )
 
-    for workday in workdays:
-        events.append(
-            {
-                "id": workday.pk,
-                "title": f"{workday.employee.name}: {workday.start_time.strftime('%H:%M')} - {workday.end_time.strftime('%H:%M')}",
-                "start": f"{workday.date.isoformat()}T{workday.start_time.strftime('%H:%M:%S')}",
-                "end": f"{workday.date.isoformat()}T{workday.end_time.strftime('%H:%M:%S')}",
-                "extendedProps": {
-                    "startTime": workday.start_time.strftime("%H:%M"),
-                    "endTime": workday.end_time.strftime("%H:%M"),
-                    "employeeId": workday.employee.id,
-                    "employeeName": workday.employee.name,
-                },
-            }
+
+def _scheduled_hours_delta(
+    window: Dict[str, Any], updated_since: datetime
+) -> tuple[list[Dict[str, Any]], set[str]]:
+    """Schedule-derived events of the window once anything they are expanded
+    from changed after ``updated_since``.
+
+    They have no rows to track, and a moved work day does not say which date
+    it left, so all of the window's events are sent again together with the
+    synthetic ids that no longer show.
+    """
+    tombstones = CalendarTombstone.objects.filter(
+        feed__in=("WORKDAY", "SCHEDULE", "EXCEPTION"), deleted_at__gt=updated_since
+    ).values_list("feed", "object_id")
+    removed_schedules = {pk for feed, pk in tombstones if feed == "SCHEDULE"}
+    first, last = window["start"], window["end"] - timedelta(days=1)
+    # All schedules, not only the window's: an edited one may have left it.
+    schedules = list(WeeklySchedule.objects.values_list("pk", "weekday", "updated_at"))
+    # An edited schedule may also have moved to another weekday.
+    moved = {pk for pk, _weekday, updated_at in schedules if updated_at > updated_since}
+    if not (
+        tombstones
+        or moved
+        or WorkDay.objects.filter(updated_at__gt=updated_since).exists()
+        or ScheduleException.objects.filter(updated_at__gt=updated_since).exists()
+    ):
+        return [], set()
+
+    events = [scheduled_hours_event(hours) for hours in expand_schedules(first, last)]
+    # Every date a schedule might have shown on; dropping an id the client
+    # never had is harmless.
+    weekdays = {pk: weekday for pk, weekday, _updated_at in schedules}
+    candidates = set()
+    day = first
+    while day <= last:
+        candidates.update(
+            f"schedule-{pk}-{day.isoformat()}"
+            for pk in weekdays.keys() | removed_schedules
+            if pk in moved or pk in removed_schedules or weekdays[pk] == day.weekday()
+        )
+        day += timedelta(days=1)
+    return events, candidates - {event["id"] for event in events}
+
+
+def _with_sync_cursor(response: HttpResponse) -> HttpResponse:
+    """Full feeds carry the cursor for the first delta sync in a header."""
+    cursor = timezone.now() - SYNC_CURSOR_OVERLAP
+    response["X-Sync-Cursor"] = cursor.isoformat()
+    return response
+
+
+def workday_api(request: HttpRequest) -> HttpResponse:
+    range_form = CalendarRangeForm(request.GET)
+    if not range_form.is_valid():
+        return _invalid_calendar_feed(range_form)
+    window = range_form.cleaned_data
+
+    updated_since = window["updated_since"]
+    if updated_since:
+        # Changes are read without the window so that work days moved out of
+        # it can be reported as deleted.
+        return _calendar_delta(
+            "WORKDAY",
+            WorkDay.objects.filter(updated_at__gt=updated_since).values(
+                *WORKDAY_EVENT_FIELDS
+            ),
+            lambda workday: _in_calendar_window(workday["date"], window),
+            workday_event,
+            updated_since,
+            derived=(
+                (lambda: _scheduled_hours_delta(window, updated_since))
+                if window["start"] and window["end"]
+                else None
+            ),
         )
 
-    return JsonResponse(events, safe=False)
+    workdays = _calendar_window(WorkDay.objects.all(), "date", window)
+    events = (
+        workday_event(workday)
+        for workday in workdays.order_by("date", "start_time")
+        .values(*WORKDAY_EVENT_FIELDS)
+        .iterator(chunk_size=FEED_CHUNK_SIZE)
+    )
+    if window["start"] and window["end"]:
+        # Weekly schedules have no rows to stream; they are expanded for the
+        # visible range only, which an open-ended feed does not have.
+        scheduled = expand_schedules(window["start"], window["end"] - timedelta(days=1))
+        events = chain(events, map(scheduled_hours_event, scheduled))
+    return _with_sync_cursor(
+        streaming_json_response(events, asynchronous=isinstance(request, ASGIRequest))
+    )
 
 
 @require_POST
@@ -175,54 +457,417 @@ def update_workday_date(request: HttpRequest, pk: int) -> JsonResponse:
 
         if new_date:
             workday.date = datetime.strptime(new_date, "%Y-%m-%d").date()
+            if check_for_conflicting_work_day(
+                workday.employee_id,
+                workday.date,
+                workday.start_time,
+                workday.end_time,
+                exclude_id=workday.pk,
+            ):
+                return FastJsonResponse(
+                    {
+                        "status": "error",
+                        "message": "Working hours overlap another work day",
+                        "errorCode": ErrorCode.WORKING_HOURS_CONFLICT.value,
+                    },
+                    status=409,
+                )
             workday.save()
 
-            return JsonResponse(
+            return FastJsonResponse(
                 {"status": "success", "message": "Work day updated successfully!"}
             )
         else:
-            return JsonResponse(
+            return FastJsonResponse(
                 {"status": "error", "message": "Date is required"}, status=400
             )
 
     except WorkDay.DoesNotExist:
-        return JsonResponse(
+        return FastJsonResponse(
             {"status": "error", "message": "Work day not found"}, status=404
         )
     except Exception as e:
-        return JsonResponse({"status": "error", "message": str(e)}, status=500)
+        return FastJsonResponse({"status": "error", "message": str(e)}, status=500)
+
+
+def reservations_api(request: HttpRequest) -> HttpResponse:
+    feed_form = ReservationFeedForm(request.GET)
+    if not feed_form.is_valid():
+        return _invalid_calendar_feed(feed_form)
+    window = feed_form.cleaned_data
+    employee_ids = window["employee"]
+
+    updated_since = window["updated_since"]
+    if updated_since:
+        # A reservation also changes when its request is moved in time.
+        changed = Reservation.objects.filter(
+            Q(updated_at__gt=updated_since)
+            | Q(reservation_request__updated_at__gt=updated_since)
+        )
+        return _calendar_delta(
+            "RESERVATION",
+            changed.values(*RESERVATION_EVENT_FIELDS),
+            lambda reservation: _in_calendar_window(
+                reservation["reservation_request__date"], window
+            )
+            and (
+                not employee_ids
+                or reservation["reservation_request__employee_id"] in employee_ids
+            ),
+            reservation_event,
+            updated_since,
+        )
+
+    reservations = Reservation.objects.all()
+    if employee_ids:
+        reservations = reservations.filter(
+            reservation_request__employee_id__in=employee_ids
+        )
+    reservations = _calendar_window(reservations, "reservation_request__date", window)
+    events = (
+        reservation_event(reservation)
+        for reservation in reservations.order_by(
+            "reservation_request__date", "reservation_request__start_time"
+        )
+        .values(*RESERVATION_EVENT_FIELDS)
+        .iterator(chunk_size=FEED_CHUNK_SIZE)
+    )
+    return _with_sync_cursor(
+        streaming_json_response(events, asynchronous=isinstance(request, ASGIRequest))
+    )
 
 
-def reservations_api(request: HttpRequest) -> JsonResponse:
-    employee_id = request.GET.get("employee")
+# Proxies close connections that stay silent for too long.
+STREAM_KEEPALIVE_SECONDS = 15
 
-    if employee_id:
-        reservations = Reservation.objects.filter(
-            reservation_request__employee__id=employee_id
+
+async def reservation_stream(request: HttpRequest) -> HttpResponse:
+    """Server-sent events with every reservation created, confirmed,
+    cancelled or moved, for the owner's open calendars."""
+    user = await request.auser()
+    if not (user.is_authenticated and user.is_owner):
+        return json_response(
+            message=_("You are not authorized to view live updates"),
+            status=403,
+            success=False,
+            error_code=ErrorCode.NOT_AUTHORIZED,
         )
-    else:
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be tied up by the connection for good, so
+        # dashboards keep polling instead.
+        return json_response(
+            message=_("Live updates need the ASGI server"),
+            status=503,
+            success=False,
+        )
+
+    subscription = await live_updates.get_broker().subscribe(RESERVATIONS_CHANNEL)
+
+    async def events():
         try:
-            reservations = Reservation.objects.all()
-        except Reservation.DoesNotExist:
-            return JsonResponse(
-                {"status": "error", "message": "Reservations not found"}, status=404
-            )
+            yield "retry: 5000\n\n"
+            while True:
+                message = await subscription.get(STREAM_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: reservation\ndata: {json.dumps(message)}\n\n"
+        finally:
+            await subscription.close()
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _calendar_feed_state(token: str, since: date) -> Optional[Dict[str, Any]]:
+    """The employee and everything their feed depends on, in one query."""
+    work_days = (
+        WorkDay.objects.filter(employee=OuterRef("pk"), date__gte=since)
+        .order_by()
+        .values("employee")
+    )
+    reservations = (
+        Reservation.objects.filter(
+            reservation_request__employee=OuterRef("pk"),
+            reservation_request__date__gte=since,
+        )
+        .order_by()
+        .values("reservation_request__employee")
+    )
+
+    schedules = (
+        WeeklySchedule.objects.filter(employee=OuterRef("pk"))
+        .order_by()
+        .values("employee")
+    )
+    days_off = (
+        ScheduleException.objects.filter(employee=OuterRef("pk"), date__gte=since)
+        .order_by()
+        .values("employee")
+    )
+
+    def aggregate(queryset: QuerySet, expression: Any) -> Subquery:
+        return Subquery(queryset.annotate(value=expression).values("value")[:1])
+
+    return (
+        Employee.objects.filter(calendar_token=token)
+        .annotate(
+            work_days_updated=aggregate(work_days, Max("updated_at")),
+            work_days_count=aggregate(work_days, Count("pk")),
+            reservations_updated=aggregate(reservations, Max("updated_at")),
+            requests_updated=aggregate(
+                reservations, Max("reservation_request__updated_at")
+            ),
+            confirmed_count=aggregate(
+                reservations, Count("pk", filter=Q(status="CONFIRMED"))
+            ),
+            schedules_updated=aggregate(schedules, Max("updated_at")),
+            schedules_count=aggregate(schedules, Count("pk")),
+            days_off_updated=aggregate(days_off, Max("updated_at")),
+            days_off_count=aggregate(days_off, Count("pk")),
+        )
+        .values(
+            "pk",
+            "name",
+            "work_days_updated",
+            "work_days_count",
+            "reservations_updated",
+            "requests_updated",
+            "confirmed_count",
+            "schedules_updated",
+            "schedules_count",
+            "days_off_updated",
+            "days_off_count",
+        )
+        .first()
+    )
+
+
+def _calendar_feed_events(employee_id: int, since: date) -> Iterator[CalendarEvent]:
+    for work_day in (
+        WorkDay.objects.filter(employee_id=employee_id, date__gte=since)
+        .order_by("date", "start_time")
+        .values("pk", "date", "start_time", "end_time", "updated_at")
+    ):
+        yield CalendarEvent(
+            uid=f"workday-{work_day['pk']}@salon-manager",
+            start=local_datetime(work_day["date"], work_day["start_time"]),
+            end=local_datetime(work_day["date"], work_day["end_time"]),
+            summary=_("Working hours"),
+            stamp=work_day["updated_at"],
+        )
+    # Schedule hours run up to the horizon, like the days open for booking.
+    for hours in expand_schedules(since, horizon_end(), [employee_id]):
+        yield CalendarEvent(
+            uid=f"schedule-{hours.schedule_id}-{hours.date.isoformat()}@salon-manager",
+            start=local_datetime(hours.date, hours.start_time),
+            end=local_datetime(hours.date, hours.end_time),
+            summary=_("Working hours"),
+            stamp=hours.updated_at,
+        )
+    for reservation in (
+        Reservation.objects.filter(
+            reservation_request__employee_id=employee_id,
+            reservation_request__date__gte=since,
+            status="CONFIRMED",
+        )
+        .order_by("reservation_request__date", "reservation_request__start_time")
+        .values(
+            "pk",
+            "name",
+            "phone",
+            "updated_at",
+            "reservation_request__date",
+            "reservation_request__start_time",
+            "reservation_request__end_time",
+            "reservation_request__service__name",
+        )
+    ):
+        day = reservation["reservation_request__date"]
+        yield CalendarEvent(
+            uid=f"reservation-{reservation['pk']}@salon-manager",
+            start=local_datetime(day, reservation["reservation_request__start_time"]),
+            end=local_datetime(day, reservation["reservation_request__end_time"]),
+            summary=f"{reservation['reservation_request__service__name']}: {reservation['name']}",
+            description=str(reservation["phone"] or ""),
+            stamp=reservation["updated_at"],
+        )
+
+
+def employee_calendar_feed(request: HttpRequest, token: str) -> HttpResponse:
+    """iCalendar subscription with the employee's work days and confirmed
+    visits. Calendar apps poll it, so unchanged feeds are answered with a
+    304 after a single aggregate query."""
+    since = timezone.localdate() - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS)
+    state = _calendar_feed_state(token, since)
+    if state is None:
+        raise Http404
+
+    # Counts change when rows are deleted or leave the feed, which the
+    # timestamps alone would miss. For the same reason there is no
+    # Last-Modified: the latest timestamp does not move forward then, and a
+    # client sending only If-Modified-Since would keep a stale feed.
+    fingerprint = ":".join(
+        str(state[field] or 0)
+        for field in (
+            "name",
+            "work_days_updated",
+            "work_days_count",
+            "reservations_updated",
+            "requests_updated",
+            "confirmed_count",
+            "schedules_updated",
+            "schedules_count",
+            "days_off_updated",
+            "days_off_count",
+        )
+    )
+    etag = quote_etag(
+        hashlib.sha256(f"{since}:{fingerprint}".encode()).hexdigest()[:32]
+    )
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(
+            build_calendar(state["name"], _calendar_feed_events(state["pk"], since)),
+            content_type="text/calendar; charset=utf-8",
+        )
+        response["Content-Disposition"] = 'inline; filename="schedule.ics"'
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _first_form_error(form: forms.Form) -> str:
+    field, errors = next(iter(form.errors.as_data().items()))
+    return f"{field}: {errors[0].messages[0]}"
+
+
+def _cleaned_items(form_class: type[forms.Form], items: Any) -> list[dict[str, Any]]:
+    if not isinstance(items, list):
+        raise ValidationError(_("Expected a list of work days"))
+    cleaned = []
+    for item in items:
+        form = form_class(item if isinstance(item, dict) else {})
+        if not form.is_valid():
+            raise ValidationError(_first_form_error(form))
+        cleaned.append(form.cleaned_data)
+    return cleaned
+
+
+def _work_day_changes(data: Any) -> WorkDayChanges:
+    if not isinstance(data, dict):
+        raise ValidationError(_("Expected a JSON object"))
+    delete = data.get("delete", [])
+    if not isinstance(delete, list) or not all(
+        isinstance(pk, int) and not isinstance(pk, bool) for pk in delete
+    ):
+        raise ValidationError(_("Work day ids must be integers"))
+    copy_week = None
+    if data.get("copy_week") is not None:
+        copy_form = CopyWeekForm(data["copy_week"])
+        if not copy_form.is_valid():
+            raise ValidationError(_first_form_error(copy_form))
+        copy_week = copy_form.cleaned_data
+    return WorkDayChanges(
+        create=_cleaned_items(BulkWorkDayCreateForm, data.get("create", [])),
+        move=_cleaned_items(BulkWorkDayMoveForm, data.get("move", [])),
+        delete=delete,
+        copy_week=copy_week,
+    )
 
-    events = []
 
-    for reservation in reservations:
-        events.append(
-            {
-                "id": reservation.pk,
-                "title": f"{reservation.get_service_name()}, {reservation.name} ",
-                "start": f"{reservation.get_date().isoformat()}T{reservation.get_start_time().strftime('%H:%M')}",
-                "end": f"{reservation.get_date().isoformat()}T{reservation.get_end_time().strftime('%H:%M')}",
-                "color": "#28a745" if reservation.status == "CONFIRMED" else "#ffc107",
-                "extendedProps": {
-                    "startTime": reservation.get_start_time().strftime("%H:%M"),
-                    "endTime": reservation.get_end_time().strftime("%H:%M"),
-                },
-            }
-        )
-
-    return JsonResponse(events, safe=False)
+@require_POST
+def bulk_update_workdays(request: HttpRequest) -> JsonResponse:
+    """Create, move, copy and delete many work days in one transaction.
+
+    The body holds any of ``create`` (employee, date, start_time, end_time),
+    ``move`` (id, date and optionally new hours), ``delete`` (ids) and
+    ``copy_week`` (source, target and optionally employee ids).
+    """
+    if not (request.user.is_authenticated and request.user.is_owner):
+        return json_response(
+            message=_("Not authorized"),
+            status=403,
+            success=False,
+            error_code=ErrorCode.NOT_AUTHORIZED,
+        )
+
+    try:
+        changes = _work_day_changes(json.loads(request.body))
+        counts = apply_work_day_changes(changes)
+    except json.JSONDecodeError:
+        return json_response(
+            message=_("Invalid JSON"),
+            status=400,
+            success=False,
+            error_code=ErrorCode.INVALID_DATA,
+        )
+    except ValidationError as error:
+        return json_response(
+            message=error.messages[0],
+            status=400,
+            success=False,
+            error_code=ErrorCode.INVALID_DATA,
+        )
+    except WorkDay.DoesNotExist as error:
+        return json_response(
+            message=str(error),
+            status=404,
+            success=False,
+            error_code=ErrorCode.WORKING_DAYS_NOT_FOUND,
+        )
+    except Employee.DoesNotExist as error:
+        return json_response(
+            message=str(error),
+            status=404,
+            success=False,
+            error_code=ErrorCode.STAFF_MEMBER_NOT_FOUND,
+        )
+    except WorkDayConflict as conflict:
+        return json_response(
+            message=str(conflict),
+            status=409,
+            success=False,
+            error_code=ErrorCode.WORKING_HOURS_CONFLICT,
+            custom_data={
+                "employeeId": conflict.employee_id,
+                "date": conflict.date.isoformat(),
+            },
+        )
+
+    return json_response(message=_("Work days updated"), custom_data=counts)
+
+
+def capacity_report(request: HttpRequest) -> JsonResponse:
+    if not (request.user.is_authenticated and request.user.is_owner):
+        return json_response(
+            message=_("Not authorized"),
+            status=403,
+            success=False,
+            error_code=ErrorCode.NOT_AUTHORIZED,
+        )
+
+    capacity_form = CapacityForm(request.GET)
+    if not capacity_form.is_valid():
+        message = list(capacity_form.errors.as_data().items())[0][1][0].messages[0]
+        return json_response(
+            message=message,
+            status=400,
+            success=False,
+            error_code=ErrorCode.INVALID_DATA,
+        )
+
+    matrix = free_slot_matrix(
+        capacity_form.cleaned_data["start"],
+        capacity_form.cleaned_data["end"],
+        capacity_form.cleaned_data["durations"],
+        capacity_form.cleaned_data["service_id"],
+    )
+    return json_response(
+        message=_("Successfully computed capacity"),
+        custom_data=matrix.as_dict(),
+        success=True,
+    )
@@ -0,0 +1,201 @@
+import operator
+from collections import defaultdict
+from datetime import date, time
+from functools import reduce
+from typing import Iterable, Optional
+
+from django.db import models, transaction
+from django.db.models import Q
+from utils.availability import DayGrid, minutes_to_time
+
+from .models import AvailabilityBlock, ReservationRequest, WorkDay
+from .schedules import expand_schedules, horizon_end
+
+
+def _build_blocks(
+    employee_id: int,
+    day: date,
+    work_days: list[tuple[int, time, time]],
+    booked: Iterable[tuple[time, time]],
+    source: str = "work_day",
+) -> list[AvailabilityBlock]:
+    """Free blocks of one day. ``work_days`` hold the pk of the WorkDay or,
+    with ``source="schedule"``, of the WeeklySchedule each hours come from."""
+    day_grid = DayGrid.build(
+        ((start_time, end_time) for _, start_time, end_time in work_days), booked
+    )
+    return [
+        AvailabilityBlock(
+            employee_id=employee_id,
+            date=day,
+            start_time=minutes_to_time(first_start),
+            end_time=minutes_to_time(end),
+            **{f"{source}_id": work_days[index][0]},
+        )
+        for index, first_start, end in day_grid.free_blocks()
+    ]
+
+
+def _work_hours_by_day(
+    work_day_rows: models.QuerySet,
+) -> dict[tuple[int, date], list[tuple[int, time, time]]]:
+    work_days = defaultdict(list)
+    for pk, employee, day, start_time, end_time in work_day_rows.order_by(
+        "start_time", "pk"
+    ).values_list("pk", "employee_id", "date", "start_time", "end_time"):
+        work_days[employee, day].append((pk, start_time, end_time))
+    return work_days
+
+
+def _booked_by_day(
+    bookings: models.QuerySet,
+) -> dict[tuple[int, date], list[tuple[time, time]]]:
+    booked = defaultdict(list)
+    for employee, day, start_time, end_time in bookings.values_list(
+        "employee_id", "date", "start_time", "end_time"
+    ):
+        booked[employee, day].append((start_time, end_time))
+    return booked
+
+
+def _blocks_of_days(
+    work_days: dict[tuple[int, date], list[tuple[int, time, time]]],
+    scheduled: dict[tuple[int, date], list[tuple[int, time, time]]],
+    booked: dict[tuple[int, date], list[tuple[time, time]]],
+) -> list[AvailabilityBlock]:
+    blocks = []
+    for source, days in (("work_day", work_days), ("schedule", scheduled)):
+        for (employee, day), hours in days.items():
+            blocks += _build_blocks(
+                employee, day, hours, booked.get((employee, day), []), source
+            )
+    return blocks
+
+
+def rebuild_availability_blocks(
+    employee_id: Optional[int], day: Optional[date]
+) -> None:
+    """Recompute the free blocks of one employee on one day."""
+    if employee_id is None or day is None:
+        return
+
+    work_days = list(
+        WorkDay.objects.filter(employee_id=employee_id, date=day)
+        .order_by("start_time", "pk")
+        .values_list("pk", "start_time", "end_time")
+    )
+    source = "work_day"
+    if not work_days and day <= horizon_end():
+        work_days = [
+            (hours.schedule_id, hours.start_time, hours.end_time)
+            for hours in expand_schedules(day, day, [employee_id], work_days=set())
+        ]
+        source = "schedule"
+    booked = ReservationRequest.objects.filter(
+        employee_id=employee_id, date=day
+    ).values_list("start_time", "end_time")
+
+    with transaction.atomic():
+        AvailabilityBlock.objects.filter(employee_id=employee_id, date=day).delete()
+        if work_days:
+            AvailabilityBlock.objects.bulk_create(
+                _build_blocks(employee_id, day, work_days, booked, source)
+            )
+
+
+def rebuild_availability_range(
+    start_date: date,
+    end_date: Optional[date] = None,
+    employee_ids: Optional[Iterable[int]] = None,
+    batch_size: int = 1000,
+) -> int:
+    """Throw away the blocks between the two dates and rebuild them in bulk.
+
+    Without ``end_date`` every later work day is rebuilt. Weekly schedules
+    are only expanded up to the horizon.
+    """
+    work_day_rows = WorkDay.objects.filter(date__gte=start_date)
+    bookings = ReservationRequest.objects.filter(
+        date__gte=start_date, employee__isnull=False
+    )
+    stale_blocks = AvailabilityBlock.objects.filter(date__gte=start_date)
+    if end_date is not None:
+        work_day_rows = work_day_rows.filter(date__lte=end_date)
+        bookings = bookings.filter(date__lte=end_date)
+        stale_blocks = stale_blocks.filter(date__lte=end_date)
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+        work_day_rows = work_day_rows.filter(employee_id__in=employee_ids)
+        bookings = bookings.filter(employee_id__in=employee_ids)
+        stale_blocks = stale_blocks.filter(employee_id__in=employee_ids)
+
+    work_days = _work_hours_by_day(work_day_rows)
+
+    schedule_end = min(end_date or horizon_end(), horizon_end())
+    scheduled = defaultdict(list)
+    for hours in expand_schedules(
+        start_date,
+        schedule_end,
+        employee_ids,
+        work_days=set(work_days),
+    ):
+        scheduled[hours.employee_id, hours.date].append(
+            (hours.schedule_id, hours.start_time, hours.end_time)
+        )
+
+    blocks = _blocks_of_days(work_days, scheduled, _booked_by_day(bookings))
+
+    with transaction.atomic():
+        stale_blocks.delete()
+        AvailabilityBlock.objects.bulk_create(blocks, batch_size=batch_size)
+    return len(blocks)
+
+
+def rebuild_availability_days(
+    days: Iterable[tuple[int, date]], batch_size: int = 1000
+) -> int:
+    """Throw away the blocks of the given ``(employee_id, date)`` pairs and
+    rebuild them in bulk, leaving the days in between alone."""
+    days = set(days)
+    if not days:
+        return 0
+    dates_by_employee = defaultdict(set)
+    for employee_id, day in days:
+        dates_by_employee[employee_id].add(day)
+    selected = reduce(
+        operator.or_,
+        (
+            Q(employee_id=employee_id, date__in=dates)
+            for employee_id, dates in dates_by_employee.items()
+        ),
+    )
+
+    work_days = _work_hours_by_day(WorkDay.objects.filter(selected))
+
+    schedule_start = min(day for _, day in days)
+    schedule_end = min(max(day for _, day in days), horizon_end())
+    scheduled = defaultdict(list)
+    if schedule_start <= schedule_end:
+        for hours in expand_schedules(
+            schedule_start,
+            schedule_end,
+            dates_by_employee,
+            work_days=set(work_days),
+        ):
+            if (hours.employee_id, hours.date) in days:
+                scheduled[hours.employee_id, hours.date].append(
+                    (hours.schedule_id, hours.start_time, hours.end_time)
+                )
+
+    booked = _booked_by_day(ReservationRequest.objects.filter(selected))
+    blocks = _blocks_of_days(work_days, scheduled, booked)
+
+    with transaction.atomic():
+        AvailabilityBlock.objects.filter(selected).delete()
+        AvailabilityBlock.objects.bulk_create(blocks, batch_size=batch_size)
+    return len(blocks)
+
+
+def rebuild_all_availability_blocks(from_date: date, batch_size: int = 1000) -> int:
+    """Throw away every block from ``from_date`` on and rebuild them in bulk."""
+    return rebuild_availability_range(from_date, batch_size=batch_size)
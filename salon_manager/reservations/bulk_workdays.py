@@ -0,0 +1,205 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, time, timedelta
+from typing import Any, Iterable, Optional
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from users.models import Employee
+from utils import availability_cache
+
+from .availability_blocks import rebuild_availability_days
+from .models import CalendarTombstone, WorkDay
+from .signals import mute_work_day_receivers
+
+# Rota changes arrive in batches of hundreds of rows. They are written with
+# bulk_create and bulk_update, which send no signals, and deleted with the
+# WorkDay receivers muted, so the work those receivers do per row
+# (tombstones, availability blocks, cached slots) is done here once for the
+# whole batch.
+
+
+class WorkDayConflict(ValueError):
+    """Two work days of the same employee on the same date would overlap."""
+
+    def __init__(self, employee_id: int, day: date) -> None:
+        super().__init__("Working hours overlap another work day")
+        self.employee_id = employee_id
+        self.date = day
+
+
+@dataclass
+class WorkDayChanges:
+    create: list[dict[str, Any]] = field(default_factory=list)
+    move: list[dict[str, Any]] = field(default_factory=list)
+    delete: list[int] = field(default_factory=list)
+    copy_week: Optional[dict[str, Any]] = None
+
+
+def _copied_week(
+    source: date,
+    target: date,
+    employee_ids: list[int],
+    moved: list[WorkDay],
+    touched_ids: Iterable[int],
+) -> list[WorkDay]:
+    """The source week as it stands after the moves and deletes of the
+    batch, shifted to the target week."""
+    last_day = source + timedelta(days=6)
+    rows = WorkDay.objects.filter(date__range=(source, last_day)).exclude(
+        pk__in=list(touched_ids)
+    )
+    if employee_ids:
+        rows = rows.filter(employee_id__in=employee_ids)
+    week = list(rows.values_list("employee_id", "date", "start_time", "end_time"))
+    week += [
+        (work_day.employee_id, work_day.date, work_day.start_time, work_day.end_time)
+        for work_day in moved
+        if source <= work_day.date <= last_day
+        and (not employee_ids or work_day.employee_id in employee_ids)
+    ]
+    shift = target - source
+    return [
+        WorkDay(
+            employee_id=employee_id,
+            date=day + shift,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        for employee_id, day, start_time, end_time in week
+    ]
+
+
+def find_overlap(
+    work_days: Iterable[WorkDay], exclude_ids: Iterable[int] = ()
+) -> Optional[tuple[int, date]]:
+    """The first (employee, date) where the given work days overlap each
+    other or the stored ones, checked with a single query."""
+    hours: dict[tuple[int, date], list[tuple[time, time]]] = defaultdict(list)
+    for work_day in work_days:
+        hours[work_day.employee_id, work_day.date].append(
+            (work_day.start_time, work_day.end_time)
+        )
+    if not hours:
+        return None
+
+    stored = (
+        WorkDay.objects.filter(
+            employee_id__in={employee_id for employee_id, _ in hours},
+            date__in={day for _, day in hours},
+        )
+        .exclude(pk__in=list(exclude_ids))
+        .values_list("employee_id", "date", "start_time", "end_time")
+    )
+    for employee_id, day, start_time, end_time in stored:
+        if (employee_id, day) in hours:
+            hours[employee_id, day].append((start_time, end_time))
+
+    for key, spans in hours.items():
+        spans.sort()
+        for (_, previous_end), (next_start, _) in zip(spans, spans[1:]):
+            if next_start < previous_end:
+                return key
+    return None
+
+
+def apply_work_day_changes(changes: WorkDayChanges) -> dict[str, int]:
+    """Create, move, copy and delete work days in one transaction.
+
+    The week is copied after the moves and deletes are applied. Raises
+    ``WorkDay.DoesNotExist`` or ``Employee.DoesNotExist`` for unknown ids,
+    ``ValidationError`` for invalid hours and ``WorkDayConflict`` when the
+    result would overlap; nothing is written in those cases.
+    """
+    moved_ids = [item["id"] for item in changes.move]
+    if set(moved_ids) & set(changes.delete):
+        raise ValidationError("A work day cannot be moved and deleted at once")
+
+    with transaction.atomic():
+        touched = WorkDay.objects.select_for_update().in_bulk(
+            moved_ids + changes.delete
+        )
+        missing = set(moved_ids + changes.delete) - touched.keys()
+        if missing:
+            raise WorkDay.DoesNotExist(f"Work day {min(missing)} not found")
+
+        affected = set()
+        moved = []
+        for item in changes.move:
+            work_day = touched[item["id"]]
+            affected.add((work_day.employee_id, work_day.date))
+            work_day.date = item["date"]
+            work_day.start_time = item.get("start_time") or work_day.start_time
+            work_day.end_time = item.get("end_time") or work_day.end_time
+            moved.append(work_day)
+        deleted = [touched[pk] for pk in changes.delete]
+        affected |= {(work_day.employee_id, work_day.date) for work_day in deleted}
+
+        created = [
+            WorkDay(
+                employee_id=item["employee"],
+                date=item["date"],
+                start_time=item["start_time"],
+                end_time=item["end_time"],
+            )
+            for item in changes.create
+        ]
+        copied = []
+        if changes.copy_week:
+            copied = _copied_week(
+                changes.copy_week["source"],
+                changes.copy_week["target"],
+                changes.copy_week.get("employee") or [],
+                moved,
+                touched,
+            )
+        new = created + copied
+
+        employee_ids = {work_day.employee_id for work_day in created}
+        known = set(
+            Employee.objects.filter(pk__in=employee_ids).values_list("pk", flat=True)
+        )
+        if employee_ids - known:
+            raise Employee.DoesNotExist(
+                f"Employee {min(employee_ids - known)} not found"
+            )
+        for work_day in new + moved:
+            work_day.clean()
+        conflict = find_overlap(new + moved, exclude_ids=touched)
+        if conflict:
+            raise WorkDayConflict(*conflict)
+
+        if deleted:
+            CalendarTombstone.objects.bulk_create(
+                CalendarTombstone(feed="WORKDAY", object_id=work_day.pk)
+                for work_day in deleted
+            )
+            with mute_work_day_receivers():
+                WorkDay.objects.filter(pk__in=changes.delete).delete()
+        if moved:
+            # bulk_update does not run auto_now, and the delta sync relies
+            # on updated_at.
+            now = timezone.now()
+            for work_day in moved:
+                work_day.updated_at = now
+            WorkDay.objects.bulk_update(
+                moved, ["date", "start_time", "end_time", "updated_at"]
+            )
+        WorkDay.objects.bulk_create(new)
+
+        affected |= {(work_day.employee_id, work_day.date) for work_day in new + moved}
+        if affected:
+            rebuild_availability_days(affected)
+            days_by_employee = defaultdict(set)
+            for employee_id, day in affected:
+                days_by_employee[employee_id].add(day)
+            for employee_id, employee_days in days_by_employee.items():
+                availability_cache.invalidate_employee(employee_id, employee_days)
+
+    return {
+        "created": len(created),
+        "copied": len(copied),
+        "moved": len(moved),
+        "deleted": len(deleted),
+    }
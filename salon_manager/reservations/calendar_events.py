@@ -0,0 +1,117 @@
+from typing import Any, Dict
+
+from django.db import transaction
+from utils import live_updates
+
+from .models import Reservation
+from .schedules import ScheduledHours
+
+# Event payloads shared by the FullCalendar feeds and the live update stream,
+# so that a pushed event can replace the one fetched from a feed.
+
+RESERVATIONS_CHANNEL = "calendar:reservations"
+
+WORKDAY_EVENT_FIELDS = (
+    "pk",
+    "date",
+    "start_time",
+    "end_time",
+    "employee_id",
+    "employee__name",
+)
+RESERVATION_EVENT_FIELDS = (
+    "pk",
+    "name",
+    "status",
+    "reservation_request__date",
+    "reservation_request__start_time",
+    "reservation_request__end_time",
+    "reservation_request__service__name",
+    "reservation_request__employee_id",
+    "reservation_request__employee__name",
+)
+
+
+def workday_event(workday: Dict[str, Any]) -> Dict[str, Any]:
+    start_time = workday["start_time"].strftime("%H:%M")
+    end_time = workday["end_time"].strftime("%H:%M")
+    day = workday["date"].isoformat()
+    return {
+        "id": workday["pk"],
+        "title": f"{workday['employee__name']}: {start_time} - {end_time}",
+        "start": f"{day}T{workday['start_time'].strftime('%H:%M:%S')}",
+        "end": f"{day}T{workday['end_time'].strftime('%H:%M:%S')}",
+        "extendedProps": {
+            "startTime": start_time,
+            "endTime": end_time,
+            "employeeId": workday["employee_id"],
+            "employeeName": workday["employee__name"],
+        },
+    }
+
+
+def scheduled_hours_event(hours: ScheduledHours) -> Dict[str, Any]:
+    """Hours from a weekly schedule; they are edited on the schedule itself."""
+    event = workday_event(
+        {
+            "pk": f"schedule-{hours.schedule_id}-{hours.date.isoformat()}",
+            "date": hours.date,
+            "start_time": hours.start_time,
+            "end_time": hours.end_time,
+            "employee_id": hours.employee_id,
+            "employee__name": hours.employee_name,
+        }
+    )
+    event["editable"] = False
+    return event
+
+
+def reservation_event(reservation: Dict[str, Any]) -> Dict[str, Any]:
+    day = reservation["reservation_request__date"].isoformat()
+    start_time = reservation["reservation_request__start_time"].strftime("%H:%M")
+    end_time = reservation["reservation_request__end_time"].strftime("%H:%M")
+    return {
+        "id": reservation["pk"],
+        "title": f"{reservation['reservation_request__service__name']}, {reservation['name']} ",
+        "start": f"{day}T{start_time}",
+        "end": f"{day}T{end_time}",
+        "color": "#28a745" if reservation["status"] == "CONFIRMED" else "#ffc107",
+        "extendedProps": {
+            "startTime": start_time,
+            "endTime": end_time,
+            "employeeId": reservation["reservation_request__employee_id"],
+            "employeeName": reservation["reservation_request__employee__name"],
+        },
+    }
+
+
+def publish_reservation_change(action: str, **lookup: Any) -> None:
+    """Push the current event of the reservation matching ``lookup`` to live
+    dashboards once the transaction commits.
+
+    The push is robust: a broker outage is logged and the saved booking still
+    succeeds, dashboards catch up through the delta sync.
+    """
+
+    def publish() -> None:
+        row = (
+            Reservation.objects.filter(**lookup)
+            .values(*RESERVATION_EVENT_FIELDS)
+            .first()
+        )
+        if row is not None:
+            live_updates.publish(
+                RESERVATIONS_CHANNEL,
+                {"action": action, "id": row["pk"], "event": reservation_event(row)},
+            )
+
+    transaction.on_commit(publish, robust=True)
+
+
+def publish_reservation_deleted(reservation_id: int) -> None:
+    transaction.on_commit(
+        lambda: live_updates.publish(
+            RESERVATIONS_CHANNEL, {"action": "deleted", "id": reservation_id}
+        ),
+        robust=True,
+    )
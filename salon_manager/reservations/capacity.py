@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Iterable, Optional
+
+import numpy as np
+from utils.availability import SLOT_STEP_MINUTES
+
+from .models import AvailabilityBlock
+
+# Capacity questions span many employees, days and service lengths at once,
+# so the free blocks are loaded into arrays and every count is computed with
+# array arithmetic instead of slot lists per employee and day.
+
+
+@dataclass
+class CapacityMatrix:
+    """Free slot counts indexed by ``[duration, employee, day]``."""
+
+    durations: list[int]
+    employees: list[tuple[int, str]]
+    days: list[date]
+    counts: np.ndarray
+
+    def as_dict(self) -> dict[str, Any]:
+        by_duration = {}
+        for index, duration in enumerate(self.durations):
+            counts = self.counts[index]
+            by_duration[str(duration)] = {
+                "total": int(counts.sum()),
+                "by_employee": {
+                    str(employee_id): {"name": name, "free_slots": int(free_slots)}
+                    for (employee_id, name), free_slots in zip(
+                        self.employees, counts.sum(axis=1)
+                    )
+                },
+                "by_day": {
+                    day.isoformat(): int(free_slots)
+                    for day, free_slots in zip(self.days, counts.sum(axis=0))
+                },
+            }
+        return {
+            "start": self.days[0].isoformat() if self.days else None,
+            "end": self.days[-1].isoformat() if self.days else None,
+            "durations": by_duration,
+        }
+
+
+def slot_counts(
+    block_starts: np.ndarray, block_ends: np.ndarray, durations: Iterable[int]
+) -> np.ndarray:
+    """Number of slot starts of each duration in each block, shape ``(K, N)``.
+
+    Blocks start on their work day's 15-minute grid (see
+    ``DayGrid.free_blocks``), so a block of ``length`` minutes holds
+    ``(length - duration) // 15 + 1`` starts when the service fits at all.
+    """
+    lengths = (block_ends - block_starts)[np.newaxis, :]
+    durations = np.fromiter(durations, dtype=np.int32)[:, np.newaxis]
+    return np.maximum((lengths - durations) // SLOT_STEP_MINUTES + 1, 0)
+
+
+def free_slot_matrix(
+    start_date: date,
+    end_date: date,
+    durations: Iterable[int],
+    service_id: Optional[int] = None,
+) -> CapacityMatrix:
+    """Free slot counts for every employee and day between the two dates.
+
+    All blocks of the range are read with one query. With ``service_id`` only
+    employees offering that service are counted.
+    """
+    durations = sorted(set(durations))
+    blocks = AvailabilityBlock.objects.filter(date__range=(start_date, end_date))
+    if service_id is not None:
+        blocks = blocks.filter(employee__services=service_id)
+    rows = list(
+        blocks.order_by("employee__name", "employee_id").values_list(
+            "employee_id", "employee__name", "date", "start_time", "end_time"
+        )
+    )
+
+    days = [
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    ]
+    employees = list(dict.fromkeys((row[0], row[1]) for row in rows))
+    counts = np.zeros((len(durations), len(employees), len(days)), dtype=np.int64)
+    if not rows:
+        return CapacityMatrix(durations, employees, days, counts)
+
+    employee_index = {
+        employee_id: index for index, (employee_id, _) in enumerate(employees)
+    }
+    employee_rows = np.fromiter(
+        (employee_index[row[0]] for row in rows), dtype=np.intp, count=len(rows)
+    )
+    day_rows = np.fromiter(
+        ((row[2] - start_date).days for row in rows), dtype=np.intp, count=len(rows)
+    )
+    block_starts = np.fromiter(
+        (row[3].hour * 60 + row[3].minute for row in rows),
+        dtype=np.int32,
+        count=len(rows),
+    )
+    block_ends = np.fromiter(
+        (row[4].hour * 60 + row[4].minute for row in rows),
+        dtype=np.int32,
+        count=len(rows),
+    )
+
+    np.add.at(
+        counts,
+        (slice(None), employee_rows, day_rows),
+        slot_counts(block_starts, block_ends, durations),
+    )
+    return CapacityMatrix(durations, employees, days, counts)
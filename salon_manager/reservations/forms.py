@@ -1,9 +1,12 @@
 from typing import Any
 
 from django import forms
+from django.core.exceptions import ValidationError
 from phonenumber_field.formfields import SplitPhoneNumberField
 
 from users.models import Employee
+from utils.pagination import decode_cursor
+from utils.support_functions import check_for_conflicting_reservation
 from utils.validators import not_in_the_past
 
 from .models import Reservation, ReservationRequest, WorkDay
@@ -18,6 +21,155 @@ class SlotForm(forms.Form):
     service_id = forms.IntegerField(required=True)
 
 
+class AnyStaffSlotForm(forms.Form):
+    selected_date = forms.DateField(validators=[not_in_the_past])
+    service_id = forms.IntegerField(required=True)
+
+
+class SlotRangeForm(forms.Form):
+    MAX_RANGE_DAYS = 62
+
+    start = forms.DateField()
+    end = forms.DateField()
+    staff_member = forms.ModelChoiceField(
+        Employee.objects.all(),
+        error_messages={"invalid_choice": "Staff member does not exist"},
+    )
+    service_id = forms.IntegerField(required=True)
+
+    def clean(self) -> dict[str, Any]:
+        cleaned_data = super().clean()
+        start = cleaned_data.get("start")
+        end = cleaned_data.get("end")
+        if start and end:
+            if end < start:
+                raise ValidationError({"end": "End date cannot be before start date"})
+            if (end - start).days >= self.MAX_RANGE_DAYS:
+                raise ValidationError(
+                    {"end": f"Date range cannot exceed {self.MAX_RANGE_DAYS} days"}
+                )
+        return cleaned_data
+
+
+class CapacityForm(forms.Form):
+    MAX_RANGE_DAYS = 366
+
+    start = forms.DateField()
+    end = forms.DateField()
+    durations = forms.CharField()
+    service_id = forms.IntegerField(required=False)
+
+    def clean_durations(self) -> list[int]:
+        try:
+            durations = [
+                int(duration) for duration in self.cleaned_data["durations"].split(",")
+            ]
+        except ValueError:
+            raise ValidationError("Durations must be comma-separated minutes")
+        if any(duration <= 0 for duration in durations):
+            raise ValidationError("Durations must be positive")
+        return durations
+
+    def clean(self) -> dict[str, Any]:
+        cleaned_data = super().clean()
+        start = cleaned_data.get("start")
+        end = cleaned_data.get("end")
+        if start and end:
+            if end < start:
+                raise ValidationError({"end": "End date cannot be before start date"})
+            if (end - start).days >= self.MAX_RANGE_DAYS:
+                raise ValidationError(
+                    {"end": f"Date range cannot exceed {self.MAX_RANGE_DAYS} days"}
+                )
+        return cleaned_data
+
+
+class CalendarDateField(forms.DateField):
+    """FullCalendar sends ISO 8601 datetimes; only their date part is used."""
+
+    def to_python(self, value: Any) -> Any:
+        if isinstance(value, str):
+            value = value[:10]
+        return super().to_python(value)
+
+
+class CalendarRangeForm(forms.Form):
+    start = CalendarDateField(required=False)
+    end = CalendarDateField(required=False)
+    updated_since = forms.DateTimeField(required=False)
+
+
+class EmployeeIdsField(forms.Field):
+    """Employee ids given as repeated parameters, comma-separated, or both."""
+
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value: Any) -> list[int]:
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = [value]
+        try:
+            return sorted(
+                {
+                    int(employee_id)
+                    for item in value
+                    for employee_id in str(item).split(",")
+                    if employee_id.strip()
+                }
+            )
+        except ValueError:
+            raise ValidationError("Employee ids must be integers")
+
+
+class ReservationFeedForm(CalendarRangeForm):
+    employee = EmployeeIdsField(required=False)
+
+
+class HistoryFilterForm(forms.Form):
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+    cursor = forms.CharField(required=False, widget=forms.HiddenInput)
+
+    def clean_cursor(self) -> str:
+        cursor = self.cleaned_data["cursor"]
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                raise ValidationError("Invalid page cursor")
+        return cursor
+
+
+class ReservationHistoryFilterForm(HistoryFilterForm):
+    status = forms.ChoiceField(
+        choices=[("", "All statuses"), *Reservation.RESERVATION_STATUS_CHOICES],
+        required=False,
+    )
+
+
+class BulkWorkDayCreateForm(forms.Form):
+    employee = forms.IntegerField()
+    date = forms.DateField()
+    start_time = forms.TimeField()
+    end_time = forms.TimeField()
+
+
+class BulkWorkDayMoveForm(forms.Form):
+    id = forms.IntegerField()
+    date = forms.DateField()
+    start_time = forms.TimeField(required=False)
+    end_time = forms.TimeField(required=False)
+
+
+class CopyWeekForm(forms.Form):
+    """Copies the seven days starting at ``source`` to those at ``target``."""
+
+    source = forms.DateField()
+    target = forms.DateField()
+    employee = EmployeeIdsField(required=False)
+
+
 class ReservationRequestForm(forms.ModelForm):
     class Meta:
         model = ReservationRequest
@@ -34,6 +186,24 @@ class ReservationRequestForm(forms.ModelForm):
             "employee": forms.Select(attrs={"class": "form-control"}),
         }
 
+    def clean(self) -> dict[str, Any]:
+        cleaned_data = super().clean()
+        employee = cleaned_data.get("employee")
+        reservation_date = cleaned_data.get("date")
+        start_time = cleaned_data.get("start_time")
+        end_time = cleaned_data.get("end_time")
+        if (
+            employee
+            and reservation_date
+            and start_time
+            and end_time
+            and check_for_conflicting_reservation(
+                employee.id, reservation_date, start_time, end_time, self.instance.pk
+            )
+        ):
+            raise ValidationError("This time slot is no longer available")
+        return cleaned_data
+
 
 class ReservationForm(forms.ModelForm):
     phone = SplitPhoneNumberField(required=True, region="PL")
@@ -0,0 +1,57 @@
+import timeit
+from datetime import date, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from reservations.calendar_events import reservation_event
+from utils import json_encoding
+
+
+def calendar_payload(events: int) -> list[dict]:
+    """Reservation feed events built from synthetic rows, as the feed does."""
+    first_day = date(2025, 1, 6)
+    return [
+        reservation_event(
+            {
+                "pk": index,
+                "name": f"Customer {index}",
+                "status": "CONFIRMED" if index % 3 else "PENDING",
+                "reservation_request__date": first_day + timedelta(days=index // 8),
+                "reservation_request__start_time": time(9 + index % 8, 0),
+                "reservation_request__end_time": time(9 + index % 8, 45),
+                "reservation_request__service__name": "Manicure classic",
+                "reservation_request__employee_id": index % 5,
+                "reservation_request__employee__name": f"Stylist {index % 5}",
+            }
+        )
+        for index in range(events)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Compare encode time of the available JSON backends on calendar payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events", type=int, default=20000, help="Events in the payload."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Timed runs per backend."
+        )
+
+    def handle(self, *args, **options):
+        if options["events"] <= 0 or options["repeat"] <= 0:
+            raise CommandError("--events and --repeat must be positive.")
+
+        payload = calendar_payload(options["events"])
+        self.stdout.write(
+            f"{options['events']} events, best of {options['repeat']} runs "
+            f"(configured backend: {json_encoding.backend_name()})"
+        )
+        for name, dumps in sorted(json_encoding.BACKENDS.items()):
+            best = min(
+                timeit.repeat(
+                    lambda: dumps(payload), number=1, repeat=options["repeat"]
+                )
+            )
+            size = len(dumps(payload))
+            self.stdout.write(f"{name:>8}: {best * 1000:8.2f} ms  {size} bytes")
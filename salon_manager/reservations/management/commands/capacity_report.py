@@ -0,0 +1,45 @@
+import json
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from reservations.capacity import free_slot_matrix
+
+
+class Command(BaseCommand):
+    help = "Count free slots of the given service durations across all staff."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--duration",
+            dest="durations",
+            type=int,
+            action="append",
+            required=True,
+            help="Service duration in minutes. Repeat for several durations.",
+        )
+        parser.add_argument(
+            "--from",
+            dest="from_date",
+            type=date.fromisoformat,
+            help="First day to count (YYYY-MM-DD). Defaults to today.",
+        )
+        parser.add_argument(
+            "--weeks", type=int, default=8, help="Number of weeks to count."
+        )
+        parser.add_argument(
+            "--service", type=int, help="Only count staff offering this service."
+        )
+
+    def handle(self, *args, **options):
+        if any(duration <= 0 for duration in options["durations"]):
+            raise CommandError("Durations must be positive.")
+        if options["weeks"] <= 0:
+            raise CommandError("--weeks must be positive.")
+
+        from_date = options["from_date"] or timezone.localdate()
+        to_date = from_date + timedelta(weeks=options["weeks"], days=-1)
+        matrix = free_slot_matrix(
+            from_date, to_date, options["durations"], options["service"]
+        )
+        self.stdout.write(json.dumps(matrix.as_dict(), indent=2))
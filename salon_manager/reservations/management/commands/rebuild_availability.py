@@ -0,0 +1,28 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from reservations.availability_blocks import rebuild_all_availability_blocks
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the precomputed availability blocks from work days and reservations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from",
+            dest="from_date",
+            type=date.fromisoformat,
+            help="First day to rebuild (YYYY-MM-DD). Defaults to today.",
+        )
+
+    def handle(self, *args, **options):
+        from_date = options["from_date"] or timezone.now().date()
+        count = rebuild_all_availability_blocks(from_date)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {count} availability blocks from {from_date.isoformat()}."
+            )
+        )
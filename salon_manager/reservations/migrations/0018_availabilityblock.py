@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0017_alter_reservation_reservation_request"),
+        ("users", "0006_alter_employee_user"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AvailabilityBlock",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("start_time", models.TimeField()),
+                ("end_time", models.TimeField()),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability_blocks",
+                        to="users.employee",
+                    ),
+                ),
+                (
+                    "work_day",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability_blocks",
+                        to="reservations.workday",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["employee", "date", "start_time"],
+                        name="availability_block_lookup",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0018_availabilityblock"),
+        ("services", "0002_alter_service_duration_alter_service_name_and_more"),
+        ("users", "0006_alter_employee_user"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(fields=["id_request"], name="reservation_id_request"),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                condition=models.Q(("status", "CONFIRMED")),
+                fields=["reservation_request"],
+                name="reservation_confirmed",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservationrequest",
+            index=models.Index(
+                fields=["employee", "date", "start_time"], name="request_employee_date"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservationrequest",
+            index=models.Index(fields=["date"], name="request_date"),
+        ),
+        migrations.AddIndex(
+            model_name="reservationrequest",
+            index=models.Index(fields=["expires_at"], name="request_expires_at"),
+        ),
+        migrations.AddIndex(
+            model_name="workday",
+            index=models.Index(
+                fields=["employee", "date", "start_time"], name="workday_employee_date"
+            ),
+        ),
+    ]
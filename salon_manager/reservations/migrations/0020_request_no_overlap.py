@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# Overlapping requests of one employee are rejected by an exclusion
+# constraint. The employee is compared as a one-element int8range so that
+# the GiST index needs no btree_gist extension. Other databases have no
+# exclusion constraints, and ReservationRequest.save checks for overlaps.
+ADD_CONSTRAINT = """
+    ALTER TABLE reservations_reservationrequest
+    ADD CONSTRAINT request_no_overlap EXCLUDE USING gist (
+        int8range(employee_id, employee_id, '[]') WITH =,
+        tsrange(date + start_time, date + end_time, '[)') WITH &&
+    ) WHERE (employee_id IS NOT NULL)
+"""
+
+DROP_CONSTRAINT = """
+    ALTER TABLE reservations_reservationrequest
+    DROP CONSTRAINT IF EXISTS request_no_overlap
+"""
+
+
+def add_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(ADD_CONSTRAINT)
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_CONSTRAINT)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0019_booking_indexes"),
+        ("services", "0002_alter_service_duration_alter_service_name_and_more"),
+        ("users", "0006_alter_employee_user"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_overlap_constraint, drop_overlap_constraint),
+    ]
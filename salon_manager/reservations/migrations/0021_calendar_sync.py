@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0020_request_no_overlap"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CalendarTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "feed",
+                    models.CharField(
+                        choices=[
+                            ("WORKDAY", "work day"),
+                            ("RESERVATION", "reservation"),
+                        ],
+                        max_length=11,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="workday",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(fields=["updated_at"], name="reservation_updated_at"),
+        ),
+        migrations.AddIndex(
+            model_name="reservationrequest",
+            index=models.Index(fields=["updated_at"], name="request_updated_at"),
+        ),
+        migrations.AddIndex(
+            model_name="workday",
+            index=models.Index(fields=["updated_at"], name="workday_updated_at"),
+        ),
+        migrations.AddIndex(
+            model_name="calendartombstone",
+            index=models.Index(
+                fields=["feed", "deleted_at"], name="tombstone_feed_deleted"
+            ),
+        ),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0021_calendar_sync"),
+        ("users", "0007_employee_calendar_token"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="availabilityblock",
+            name="work_day",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="availability_blocks",
+                to="reservations.workday",
+            ),
+        ),
+        migrations.CreateModel(
+            name="WeeklySchedule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "weekday",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (0, "Monday"),
+                            (1, "Tuesday"),
+                            (2, "Wednesday"),
+                            (3, "Thursday"),
+                            (4, "Friday"),
+                            (5, "Saturday"),
+                            (6, "Sunday"),
+                        ]
+                    ),
+                ),
+                ("start_time", models.TimeField()),
+                ("end_time", models.TimeField()),
+                ("valid_from", models.DateField()),
+                ("valid_until", models.DateField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="weekly_schedules",
+                        to="users.employee",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="availabilityblock",
+            name="schedule",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="availability_blocks",
+                to="reservations.weeklyschedule",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ScheduleException",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("note", models.CharField(blank=True, max_length=200)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="schedule_exceptions",
+                        to="users.employee",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("employee", "date"),
+                        name="schedule_exception_unique_day",
+                    )
+                ],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="weeklyschedule",
+            index=models.Index(
+                fields=["employee", "weekday"], name="weekly_schedule_employee"
+            ),
+        ),
+    ]
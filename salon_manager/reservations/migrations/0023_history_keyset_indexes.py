@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0022_weekly_schedules"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="reservationrequest",
+            name="request_date",
+        ),
+        migrations.AddIndex(
+            model_name="reservationrequest",
+            index=models.Index(fields=["date", "id"], name="request_date_id"),
+        ),
+        migrations.AddIndex(
+            model_name="workday",
+            index=models.Index(fields=["date", "id"], name="workday_date_id"),
+        ),
+    ]
@@ -0,0 +1,92 @@
+from collections import defaultdict
+from datetime import time
+
+from django.db import migrations
+from django.utils import timezone
+
+SLOT_STEP_MINUTES = 15
+MINUTES_PER_DAY = 24 * 60
+
+
+def _minute_floor(value):
+    return value.hour * 60 + value.minute
+
+
+def _minute_ceil(value):
+    return _minute_floor(value) + bool(value.second or value.microsecond)
+
+
+def free_blocks(start_time, end_time, booked):
+    """Free ``(first start, end)`` minutes of one work day, as
+    ``DayGrid.free_blocks`` gave them when this migration was written.
+
+    A booking takes every minute it touches, and a block starts on the first
+    15-minute step of the work day inside its free run.
+    """
+    window_start, window_end = _minute_ceil(start_time), _minute_floor(end_time)
+    busy = sorted(
+        (
+            max(_minute_floor(start) - 1, 0),
+            min(_minute_ceil(end), MINUTES_PER_DAY - 1) + 1,
+        )
+        for start, end in booked
+    )
+    runs = []
+    cursor = window_start
+    for busy_start, busy_end in busy:
+        if min(busy_start, window_end) > cursor:
+            runs.append((cursor, min(busy_start, window_end)))
+        cursor = max(cursor, busy_end)
+    if window_end > cursor:
+        runs.append((cursor, window_end))
+
+    blocks = []
+    for run_start, run_end in runs:
+        offset = (run_start - window_start) % SLOT_STEP_MINUTES
+        first_start = run_start + (SLOT_STEP_MINUTES - offset) % SLOT_STEP_MINUTES
+        if first_start < run_end:
+            blocks.append((first_start, run_end))
+    return blocks
+
+
+def backfill_availability_blocks(apps, schema_editor):
+    # Work days saved before availability blocks existed have none, and slot
+    # lookups read nothing else.
+    WorkDay = apps.get_model("reservations", "WorkDay")
+    ReservationRequest = apps.get_model("reservations", "ReservationRequest")
+    AvailabilityBlock = apps.get_model("reservations", "AvailabilityBlock")
+    today = timezone.localdate()
+
+    booked = defaultdict(list)
+    for employee_id, day, start_time, end_time in ReservationRequest.objects.filter(
+        date__gte=today, employee__isnull=False
+    ).values_list("employee_id", "date", "start_time", "end_time"):
+        booked[employee_id, day].append((start_time, end_time))
+
+    blocks = [
+        AvailabilityBlock(
+            employee_id=employee_id,
+            date=day,
+            start_time=time(first_start // 60, first_start % 60),
+            end_time=time(end // 60, end % 60),
+            work_day_id=pk,
+        )
+        for pk, employee_id, day, start_time, end_time in WorkDay.objects.filter(
+            date__gte=today
+        ).values_list("pk", "employee_id", "date", "start_time", "end_time")
+        for first_start, end in free_blocks(
+            start_time, end_time, booked[employee_id, day]
+        )
+    ]
+    AvailabilityBlock.objects.filter(date__gte=today, work_day__isnull=False).delete()
+    AvailabilityBlock.objects.bulk_create(blocks, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0023_history_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_availability_blocks, migrations.RunPython.noop),
+    ]
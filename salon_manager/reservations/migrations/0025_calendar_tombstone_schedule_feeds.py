@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0024_backfill_availability_blocks"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="calendartombstone",
+            name="feed",
+            field=models.CharField(
+                choices=[
+                    ("WORKDAY", "work day"),
+                    ("RESERVATION", "reservation"),
+                    ("SCHEDULE", "weekly schedule"),
+                    ("EXCEPTION", "schedule exception"),
+                ],
+                max_length=11,
+            ),
+        ),
+    ]
@@ -0,0 +1,94 @@
+from datetime import time, timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+free_blocks = import_module(
+    "reservations.migrations.0024_backfill_availability_blocks"
+).free_blocks
+
+
+def _rebuild_day(apps, employee_id, day, today):
+    """Rebuild the free blocks of one day from its work days or, without
+    any, from the weekly schedules, as the application did at the time."""
+    WorkDay = apps.get_model("reservations", "WorkDay")
+    WeeklySchedule = apps.get_model("reservations", "WeeklySchedule")
+    ScheduleException = apps.get_model("reservations", "ScheduleException")
+    ReservationRequest = apps.get_model("reservations", "ReservationRequest")
+    AvailabilityBlock = apps.get_model("reservations", "AvailabilityBlock")
+
+    hours = list(
+        WorkDay.objects.filter(employee_id=employee_id, date=day).values_list(
+            "pk", "start_time", "end_time"
+        )
+    )
+    source = "work_day"
+    if (
+        not hours
+        and day <= today + timedelta(days=settings.SCHEDULE_HORIZON_DAYS)
+        and not ScheduleException.objects.filter(
+            employee_id=employee_id, date=day
+        ).exists()
+    ):
+        hours = list(
+            WeeklySchedule.objects.filter(
+                employee_id=employee_id, weekday=day.weekday(), valid_from__lte=day
+            )
+            .exclude(valid_until__lt=day)
+            .values_list("pk", "start_time", "end_time")
+        )
+        source = "schedule"
+    booked = list(
+        ReservationRequest.objects.filter(
+            employee_id=employee_id, date=day
+        ).values_list("start_time", "end_time")
+    )
+
+    AvailabilityBlock.objects.filter(employee_id=employee_id, date=day).delete()
+    AvailabilityBlock.objects.bulk_create(
+        AvailabilityBlock(
+            employee_id=employee_id,
+            date=day,
+            start_time=time(first_start // 60, first_start % 60),
+            end_time=time(end // 60, end % 60),
+            **{f"{source}_id": pk},
+        )
+        for pk, start_time, end_time in hours
+        for first_start, end in free_blocks(start_time, end_time, booked)
+    )
+
+
+def delete_stale_requests(apps, schema_editor):
+    # Requests used to be written when a customer picked a time and deleted
+    # by a periodic task when the customer did not confirm in time. Slot
+    # holds replaced that, so the unconfirmed requests left over are never
+    # confirmed; the days they took are given back.
+    ReservationRequest = apps.get_model("reservations", "ReservationRequest")
+    today = timezone.localdate()
+    stale = ReservationRequest.objects.filter(
+        expires_at__lt=timezone.now(), reservation__isnull=True
+    )
+    taken_days = set(
+        stale.filter(date__gte=today, employee__isnull=False).values_list(
+            "employee_id", "date"
+        )
+    )
+    stale.delete()
+    for employee_id, day in taken_days:
+        _rebuild_day(apps, employee_id, day, today)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reservations", "0025_calendar_tombstone_schedule_feeds"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_stale_requests, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="reservationrequest",
+            name="request_expires_at",
+        ),
+    ]
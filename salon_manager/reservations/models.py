@@ -4,13 +4,18 @@ from decimal import Decimal
 from typing import Any, Optional
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 from services.models import Service
 from users.models import CustomUser, Employee
-from utils.support_functions import generate_random_id, get_timestamp, time_difference
+from utils.support_functions import (
+    check_for_conflicting_reservation,
+    generate_random_id,
+    get_timestamp,
+    time_difference,
+)
 
 
 class WorkDay(models.Model):  # TODO helptexts
@@ -20,6 +25,17 @@ class WorkDay(models.Model):  # TODO helptexts
     employee = models.ForeignKey(
         Employee, on_delete=models.CASCADE, related_name="work_day"
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["employee", "date", "start_time"],
+                name="workday_employee_date",
+            ),
+            models.Index(fields=["updated_at"], name="workday_updated_at"),
+            models.Index(fields=["date", "id"], name="workday_date_id"),
+        ]
 
     def clean(self):
         super().clean()
@@ -37,6 +53,10 @@ class WorkDay(models.Model):  # TODO helptexts
         return f"{self.employee} - {self.date}"
 
 
+class SlotConflict(IntegrityError):
+    """The request overlaps another request of the same employee."""
+
+
 class ReservationRequest(models.Model):  # TODO helptexts
     date = models.DateField()
     start_time = models.TimeField()
@@ -48,6 +68,16 @@ class ReservationRequest(models.Model):  # TODO helptexts
     updated_at = models.DateTimeField(auto_now=True)
     expires_at = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["employee", "date", "start_time"],
+                name="request_employee_date",
+            ),
+            models.Index(fields=["date", "id"], name="request_date_id"),
+            models.Index(fields=["updated_at"], name="request_updated_at"),
+        ]
+
     def __str__(self) -> str:
         return (
             f"{self.date} - {self.start_time} to {self.end_time} - {self.service.name}"
@@ -73,7 +103,26 @@ class ReservationRequest(models.Model):  # TODO helptexts
             )
         if not self.expires_at:
             self.expires_at = timezone.now() + timezone.timedelta(minutes=15)
-        super().save(*args, **kwargs)
+        if connection.vendor == "postgresql":
+            # Overlaps are rejected by the request_no_overlap exclusion
+            # constraint, see migration 0020.
+            try:
+                super().save(*args, **kwargs)
+            except IntegrityError as e:
+                diag = getattr(e.__cause__, "diag", None)
+                if getattr(diag, "constraint_name", None) == "request_no_overlap":
+                    raise SlotConflict(*e.args) from e
+                raise
+            return
+
+        # Without exclusion constraints the overlap check runs in the same
+        # transaction as the write, which SQLite serializes.
+        with transaction.atomic():
+            if self.employee_id and check_for_conflicting_reservation(
+                self.employee_id, self.date, self.start_time, self.end_time, self.pk
+            ):
+                raise SlotConflict("request_no_overlap")
+            super().save(*args, **kwargs)
 
     def is_expired(self) -> bool:
         return timezone.now() > self.expires_at
@@ -82,6 +131,15 @@ class ReservationRequest(models.Model):  # TODO helptexts
         return self.service.name
 
 
+class ReservationQuerySet(models.QuerySet):
+    def with_request_details(self) -> "ReservationQuerySet":
+        """Join the request with its service and employee, so that the
+        ``get_*`` accessors of the rows run no queries of their own."""
+        return self.select_related(
+            "reservation_request__service", "reservation_request__employee"
+        )
+
+
 class Reservation(models.Model):
     RESERVATION_STATUS_CHOICES = (
         ("PENDING", "pending"),
@@ -114,6 +172,20 @@ class Reservation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ReservationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["id_request"], name="reservation_id_request"),
+            models.Index(fields=["updated_at"], name="reservation_updated_at"),
+            # Reminders and status updates only ever look at confirmed visits.
+            models.Index(
+                fields=["reservation_request"],
+                condition=models.Q(status="CONFIRMED"),
+                name="reservation_confirmed",
+            ),
+        ]
+
     def __str__(self) -> str:
         customer_name = self.customer.username if self.customer else self.name
         return f"Reservation {customer_name} for {self.reservation_request.date} at {self.reservation_request.start_time}"
@@ -143,7 +215,7 @@ class Reservation(models.Model):
         return self.reservation_request.service.duration
 
     def get_employee_name(self) -> str:
-        if not self.reservation_request.employee:
+        if self.reservation_request.employee_id is None:
             return ""
         return self.reservation_request.employee.name
 
@@ -155,3 +227,163 @@ class Reservation(models.Model):
 
     def get_customer_name(self) -> str:
         return self.name
+
+
+class WeeklySchedule(models.Model):
+    """Working hours an employee repeats every week on one weekday.
+
+    Dates with their own WorkDay rows or a ScheduleException do not follow
+    the schedule.
+    """
+
+    WEEKDAY_CHOICES = (
+        (0, "Monday"),
+        (1, "Tuesday"),
+        (2, "Wednesday"),
+        (3, "Thursday"),
+        (4, "Friday"),
+        (5, "Saturday"),
+        (6, "Sunday"),
+    )
+
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="weekly_schedules"
+    )
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    valid_from = models.DateField()
+    valid_until = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["employee", "weekday"], name="weekly_schedule_employee"
+            )
+        ]
+
+    def clean(self):
+        super().clean()
+        if self.start_time and self.end_time and self.end_time <= self.start_time:
+            raise ValidationError(
+                {"end_time": "The end time must be later than the start time!"}
+            )
+        if self.valid_from and self.valid_until and self.valid_until < self.valid_from:
+            raise ValidationError(
+                {"valid_until": "The schedule cannot end before it starts!"}
+            )
+        if self.employee_id is None or None in (
+            self.weekday,
+            self.start_time,
+            self.end_time,
+            self.valid_from,
+        ):
+            return
+        overlapping = WeeklySchedule.objects.filter(
+            employee_id=self.employee_id,
+            weekday=self.weekday,
+            start_time__lt=self.end_time,
+            end_time__gt=self.start_time,
+        ).filter(
+            models.Q(valid_until__isnull=True)
+            | models.Q(valid_until__gte=self.valid_from)
+        )
+        if self.valid_until:
+            overlapping = overlapping.filter(valid_from__lte=self.valid_until)
+        if overlapping.exclude(pk=self.pk).exists():
+            raise ValidationError(
+                "These hours overlap another schedule of this employee!"
+            )
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.employee} - {self.get_weekday_display()} "
+            f"{self.start_time}-{self.end_time}"
+        )
+
+
+class ScheduleException(models.Model):
+    """A day off on which the employee's weekly schedule does not apply."""
+
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="schedule_exceptions"
+    )
+    date = models.DateField()
+    note = models.CharField(max_length=200, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["employee", "date"], name="schedule_exception_unique_day"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.employee} - {self.date} off"
+
+
+class AvailabilityBlock(models.Model):
+    """Free time left in a work day, kept in step with WorkDay,
+    WeeklySchedule and ReservationRequest rows by
+    reservations.availability_blocks."""
+
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="availability_blocks"
+    )
+    # A block comes either from an explicit work day or from a weekly schedule.
+    work_day = models.ForeignKey(
+        WorkDay,
+        on_delete=models.CASCADE,
+        related_name="availability_blocks",
+        null=True,
+    )
+    schedule = models.ForeignKey(
+        WeeklySchedule,
+        on_delete=models.CASCADE,
+        related_name="availability_blocks",
+        null=True,
+    )
+    date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["employee", "date", "start_time"],
+                name="availability_block_lookup",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.employee} - {self.date} {self.start_time}-{self.end_time}"
+
+
+class CalendarTombstone(models.Model):
+    """Marks a calendar event as deleted so delta syncs of the feeds can
+    tell clients to drop it."""
+
+    FEED_CHOICES = (
+        ("WORKDAY", "work day"),
+        ("RESERVATION", "reservation"),
+        ("SCHEDULE", "weekly schedule"),
+        ("EXCEPTION", "schedule exception"),
+    )
+
+    feed = models.CharField(max_length=11, choices=FEED_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["feed", "deleted_at"], name="tombstone_feed_deleted")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.feed} {self.object_id} deleted at {self.deleted_at}"
@@ -0,0 +1,121 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ScheduleException, WeeklySchedule, WorkDay
+
+# Weekly schedules are never stored day by day. They are expanded for the
+# dates a caller asks about: a date follows the schedule unless the employee
+# has explicit WorkDay rows on it, which override the schedule, or a
+# ScheduleException, which makes it a day off.
+
+
+@dataclass(frozen=True)
+class ScheduledHours:
+    employee_id: int
+    employee_name: str
+    date: date
+    start_time: time
+    end_time: time
+    schedule_id: int
+    updated_at: Optional[datetime] = None
+
+
+def horizon_end(today: Optional[date] = None) -> date:
+    """Last day that has availability blocks built from weekly schedules."""
+    today = today or timezone.localdate()
+    return today + timedelta(days=settings.SCHEDULE_HORIZON_DAYS)
+
+
+def expand_schedules(
+    start_date: date,
+    end_date: date,
+    employee_ids: Optional[Iterable[int]] = None,
+    work_days: Optional[set[tuple[int, date]]] = None,
+) -> list[ScheduledHours]:
+    """Hours the weekly schedules give each employee between the two dates.
+
+    Reads the schedules first and skips the other queries when none apply.
+    Pass the ``(employee_id, date)`` pairs that have WorkDay rows as
+    ``work_days`` when they are already known.
+    """
+    schedules = WeeklySchedule.objects.filter(valid_from__lte=end_date).filter(
+        Q(valid_until__isnull=True) | Q(valid_until__gte=start_date)
+    )
+    overrides = WorkDay.objects.filter(date__range=(start_date, end_date))
+    days_off = ScheduleException.objects.filter(date__range=(start_date, end_date))
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+        schedules = schedules.filter(employee_id__in=employee_ids)
+        overrides = overrides.filter(employee_id__in=employee_ids)
+        days_off = days_off.filter(employee_id__in=employee_ids)
+
+    by_weekday = defaultdict(list)
+    for schedule in schedules.order_by("employee_id", "start_time").values(
+        "pk",
+        "employee_id",
+        "employee__name",
+        "weekday",
+        "start_time",
+        "end_time",
+        "valid_from",
+        "valid_until",
+        "updated_at",
+    ):
+        by_weekday[schedule["weekday"]].append(schedule)
+    if not by_weekday:
+        return []
+
+    if work_days is None:
+        work_days = set(overrides.values_list("employee_id", "date"))
+    skipped = work_days | set(days_off.values_list("employee_id", "date"))
+    expanded = []
+    day = start_date
+    while day <= end_date:
+        for schedule in by_weekday.get(day.weekday(), []):
+            if (
+                schedule["valid_from"] <= day
+                and (schedule["valid_until"] is None or day <= schedule["valid_until"])
+                and (schedule["employee_id"], day) not in skipped
+            ):
+                expanded.append(
+                    ScheduledHours(
+                        employee_id=schedule["employee_id"],
+                        employee_name=schedule["employee__name"],
+                        date=day,
+                        start_time=schedule["start_time"],
+                        end_time=schedule["end_time"],
+                        schedule_id=schedule["pk"],
+                        updated_at=schedule["updated_at"],
+                    )
+                )
+        day += timedelta(days=1)
+    return expanded
+
+
+def working_dates(employee_id: int, start_date: date, end_date: date) -> set[date]:
+    """Dates the employee works, from work days and weekly schedules.
+
+    Schedules only count up to the horizon: later days have no availability
+    blocks yet, so offering them would only lead to an empty day.
+    """
+    work_days = set(
+        WorkDay.objects.filter(
+            employee_id=employee_id, date__range=(start_date, end_date)
+        ).values_list("employee_id", "date")
+    )
+    dates = {day for _, day in work_days}
+    schedule_end = min(end_date, horizon_end())
+    if start_date > schedule_end or len(dates) > (end_date - start_date).days:
+        return dates
+    return dates | {
+        hours.date
+        for hours in expand_schedules(
+            start_date, schedule_end, [employee_id], work_days
+        )
+    }
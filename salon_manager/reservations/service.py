@@ -1,36 +1,48 @@
-from datetime import date, timedelta
+from collections import defaultdict
+from datetime import date, time, timedelta
 from typing import TYPE_CHECKING, Any
 
-from django.db.models import QuerySet
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 from django.utils.translation import gettext as _
 from services.models import Service
+from utils import availability_cache, slot_holds
+from utils.availability import exclude_booked, slots_in_blocks
 from utils.support_functions import (
-    check_for_conflicting_reservation,
-    generate_available_slots,
     handle_invalid_form,
     json_response,
 )
 
-from .models import ReservationRequest, WorkDay
+from .models import AvailabilityBlock, ReservationRequest
+from .schedules import working_dates
 
 if TYPE_CHECKING:
     from users.models import Employee
 
 
 class SlotAvailabilityService:
+    NEXT_DATE_CHUNK_SIZE = 30
+
     def get_available_slots_(
         self, selected_date: date, employee: "Employee", service_id: int
     ) -> dict[str, Any]:
         self._validate_working_day(employee, selected_date)
 
         service = self._get_service(service_id)
-        work_days = self._get_work_days(employee, selected_date)
-        existing_reservations = self._get_existing_reservations(employee, selected_date)
-        available_slots = self._calculate_available_slots(
-            work_days, service.duration, existing_reservations
+        available_slots = availability_cache.get_day_slots(
+            employee.id, selected_date, service.duration
+        )
+        if available_slots is None:
+            blocks = self._get_availability_blocks(employee, selected_date)
+            available_slots = self._calculate_available_slots(blocks, service.duration)
+            availability_cache.set_day_slots(
+                employee.id, selected_date, service.duration, available_slots
+            )
+        available_slots = exclude_booked(
+            self._filter_past_slots(available_slots, selected_date),
+            slot_holds.live_holds(employee.id, selected_date),
+            service.duration,
         )
-        available_slots = self._filter_past_slots(available_slots, selected_date)
 
         if not available_slots:
             raise ValueError(_("No availability"))
@@ -42,24 +54,121 @@ class SlotAvailabilityService:
             "error": False,
         }
 
+    def get_available_slots_range(
+        self, start_date: date, end_date: date, employee: "Employee", service_id: int
+    ) -> dict[str, Any]:
+        """Available slots for every day from ``start_date`` to ``end_date``.
+
+        Work dates and availability blocks for the whole range are fetched
+        with one query each. Days before today are left out of the result.
+        """
+        start_date = max(start_date, date.today())
+        service = self._get_service(service_id)
+        work_dates = self._get_work_dates_in_range(employee, start_date, end_date)
+        blocks = self._get_blocks_in_range(employee, start_date, end_date)
+        holds = slot_holds.live_holds_for_days(employee.id, work_dates)
+
+        slots: dict[str, list[str]] = {}
+        non_working_days = []
+        current_date = start_date
+        while current_date <= end_date:
+            if current_date in work_dates:
+                slots[current_date.isoformat()] = exclude_booked(
+                    self._slots_for_day(
+                        current_date, blocks.get(current_date, []), service.duration
+                    ),
+                    holds.get(current_date, []),
+                    service.duration,
+                )
+            else:
+                non_working_days.append(current_date.isoformat())
+            current_date += timedelta(days=1)
+
+        return {
+            "slots": slots,
+            "non_working_days": non_working_days,
+            "staff_member": employee.name,
+            "error": False,
+        }
+
+    def get_available_slots_any_staff(
+        self, selected_date: date, service_id: int
+    ) -> dict[str, Any]:
+        """Free slots of every employee offering the service, merged by time.
+
+        The availability blocks of all those employees come from one query
+        and their slot holds from one cache read. Slots held by other
+        customers are left out. Each slot is assigned to the first free
+        employee in name order.
+        """
+        service = self._get_service(service_id)
+        blocks_by_employee = self._get_blocks_by_employee(service, selected_date)
+
+        holds = slot_holds.live_holds_for_employees(
+            [employee_id for employee_id, _ in blocks_by_employee], selected_date
+        )
+
+        assigned: dict[str, tuple[int, str]] = {}
+        for (employee_id, name), blocks in blocks_by_employee.items():
+            for slot in exclude_booked(
+                self._slots_for_day(selected_date, blocks, service.duration),
+                holds.get(employee_id, []),
+                service.duration,
+            ):
+                assigned.setdefault(slot, (employee_id, name))
+
+        if not assigned:
+            raise ValueError(_("No availability"))
+
+        return {
+            "available_slots": [
+                {"time": slot, "staff_member_id": employee_id, "staff_member": name}
+                for slot, (employee_id, name) in sorted(assigned.items())
+            ],
+            "date_chosen": selected_date.strftime("%a, %B %d, %Y"),
+            "error": False,
+        }
+
     def get_next_available_date(
         self, employee: "Employee", service_id: int, from_date: date
     ) -> date:
+        """First work day after ``from_date`` with a free slot for the service.
+
+        Upcoming availability blocks are read in chunks of
+        ``NEXT_DATE_CHUNK_SIZE`` rows, one query per chunk however busy the
+        days are, plus one cache read for the slot holds of the chunk's days.
+        The scan stops at the first block the service fits in.
+        """
         service = self._get_service(service_id)
-        working_days = WorkDay.objects.filter(
-            employee=employee, date__gt=from_date
-        ).order_by("date")
-
-        for working_day in working_days:
-            try:
-                result = self.get_available_slots_(
-                    working_day.date, employee, service.id
-                )
+        upcoming_blocks = AvailabilityBlock.objects.filter(
+            employee=employee.id, date__gt=from_date
+        ).order_by("date", "pk")
+        cursor = Q()
+
+        while True:
+            chunk = list(
+                upcoming_blocks.filter(cursor).values_list(
+                    "pk", "date", "start_time", "end_time"
+                )[: self.NEXT_DATE_CHUNK_SIZE]
+            )
+            if not chunk:
+                break
+
+            holds = slot_holds.live_holds_for_days(
+                employee.id, {day for _pk, day, _start, _end in chunk}
+            )
+            for _pk, day, start_time, end_time in chunk:
+                if exclude_booked(
+                    self._slots_for_day(
+                        day, [(start_time, end_time)], service.duration
+                    ),
+                    holds.get(day, []),
+                    service.duration,
+                ):
+                    return day
+            last_pk, last_date = chunk[-1][:2]
+            cursor = Q(date__gt=last_date) | Q(date=last_date, pk__gt=last_pk)
 
-                if result.get("available_slots"):
-                    return working_day.date
-            except ValueError:
-                continue
         raise ValueError(_("No available dates found for this employee and service."))
 
     @staticmethod
@@ -68,39 +177,66 @@ class SlotAvailabilityService:
 
     @staticmethod
     def _validate_working_day(employee: "Employee", selected_date: date):
-        working_day_exists = WorkDay.objects.filter(
-            employee=employee.id, date=selected_date
-        ).exists()
-        if not working_day_exists:
+        if not working_dates(employee.id, selected_date, selected_date):
             raise ValueError(_("Day off. Please select another date!"))
 
     @staticmethod
-    def _get_work_days(employee: "Employee", selected_date: date) -> QuerySet[WorkDay]:
-        return WorkDay.objects.filter(employee=employee.id, date=selected_date)
+    def _get_availability_blocks(
+        employee: "Employee", selected_date: date
+    ) -> list[tuple[time, time]]:
+        return list(
+            AvailabilityBlock.objects.filter(employee=employee.id, date=selected_date)
+            .order_by("start_time")
+            .values_list("start_time", "end_time")
+        )
 
     @staticmethod
-    def _get_existing_reservations(
-        employee, selected_date
-    ) -> QuerySet[ReservationRequest]:
-        return ReservationRequest.objects.filter(
-            employee=employee.id, date=selected_date
-        )
+    def _get_work_dates_in_range(
+        employee: "Employee", start_date: date, end_date: date
+    ) -> set[date]:
+        return working_dates(employee.id, start_date, end_date)
+
+    @staticmethod
+    def _get_blocks_in_range(
+        employee: "Employee", start_date: date, end_date: date
+    ) -> dict[date, list[tuple[time, time]]]:
+        blocks = defaultdict(list)
+        for day, start_time, end_time in (
+            AvailabilityBlock.objects.filter(
+                employee=employee.id, date__range=(start_date, end_date)
+            )
+            .order_by("date", "start_time")
+            .values_list("date", "start_time", "end_time")
+        ):
+            blocks[day].append((start_time, end_time))
+        return blocks
+
+    @staticmethod
+    def _get_blocks_by_employee(
+        service: Service, selected_date: date
+    ) -> dict[tuple[int, str], list[tuple[time, time]]]:
+        blocks = defaultdict(list)
+        for employee_id, name, start_time, end_time in (
+            AvailabilityBlock.objects.filter(
+                employee__services=service.id, date=selected_date
+            )
+            .order_by("employee__name", "employee_id", "start_time")
+            .values_list("employee_id", "employee__name", "start_time", "end_time")
+        ):
+            blocks[employee_id, name].append((start_time, end_time))
+        return blocks
+
+    @classmethod
+    def _slots_for_day(
+        cls, day: date, blocks: list[tuple[time, time]], service_duration: int
+    ) -> list[str]:
+        return cls._filter_past_slots(slots_in_blocks(blocks, service_duration), day)
 
     @staticmethod
     def _calculate_available_slots(
-        work_days: "WorkDay",
-        service_duration: int,
-        existing_reservations: "ReservationRequest",
+        blocks: list[tuple[time, time]], service_duration: int
     ) -> list[str]:
-        available_slots = []
-        for work_day in work_days:
-            available_slots += generate_available_slots(
-                work_day.start_time,
-                work_day.end_time,
-                service_duration,
-                existing_reservations,
-            )
-        return available_slots
+        return slots_in_blocks(blocks, service_duration)
 
     @staticmethod
     def _filter_past_slots(
@@ -0,0 +1,182 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from utils import availability_cache
+
+from .availability_blocks import (
+    rebuild_availability_blocks,
+    rebuild_availability_range,
+)
+from .calendar_events import (
+    publish_reservation_change,
+    publish_reservation_deleted,
+)
+from .models import (
+    CalendarTombstone,
+    Reservation,
+    ReservationRequest,
+    ScheduleException,
+    WeeklySchedule,
+    WorkDay,
+)
+from .schedules import horizon_end
+
+# Set while bulk_workdays deletes a batch of work days; it does the work of
+# the WorkDay receivers once for the whole batch.
+_work_day_receivers_muted = ContextVar("work_day_receivers_muted", default=False)
+
+
+@contextmanager
+def mute_work_day_receivers():
+    token = _work_day_receivers_muted.set(True)
+    try:
+        yield
+    finally:
+        _work_day_receivers_muted.reset(token)
+
+
+def _availability_key(instance):
+    # Read from __dict__ so deferred fields are not loaded just for this.
+    day = instance._meta.get_field("date").to_python(instance.__dict__.get("date"))
+    return instance.__dict__.get("employee_id"), day
+
+
+def _changed_keys(instance):
+    """The (employee, date) the row had when loaded and the one it has now."""
+    keys = {instance._loaded_availability_key, _availability_key(instance)}
+    instance._loaded_availability_key = _availability_key(instance)
+    return keys
+
+
+@receiver(post_init, sender=WorkDay)
+@receiver(post_init, sender=ScheduleException)
+@receiver(post_init, sender=ReservationRequest)
+def remember_availability_key(sender, instance, **kwargs):
+    instance._loaded_availability_key = _availability_key(instance)
+
+
+@receiver(post_save, sender=WorkDay)
+@receiver(post_delete, sender=WorkDay)
+@receiver(post_save, sender=ScheduleException)
+@receiver(post_delete, sender=ScheduleException)
+def invalidate_work_day_availability(sender, instance, **kwargs):
+    if sender is WorkDay and _work_day_receivers_muted.get():
+        return
+    for key in _changed_keys(instance):
+        rebuild_availability_blocks(*key)
+        availability_cache.invalidate_work_day(*key)
+
+
+@receiver(post_init, sender=WeeklySchedule)
+def remember_schedule_employee(sender, instance, **kwargs):
+    instance._loaded_employee_id = instance.__dict__.get("employee_id")
+
+
+@receiver(post_save, sender=WeeklySchedule)
+@receiver(post_delete, sender=WeeklySchedule)
+def rebuild_schedule_availability(sender, instance, **kwargs):
+    # A schedule can move every day up to the horizon, so the employee's
+    # whole upcoming range is rebuilt in bulk rather than day by day.
+    today = timezone.localdate()
+    end_date = horizon_end(today)
+    days = [today + timedelta(days=i) for i in range((end_date - today).days + 1)]
+    for employee_id in {instance._loaded_employee_id, instance.employee_id}:
+        if employee_id is None:
+            continue
+        rebuild_availability_range(today, end_date, [employee_id])
+        availability_cache.invalidate_employee(employee_id, days)
+    instance._loaded_employee_id = instance.employee_id
+
+
+@receiver(post_save, sender=ReservationRequest)
+@receiver(post_delete, sender=ReservationRequest)
+def invalidate_reservation_request_availability(sender, instance, **kwargs):
+    for key in _changed_keys(instance):
+        rebuild_availability_blocks(*key)
+        availability_cache.invalidate_day(*key)
+
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+def invalidate_reservation_availability(sender, instance, **kwargs):
+    reservation_request = Reservation.reservation_request.field.get_cached_value(
+        instance, None
+    )
+    if reservation_request is not None:
+        key = _availability_key(reservation_request)
+    else:
+        key = (
+            ReservationRequest.objects.filter(pk=instance.reservation_request_id)
+            .values_list("employee_id", "date")
+            .first()
+        )
+    if key:
+        availability_cache.invalidate_day(*key)
+
+
+@receiver(post_delete, sender=WorkDay)
+def record_work_day_tombstone(sender, instance, **kwargs):
+    if _work_day_receivers_muted.get():
+        return
+    CalendarTombstone.objects.create(feed="WORKDAY", object_id=instance.pk)
+
+
+@receiver(post_delete, sender=WeeklySchedule)
+def record_schedule_tombstone(sender, instance, **kwargs):
+    CalendarTombstone.objects.create(feed="SCHEDULE", object_id=instance.pk)
+
+
+@receiver(post_delete, sender=ScheduleException)
+def record_schedule_exception_tombstone(sender, instance, **kwargs):
+    CalendarTombstone.objects.create(feed="EXCEPTION", object_id=instance.pk)
+
+
+@receiver(post_delete, sender=Reservation)
+def record_reservation_tombstone(sender, instance, **kwargs):
+    CalendarTombstone.objects.create(feed="RESERVATION", object_id=instance.pk)
+    publish_reservation_deleted(instance.pk)
+
+
+STATUS_ACTIONS = {"CONFIRMED": "confirmed", "CANCELLED": "cancelled"}
+
+
+def _schedule(instance):
+    return tuple(
+        instance.__dict__.get(field)
+        for field in ("employee_id", "date", "start_time", "end_time")
+    )
+
+
+@receiver(post_init, sender=Reservation)
+def remember_reservation_status(sender, instance, **kwargs):
+    instance._loaded_status = instance.__dict__.get("status")
+
+
+@receiver(post_init, sender=ReservationRequest)
+def remember_reservation_request_schedule(sender, instance, **kwargs):
+    instance._loaded_schedule = _schedule(instance)
+
+
+@receiver(post_save, sender=Reservation)
+def publish_reservation_status(sender, instance, created, **kwargs):
+    if created:
+        action = "created"
+    elif instance.status != instance._loaded_status:
+        action = STATUS_ACTIONS.get(instance.status)
+    else:
+        action = None
+    instance._loaded_status = instance.status
+    if action:
+        publish_reservation_change(action, pk=instance.pk)
+
+
+@receiver(post_save, sender=ReservationRequest)
+def publish_reservation_move(sender, instance, created, **kwargs):
+    moved = not created and _schedule(instance) != instance._loaded_schedule
+    instance._loaded_schedule = _schedule(instance)
+    if moved:
+        publish_reservation_change("moved", reservation_request_id=instance.pk)
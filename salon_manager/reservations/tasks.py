@@ -1,10 +1,21 @@
+from itertools import islice
+
 from celery import shared_task
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives, send_mail
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Max
+from django.template.loader import get_template, render_to_string
 from django.utils.timezone import now, timedelta
+from utils import availability_cache
 
-from .models import Reservation, ReservationRequest
+from .availability_blocks import rebuild_availability_range
+from .models import (
+    AvailabilityBlock,
+    CalendarTombstone,
+    Reservation,
+    WeeklySchedule,
+)
+from .schedules import horizon_end
 
 
 @shared_task
@@ -71,35 +82,61 @@ def send_confirmation_email(
     return msg.send()
 
 
+# Reminders go out over a single mail server connection, rendered and sent
+# this many at a time so a busy day is never held in memory at once.
+REMINDER_CHUNK_SIZE = 200
+
+
+def _reminder_message(reservation, template, connection):
+    start_time = reservation["reservation_request__start_time"]
+    message = EmailMultiAlternatives(
+        "Your appointment is tomorrow!",
+        f"Hi {reservation['name']}, don't forget your appointment tomorrow at {start_time}.",
+        "noreply@twojsalon.pl",
+        [reservation["email"]],
+        connection=connection,
+    )
+    context = {
+        "name": reservation["name"],
+        "date": reservation["reservation_request__date"],
+        "time": start_time,
+        "service": reservation["reservation_request__service__name"],
+    }
+    message.attach_alternative(template.render(context), "text/html")
+    return message
+
+
 @shared_task
 def send_upcoming_reminder():
     today = now()
     tomorrow = today.date() + timedelta(days=1)
 
-    reservations = Reservation.objects.filter(
-        reservation_request__date=tomorrow, status="CONFIRMED"
+    reservations = (
+        Reservation.objects.filter(
+            reservation_request__date=tomorrow, status="CONFIRMED"
+        )
+        .exclude(email__isnull=True)
+        .exclude(email="")
+        .values(
+            "name",
+            "email",
+            "reservation_request__date",
+            "reservation_request__start_time",
+            "reservation_request__service__name",
+        )
+        .iterator(chunk_size=REMINDER_CHUNK_SIZE)
     )
+    template = get_template("emails/upcoming_reminder.html")
 
     email_counter = 0
 
-    for reservation in reservations:
-        subject = "Your appointment is tomorrow!"
-        to_email = reservation.email
-        context = {
-            "name": reservation.name,
-            "date": reservation.reservation_request.date,
-            "time": reservation.reservation_request.start_time,
-            "service": reservation.get_service_name(),
-        }
-        html_message = render_to_string("emails/upcoming_reminder.html", context)
-        send_mail(
-            subject,
-            f"Hi {reservation.name}, don't forget your appointment tomorrow at {reservation.reservation_request.start_time}.",
-            "noreply@twojsalon.pl",
-            [to_email],
-            html_message=html_message,
-        )
-        email_counter += 1
+    with get_connection() as connection:
+        while chunk := list(islice(reservations, REMINDER_CHUNK_SIZE)):
+            messages = [
+                _reminder_message(reservation, template, connection)
+                for reservation in chunk
+            ]
+            email_counter += connection.send_messages(messages) or 0
 
     return f"Sent {email_counter} reminder emails."
 
@@ -110,7 +147,7 @@ def change_reservation_status():
 
     reservations = Reservation.objects.filter(
         status="CONFIRMED", reservation_request__date__lte=today
-    )
+    ).select_related("reservation_request")
 
     updated_count = 0
 
@@ -127,10 +164,37 @@ def change_reservation_status():
 
 
 @shared_task
-def cleanup_expired_requests():
-    expired_requests = ReservationRequest.objects.filter(
-        expires_at__lt=now(), reservation__isnull=True
-    )
-    count = expired_requests.count()
-    expired_requests.delete()
-    return f"Deleted {count} expired requests"
+def prune_calendar_tombstones():
+    cutoff = now() - timedelta(days=settings.CALENDAR_TOMBSTONE_RETENTION_DAYS)
+    count, _ = CalendarTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return f"Deleted {count} calendar tombstones"
+
+
+# Days before the horizon that a run rebuilds at most, so that a few missed
+# beat runs are caught up; longer outages need the rebuild_availability command.
+HORIZON_CATCH_UP_DAYS = 7
+
+
+@shared_task
+def extend_availability_horizon():
+    """Build the schedule blocks of the days that entered the horizon since
+    the last materialized one."""
+    last_day = horizon_end()
+    last_built = AvailabilityBlock.objects.filter(
+        schedule__isnull=False, date__lte=last_day
+    ).aggregate(last=Max("date"))["last"]
+    first_day = last_day - timedelta(days=HORIZON_CATCH_UP_DAYS)
+    if last_built is not None:
+        first_day = min(max(first_day, last_built + timedelta(days=1)), last_day)
+    count = rebuild_availability_range(first_day, last_day)
+    # These days may have been looked up before they had any blocks.
+    days = [
+        first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)
+    ]
+    for employee_id in (
+        WeeklySchedule.objects.order_by()
+        .values_list("employee_id", flat=True)
+        .distinct()
+    ):
+        availability_cache.invalidate_employee(employee_id, days)
+    return f"Built {count} availability blocks for {first_day} - {last_day}"
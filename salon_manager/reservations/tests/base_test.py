@@ -1,8 +1,14 @@
-from datetime import date, time
+from datetime import date, time, timedelta
+from typing import Any, Optional
 
-from django.test import TestCase
-from reservations.models import WorkDay
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from reservations.models import Reservation, ReservationRequest, WorkDay
 from services.models import Service, ServiceCategory
+from silk.collector import DataCollector
 from users.models import CustomUser, Employee
 
 
@@ -78,3 +84,124 @@ class BaseTestCase(TestCase):
             start_time=time(9, 0),
             end_time=time(17, 0),
         )
+
+    def setUp(self):
+        super().setUp()
+        # Silk keeps the last profiled request around and would otherwise
+        # EXPLAIN every query run after a test client request.
+        DataCollector().clear()
+        cache.clear()
+
+
+class QueryBudgetTestCase(BaseTestCase):
+    """Counts the queries of a request against a salon seeded at two sizes.
+
+    ``seed_salon`` adds employees, services, customers, work days and
+    reservations in every status, so calling it again between two
+    measurements shows whether a view's query count grows with the data.
+    """
+
+    RESERVATION_STATUSES = ("PENDING", "CONFIRMED", "CANCELLED")
+
+    @classmethod
+    def seed_salon(cls, scale: int) -> None:
+        tomorrow = date.today() + timedelta(days=1)
+        first = Employee.objects.count()
+        for number in range(first, first + scale):
+            category = ServiceCategory.objects.create(name=f"Category {number}")
+            services = [
+                Service.objects.create(
+                    name=f"Service {number}.{variant}",
+                    category=category,
+                    duration=30 * variant,
+                    price=100 * variant,
+                )
+                for variant in (1, 2)
+            ]
+            customer = CustomUser.objects.create_user(
+                username=f"customer{number}",
+                email=f"customer{number}@test.com",
+                role="CUSTOMER",
+            )
+            employee = Employee.objects.create(
+                user=CustomUser.objects.create_user(
+                    username=f"employee{number}",
+                    email=f"employee{number}@test.com",
+                    role="EMPLOYEE",
+                ),
+                name=f"Employee {number}",
+            )
+            employee.services.add(cls.service1, *services)
+
+            for offset in range(7):
+                day = tomorrow + timedelta(days=offset)
+                WorkDay.objects.create(
+                    employee=employee,
+                    date=day,
+                    start_time=time(9, 0),
+                    end_time=time(17, 0),
+                )
+                for hour, status in zip((9, 11, 13), cls.RESERVATION_STATUSES):
+                    cls._seed_reservation(
+                        employee, day, hour, status, customer, services[0]
+                    )
+            # Employee 1 works tomorrow; the seeded bookings fill the
+            # morning one hour per employee added.
+            cls._seed_reservation(
+                cls.employee1,
+                tomorrow,
+                9 + number - 1,
+                cls.RESERVATION_STATUSES[number % 3],
+                cls.users["client1"],
+                cls.service1,
+            )
+
+    @staticmethod
+    def _seed_reservation(
+        employee: Employee,
+        day: date,
+        hour: int,
+        status: str,
+        customer: CustomUser,
+        service: Service,
+    ) -> Reservation:
+        reservation_request = ReservationRequest.objects.create(
+            date=day,
+            start_time=time(hour, 0),
+            end_time=time(hour + 1, 0),
+            service=service,
+            employee=employee,
+        )
+        return Reservation.objects.create(
+            reservation_request=reservation_request,
+            customer=customer,
+            name=customer.username,
+            email=customer.email,
+            status=status,
+        )
+
+    def count_queries(
+        self,
+        url: str,
+        method: str = "get",
+        user: Optional[CustomUser] = None,
+        data: Optional[Any] = None,
+        content_type: Optional[str] = None,
+    ) -> int:
+        """Queries run by one request, whose changes are rolled back.
+
+        Silk is left out of the middleware, as it records every request
+        with queries of its own.
+        """
+        if user is not None:
+            self.client.force_login(user)
+        middleware = [name for name in settings.MIDDLEWARE if "silk" not in name]
+        extra = {"content_type": content_type} if content_type else {}
+        with override_settings(MIDDLEWARE=middleware), transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(self.client, method)(url, data, **extra)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            transaction.set_rollback(True)
+        self.client.logout()
+        return len(queries)
@@ -0,0 +1,75 @@
+from datetime import datetime, time, timedelta
+
+from django.test import SimpleTestCase
+from utils.availability import DayGrid, blocked_start_ranges, exclude_booked
+
+
+def reference_slots(start_time, end_time, service_duration, booked):
+    """The original nested-loop slot search, kept as the reference oracle."""
+    base_date = datetime.now().date()
+    start_datetime = datetime.combine(base_date, start_time)
+    end_datetime = datetime.combine(base_date, end_time)
+
+    available_slots = []
+    current_slot_start = start_datetime
+
+    while current_slot_start + timedelta(minutes=service_duration) <= end_datetime:
+        current_slot_end = current_slot_start + timedelta(minutes=service_duration)
+
+        is_available = True
+        for start, end in booked:
+            res_start = datetime.combine(base_date, start)
+            res_end = datetime.combine(base_date, end)
+
+            if current_slot_start <= res_end and current_slot_end >= res_start:
+                is_available = False
+                break
+
+        if is_available:
+            available_slots.append(current_slot_start.strftime("%H:%M"))
+
+        current_slot_start += timedelta(minutes=15)
+    return available_slots
+
+
+def random_time(rng, low_minutes=0, high_minutes=24 * 60 - 1, seconds=False):
+    minutes = rng.randint(low_minutes, high_minutes)
+    second = rng.choice([0, 0, 0, 30, 59]) if seconds else 0
+    return time(minutes // 60, minutes % 60, second)
+
+
+class TestBlockedStartRanges(SimpleTestCase):
+    def test_ranges_are_sorted_and_merged(self):
+        minute = 60 * 1_000_000
+        blocked = blocked_start_ranges(
+            [(time(11, 0), time(12, 0)), (time(9, 0), time(10, 0))], 60
+        )
+        self.assertEqual(blocked, [(8 * 60 * minute, 12 * 60 * minute)])
+
+    def test_exclude_booked_drops_touching_slots(self):
+        slots = ["09:00", "09:15", "09:30", "09:45", "10:00", "11:00", "11:15"]
+        self.assertEqual(
+            exclude_booked(slots, [(time(10, 0), time(11, 0))], 30),
+            ["09:00", "09:15", "11:15"],
+        )
+
+
+class TestDayGrid(SimpleTestCase):
+    def test_each_work_window_keeps_its_own_candidate_grid(self):
+        grid = DayGrid.build(
+            [(time(9, 0), time(10, 0)), (time(13, 10), time(14, 0))],
+            [(time(13, 30), time(13, 40))],
+        )
+        self.assertEqual(
+            grid.free_blocks(), [(0, 540, 600), (1, 790, 809), (1, 835, 840)]
+        )
+
+    def test_booking_touching_midnight_is_clamped(self):
+        grid = DayGrid.build([(time(0, 0), time(2, 0))], [(time(0, 0), time(0, 30))])
+        self.assertEqual(grid.free_blocks(), [(0, 45, 120)])
+
+    def test_seconds_are_rounded_conservatively(self):
+        grid = DayGrid.build(
+            [(time(9, 0), time(11, 0))], [(time(9, 59, 30), time(10, 0, 30))]
+        )
+        self.assertEqual(grid.free_blocks(), [(0, 540, 598), (0, 615, 660)])
@@ -0,0 +1,162 @@
+import random
+from datetime import date, time, timedelta
+from importlib import import_module
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import SimpleTestCase
+from reservations.availability_blocks import _build_blocks
+from reservations.models import AvailabilityBlock, ReservationRequest, WorkDay
+from utils.availability import slots_in_blocks
+
+from .base_test import BaseTestCase
+from .test_availability import random_time, reference_slots
+
+backfill = import_module("reservations.migrations.0024_backfill_availability_blocks")
+
+
+class TestBlocksMatchReferenceSlots(SimpleTestCase):
+    def test_slots_read_from_blocks_match_the_reference(self):
+        rng = random.Random(6)
+        day = date(2025, 1, 1)
+        for _ in range(300):
+            work_hours = []
+            for _ in range(rng.randint(1, 3)):
+                start = random_time(rng, 6 * 60, 20 * 60)
+                end = random_time(rng, start.hour * 60 + start.minute, 23 * 60 + 59)
+                work_hours.append((start, end))
+            booked = []
+            for _ in range(rng.randint(0, 15)):
+                start = random_time(rng, 0, 23 * 60)
+                minutes = min(
+                    start.hour * 60 + start.minute + rng.randint(0, 120), 24 * 60 - 1
+                )
+                booked.append((start, time(*divmod(minutes, 60))))
+            work_days = [(index, *hours) for index, hours in enumerate(work_hours)]
+
+            blocks = [
+                (block.start_time, block.end_time)
+                for block in _build_blocks(1, day, work_days, booked)
+            ]
+            for duration in (15, 30, 45, 60, 90):
+                self.assertEqual(
+                    slots_in_blocks(blocks, duration),
+                    [
+                        slot
+                        for start, end in work_hours
+                        for slot in reference_slots(start, end, duration, booked)
+                    ],
+                )
+
+
+class TestBackfillMatchesBlocks(SimpleTestCase):
+    def test_backfill_builds_the_same_blocks(self):
+        rng = random.Random(24)
+        day = date(2025, 1, 1)
+        for _ in range(300):
+            start = random_time(rng, 6 * 60, 20 * 60)
+            end = random_time(rng, start.hour * 60 + start.minute, 23 * 60 + 59)
+            booked = []
+            for _ in range(rng.randint(0, 15)):
+                booked_start = random_time(rng, 0, 23 * 60)
+                minutes = min(
+                    booked_start.hour * 60 + booked_start.minute + rng.randint(0, 120),
+                    24 * 60 - 1,
+                )
+                booked.append((booked_start, time(*divmod(minutes, 60))))
+
+            expected = [
+                (block.start_time, block.end_time)
+                for block in _build_blocks(1, day, [(1, start, end)], booked)
+            ]
+            self.assertEqual(
+                [
+                    (time(*divmod(first_start, 60)), time(*divmod(block_end, 60)))
+                    for first_start, block_end in backfill.free_blocks(
+                        start, end, booked
+                    )
+                ],
+                expected,
+            )
+
+
+class TestAvailabilityBlocks(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tomorrow = date.today() + timedelta(days=1)
+        cls.work_day = WorkDay.objects.create(
+            employee=cls.employee1,
+            date=cls.tomorrow,
+            start_time=time(9, 0),
+            end_time=time(12, 0),
+        )
+
+    def blocks(self, day=None):
+        return list(
+            AvailabilityBlock.objects.filter(
+                employee=self.employee1, date=day or self.tomorrow
+            )
+            .order_by("start_time")
+            .values_list("start_time", "end_time")
+        )
+
+    def book(self, start, end):
+        return ReservationRequest.objects.create(
+            date=self.tomorrow,
+            start_time=start,
+            end_time=end,
+            service=self.service1,
+            employee=self.employee1,
+        )
+
+    def test_work_day_creates_one_free_block(self):
+        self.assertEqual(self.blocks(), [(time(9, 0), time(12, 0))])
+
+    def test_booking_splits_and_cancelling_restores_the_block(self):
+        reservation_request = self.book(time(10, 0), time(10, 30))
+        self.assertEqual(
+            self.blocks(),
+            [(time(9, 0), time(9, 59)), (time(10, 45), time(12, 0))],
+        )
+        reservation_request.delete()
+        self.assertEqual(self.blocks(), [(time(9, 0), time(12, 0))])
+
+    def test_moving_a_work_day_rebuilds_both_dates(self):
+        day_after = self.tomorrow + timedelta(days=1)
+        self.work_day.date = day_after
+        self.work_day.save()
+        self.assertEqual(self.blocks(), [])
+        self.assertEqual(self.blocks(day_after), [(time(9, 0), time(12, 0))])
+
+    def test_rebuild_command_restores_missing_blocks(self):
+        self.book(time(10, 0), time(10, 30))
+        all_blocks = AvailabilityBlock.objects.order_by("date", "start_time")
+        expected = list(all_blocks.values_list("date", "start_time", "end_time"))
+        all_blocks.delete()
+
+        out = StringIO()
+        call_command("rebuild_availability", stdout=out)
+
+        self.assertIn(f"Rebuilt {len(expected)} availability blocks", out.getvalue())
+        self.assertEqual(
+            list(all_blocks.values_list("date", "start_time", "end_time")), expected
+        )
+
+    def test_backfill_with_historical_models_restores_work_day_blocks(self):
+        self.book(time(10, 0), time(10, 30))
+        all_blocks = AvailabilityBlock.objects.order_by("date", "start_time")
+        expected = list(all_blocks.values_list("date", "start_time", "end_time"))
+        all_blocks.delete()
+        apps = (
+            MigrationLoader(connection)
+            .project_state(("reservations", "0024_backfill_availability_blocks"))
+            .apps
+        )
+
+        backfill.backfill_availability_blocks(apps, None)
+        self.assertEqual(
+            list(all_blocks.values_list("date", "start_time", "end_time")), expected
+        )
@@ -0,0 +1,134 @@
+from datetime import date, time, timedelta
+
+from django.utils import timezone
+from reservations.models import Reservation, ReservationRequest, WorkDay
+from reservations.service import SlotAvailabilityService
+from utils.support_functions import _calculate_non_working_days
+
+from .base_test import BaseTestCase
+
+
+class TestAvailabilityCache(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tomorrow = date.today() + timedelta(days=1)
+        cls.work_day = WorkDay.objects.create(
+            employee=cls.employee1,
+            date=cls.tomorrow,
+            start_time=time(9, 0),
+            end_time=time(11, 0),
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.service = SlotAvailabilityService()
+
+    def get_slots(self, day=None):
+        return self.service.get_available_slots_(
+            day or self.tomorrow, self.employee1, self.service1.id
+        )["available_slots"]
+
+    def book(self, start, end, day=None):
+        return ReservationRequest.objects.create(
+            date=day or self.tomorrow,
+            start_time=start,
+            end_time=end,
+            service=self.service1,
+            employee=self.employee1,
+        )
+
+    def test_cached_slots_skip_reservation_queries(self):
+        self.get_slots()
+        # Only the working day check and the service lookup remain.
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                self.get_slots(), ["09:00", "09:15", "09:30", "09:45", "10:00"]
+            )
+
+    def test_new_reservation_request_invalidates_day(self):
+        self.get_slots()
+        self.book(time(9, 0), time(10, 0))
+        with self.assertRaises(ValueError):
+            self.get_slots()
+
+    def test_deleted_reservation_request_invalidates_day(self):
+        reservation_request = self.book(time(9, 0), time(9, 30))
+        self.assertEqual(self.get_slots(), ["09:45", "10:00"])
+        reservation_request.delete()
+        self.assertEqual(len(self.get_slots()), 5)
+
+    def test_moved_reservation_request_invalidates_both_days(self):
+        other_day = self.tomorrow + timedelta(days=1)
+        WorkDay.objects.create(
+            employee=self.employee1,
+            date=other_day,
+            start_time=time(9, 0),
+            end_time=time(11, 0),
+        )
+        reservation_request = self.book(time(10, 30), time(11, 0))
+        self.assertEqual(self.get_slots(), ["09:00", "09:15"])
+        self.assertEqual(len(self.get_slots(other_day)), 5)
+
+        reservation_request = ReservationRequest.objects.get(pk=reservation_request.pk)
+        reservation_request.date = other_day
+        reservation_request.save()
+
+        self.assertEqual(len(self.get_slots()), 5)
+        self.assertEqual(self.get_slots(other_day), ["09:00", "09:15"])
+
+    def test_updated_work_day_invalidates_day(self):
+        self.get_slots()
+        self.work_day.end_time = time(10, 0)
+        self.work_day.save()
+        self.assertEqual(self.get_slots(), ["09:00"])
+
+    def test_other_days_stay_cached(self):
+        self.get_slots()
+        self.book(time(9, 0), time(10, 0), day=date.today())
+        with self.assertNumQueries(2):
+            self.get_slots()
+
+    def test_reservation_save_invalidates_its_day(self):
+        reservation_request = self.book(time(9, 0), time(9, 30))
+        reservation = Reservation.objects.create(
+            reservation_request=reservation_request, name="Test"
+        )
+        self.get_slots()
+        reservation = Reservation.objects.get(pk=reservation.pk)
+        reservation.status = "CONFIRMED"
+        with self.assertNumQueries(2):
+            reservation.save()
+        with self.assertNumQueries(3):
+            self.get_slots()
+
+
+class TestNonWorkingDaysCache(BaseTestCase):
+    def test_non_working_days_are_cached(self):
+        first = _calculate_non_working_days(self.employee1)
+        with self.assertNumQueries(0):
+            self.assertEqual(_calculate_non_working_days(self.employee1), first)
+
+    def test_new_work_day_invalidates_non_working_days(self):
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        self.assertIn(tomorrow.isoformat(), _calculate_non_working_days(self.employee1))
+        WorkDay.objects.create(
+            employee=self.employee1,
+            date=tomorrow,
+            start_time=time(9, 0),
+            end_time=time(17, 0),
+        )
+        self.assertNotIn(
+            tomorrow.isoformat(), _calculate_non_working_days(self.employee1)
+        )
+
+    def test_moved_work_day_invalidates_non_working_days(self):
+        today = timezone.localdate()
+        _calculate_non_working_days(self.employee1)
+        work_day = WorkDay.objects.get(pk=self.workday.pk)
+        work_day.date = today + timedelta(days=5)
+        work_day.save()
+
+        non_working_days = _calculate_non_working_days(self.employee1)
+        self.assertIn(today.isoformat(), non_working_days)
+        self.assertNotIn((today + timedelta(days=5)).isoformat(), non_working_days)
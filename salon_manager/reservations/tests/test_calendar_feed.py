@@ -0,0 +1,151 @@
+from datetime import date, time, timedelta, timezone
+
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import reverse
+from django.utils.http import http_date
+from reservations.api import employee_calendar_feed
+from reservations.models import (
+    Reservation,
+    ReservationRequest,
+    ScheduleException,
+    WeeklySchedule,
+    WorkDay,
+)
+from utils.ical import CalendarEvent, build_calendar, escape_text, local_datetime
+
+from .base_test import BaseTestCase
+
+
+class TestBuildCalendar(SimpleTestCase):
+    def test_text_is_escaped_and_long_lines_folded(self):
+        start = local_datetime(date(2025, 1, 6), time(9, 0))
+        body = build_calendar(
+            "Daniel",
+            [
+                CalendarEvent(
+                    uid="reservation-1@salon-manager",
+                    start=start,
+                    end=start + timedelta(hours=1),
+                    summary="Manicure; classic, long " + "ż" * 60,
+                    stamp=start,
+                )
+            ],
+        )
+        lines = body.split("\r\n")
+        self.assertTrue(body.endswith("END:VCALENDAR\r\n"))
+        self.assertIn("DTSTART:20250106T080000Z", lines)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in lines))
+        summary = "".join(
+            line[1:] if line.startswith(" ") else line
+            for line in lines
+            if line.startswith(("SUMMARY", " "))
+        )
+        self.assertEqual(
+            summary, "SUMMARY:" + escape_text("Manicure; classic, long " + "ż" * 60)
+        )
+        self.assertIn("\\;", summary)
+
+
+class TestEmployeeCalendarFeed(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.token = self.employee1.get_calendar_token()
+        self.tomorrow = date.today() + timedelta(days=1)
+        self.work_day = WorkDay.objects.create(
+            employee=self.employee1,
+            date=self.tomorrow,
+            start_time=time(9, 0),
+            end_time=time(17, 0),
+        )
+        self.confirmed = self.book(time(10, 0), "Alice", "CONFIRMED")
+        self.pending = self.book(time(12, 0), "Bob", "PENDING")
+
+    def book(self, start, name, status):
+        reservation_request = ReservationRequest.objects.create(
+            date=self.tomorrow,
+            start_time=start,
+            end_time=time(start.hour + 1, 0),
+            service=self.service1,
+            employee=self.employee1,
+        )
+        return Reservation.objects.create(
+            reservation_request=reservation_request, name=name, status=status
+        )
+
+    def feed(self, **headers):
+        request = RequestFactory().get("/", headers=headers)
+        return employee_calendar_feed(request, self.token)
+
+    def test_feed_lists_work_days_and_confirmed_visits(self):
+        response = self.client.get(reverse("employee_calendar_feed", args=[self.token]))
+        body = response.content.decode()
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        self.assertIn(f"UID:workday-{self.work_day.pk}@salon-manager", body)
+        self.assertIn(f"UID:reservation-{self.confirmed.pk}@salon-manager", body)
+        self.assertIn("SUMMARY:Manicure classic: Alice", body)
+        self.assertNotIn("Bob", body)
+        start = local_datetime(self.tomorrow, time(10, 0))
+        self.assertIn(
+            f"DTSTART:{start.astimezone(timezone.utc):%Y%m%dT%H%M%SZ}\r\n", body
+        )
+
+    def test_unchanged_feed_costs_one_query(self):
+        etag = self.feed()["ETag"]
+        with self.assertNumQueries(1):
+            response = self.feed(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_if_modified_since_alone_gets_the_current_feed(self):
+        self.assertNotIn("Last-Modified", self.feed())
+        self.confirmed.delete()
+        response = self.feed(if_modified_since=http_date())
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Alice", response.content.decode())
+
+    def test_etag_follows_changes(self):
+        etags = [self.feed()["ETag"]]
+        self.pending.status = "CONFIRMED"
+        self.pending.save()
+        etags.append(self.feed()["ETag"])
+        self.pending.delete()
+        etags.append(self.feed()["ETag"])
+        self.work_day.delete()
+        etags.append(self.feed()["ETag"])
+        self.assertEqual(len(set(etags)), 4)
+
+    def test_feed_includes_schedule_hours_and_follows_their_changes(self):
+        day = self.tomorrow + timedelta(days=1)
+        etag = self.feed()["ETag"]
+        schedule = WeeklySchedule.objects.create(
+            employee=self.employee1,
+            weekday=day.weekday(),
+            start_time=time(10, 0),
+            end_time=time(14, 0),
+            valid_from=day,
+        )
+        response = self.feed(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            f"UID:schedule-{schedule.pk}-{day.isoformat()}@salon-manager",
+            response.content.decode(),
+        )
+
+        etag = response["ETag"]
+        ScheduleException.objects.create(employee=self.employee1, date=day)
+        response = self.feed(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(f"UID:schedule-{schedule.pk}-{day}", response.content.decode())
+
+    def test_unknown_token(self):
+        self.token = "not-a-token"
+        with self.assertRaises(Http404):
+            self.feed()
+
+    def test_profile_shows_the_subscription_url(self):
+        self.client.force_login(self.users["employee1"])
+        response = self.client.get(reverse("profile"))
+        self.assertContains(
+            response, reverse("employee_calendar_feed", args=[self.token])
+        )
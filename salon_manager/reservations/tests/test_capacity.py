@@ -0,0 +1,124 @@
+import json
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from reservations.capacity import free_slot_matrix
+from reservations.models import AvailabilityBlock, ReservationRequest, WorkDay
+from users.models import Employee
+from utils.availability import slots_in_blocks
+
+from .base_test import BaseTestCase
+
+
+class TestFreeSlotMatrix(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tomorrow = date.today() + timedelta(days=1)
+        cls.employee2 = Employee.objects.create(
+            user=cls.users["employee2"], name="Samantha"
+        )
+        for offset, employee, start, end in (
+            (1, cls.employee1, time(9, 0), time(12, 0)),
+            (1, cls.employee1, time(13, 10), time(15, 0)),
+            (2, cls.employee1, time(8, 0), time(16, 0)),
+            (1, cls.employee2, time(10, 0), time(18, 0)),
+        ):
+            WorkDay.objects.create(
+                employee=employee,
+                date=date.today() + timedelta(days=offset),
+                start_time=start,
+                end_time=end,
+            )
+        for offset, start, end in (
+            (1, time(10, 0), time(10, 45)),
+            (2, time(12, 5), time(13, 0)),
+        ):
+            ReservationRequest.objects.create(
+                date=date.today() + timedelta(days=offset),
+                start_time=start,
+                end_time=end,
+                service=cls.service1,
+                employee=cls.employee1,
+            )
+
+    def test_counts_match_slots_read_from_blocks(self):
+        durations = [15, 60, 90]
+        matrix = free_slot_matrix(
+            date.today(), date.today() + timedelta(days=3), durations
+        )
+
+        self.assertEqual(matrix.counts.shape, (3, 2, 4))
+        for employee_index, (employee_id, _) in enumerate(matrix.employees):
+            for day_index, day in enumerate(matrix.days):
+                blocks = AvailabilityBlock.objects.filter(
+                    employee=employee_id, date=day
+                ).values_list("start_time", "end_time")
+                for duration_index, duration in enumerate(durations):
+                    self.assertEqual(
+                        matrix.counts[duration_index, employee_index, day_index],
+                        len(slots_in_blocks(blocks, duration)),
+                    )
+
+    def test_loads_all_blocks_with_one_query(self):
+        with self.assertNumQueries(1):
+            free_slot_matrix(date.today(), date.today() + timedelta(days=56), [90])
+
+    def test_service_filter_keeps_only_staff_offering_it(self):
+        matrix = free_slot_matrix(
+            self.tomorrow, self.tomorrow, [60], service_id=self.service1.id
+        )
+        self.assertEqual(matrix.employees, [(self.employee1.id, "Daniel")])
+
+    def test_summary_totals(self):
+        summary = free_slot_matrix(self.tomorrow, self.tomorrow, [60]).as_dict()
+        by_employee = summary["durations"]["60"]["by_employee"]
+        # Samantha: 10:00-18:00 holds starts 10:00 to 17:00.
+        self.assertEqual(by_employee[str(self.employee2.id)]["free_slots"], 29)
+        self.assertEqual(
+            summary["durations"]["60"]["total"],
+            sum(employee["free_slots"] for employee in by_employee.values()),
+        )
+
+
+class TestCapacityReport(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("capacity_report")
+        self.params = {
+            "start": date.today().isoformat(),
+            "end": (date.today() + timedelta(days=6)).isoformat(),
+            "durations": "60,90",
+        }
+
+    def test_owner_gets_capacity(self):
+        self.client.force_login(self.users["superuser"])
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(set(data["durations"]), {"60", "90"})
+        self.assertEqual(len(data["durations"]["60"]["by_day"]), 7)
+
+    def test_other_users_are_rejected(self):
+        self.client.force_login(self.users["client1"])
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalid_durations_are_rejected(self):
+        self.client.force_login(self.users["superuser"])
+        response = self.client.get(self.url, {**self.params, "durations": "60,x"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["message"], "Durations must be comma-separated minutes"
+        )
+
+    def test_management_command_prints_json(self):
+        out = StringIO()
+        call_command("capacity_report", "--duration", "60", "--weeks", "1", stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["start"], timezone.localdate().isoformat())
+        self.assertIn("60", report["durations"])
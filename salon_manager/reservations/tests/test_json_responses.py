@@ -0,0 +1,136 @@
+import json
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from reservations.forms import WorkDayForm
+from utils import json_encoding
+from utils.json_encoding import FastJsonResponse
+from utils.support_functions import streaming_json_response
+
+
+class TestStreamingJsonResponse(SimpleTestCase):
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_streams_a_json_array(self):
+        items = [
+            {"id": index, "date": date(2025, 1, 1), "at": time(9)} for index in range(7)
+        ]
+        for batch_size in (1, 3, 7, 500):
+            with self.subTest(batch_size=batch_size):
+                response = streaming_json_response(iter(items), batch_size=batch_size)
+                self.assertEqual(response["Content-Type"], "application/json")
+                self.assertEqual(
+                    json.loads(self.body(response)),
+                    [
+                        {"id": index, "date": "2025-01-01", "at": "09:00:00"}
+                        for index in range(7)
+                    ],
+                )
+
+    def test_empty_array(self):
+        self.assertEqual(self.body(streaming_json_response(iter([]))), b"[]")
+
+    def test_items_are_encoded_in_batches_while_streaming(self):
+        consumed = []
+
+        def items():
+            for index in range(5):
+                consumed.append(index)
+                yield index
+
+        chunks = iter(streaming_json_response(items(), batch_size=2).streaming_content)
+        self.assertEqual(next(chunks), b"[")
+        self.assertEqual(next(chunks), b"0,1")
+        self.assertEqual(consumed, [0, 1])
+
+    async def test_asynchronous_stream_for_asgi(self):
+        response = streaming_json_response(
+            iter([{"id": 1}, {"id": 2}]), batch_size=1, asynchronous=True
+        )
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(chunks, [b"[", b'{"id":1}', b',{"id":2}', b"]"])
+
+
+class TestJsonEncoding(SimpleTestCase):
+    payload = {
+        "day": date(2025, 1, 6),
+        "at": time(9, 30, 15, 123456),
+        "updated": datetime(2025, 1, 6, 9, 30, 15, 123456, tzinfo=timezone.utc),
+        "price": Decimal("120.50"),
+        "token": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "label": gettext_lazy("Manicure"),
+        "name": "Zoë",
+    }
+
+    def test_stdlib_backend_matches_django_formatting(self):
+        with override_settings(JSON_ENCODER_BACKEND="stdlib"):
+            encoded = json_encoding.dumps(self.payload)
+        self.assertEqual(
+            json.loads(encoded),
+            {
+                "day": "2025-01-06",
+                "at": "09:30:15.123",
+                "updated": "2025-01-06T09:30:15.123Z",
+                "price": "120.50",
+                "token": "12345678-1234-5678-1234-567812345678",
+                "label": "Manicure",
+                "name": "Zoë",
+            },
+        )
+
+    @skipUnless("orjson" in json_encoding.BACKENDS, "orjson is not installed")
+    def test_backends_write_identical_bytes(self):
+        self.assertEqual(
+            json_encoding.BACKENDS["orjson"](self.payload),
+            json_encoding.BACKENDS["stdlib"](self.payload),
+        )
+
+    def test_backends_agree_on_keys_form_errors_and_big_integers(self):
+        form = WorkDayForm(data={})
+        payload = {
+            1: "one",
+            None: "none",
+            "errors": form.errors,
+            "count": 2**70,
+        }
+        encoded = {
+            name: json.loads(backend(payload))
+            for name, backend in json_encoding.BACKENDS.items()
+        }
+        for name, data in encoded.items():
+            with self.subTest(backend=name):
+                self.assertEqual(data["1"], "one")
+                self.assertEqual(data["null"], "none")
+                self.assertEqual(data["errors"]["date"], ["This field is required."])
+                self.assertEqual(data["count"], 2**70)
+
+    def test_auto_prefers_orjson_when_installed(self):
+        expected = "orjson" if "orjson" in json_encoding.BACKENDS else "stdlib"
+        with override_settings(JSON_ENCODER_BACKEND="auto"):
+            self.assertEqual(json_encoding.backend_name(), expected)
+
+    def test_unknown_backend_is_rejected(self):
+        with override_settings(JSON_ENCODER_BACKEND="simdjson"):
+            with self.assertRaises(ImproperlyConfigured):
+                json_encoding.dumps({})
+
+    def test_response_requires_a_dict_unless_unsafe(self):
+        with self.assertRaises(TypeError):
+            FastJsonResponse([1])
+        response = FastJsonResponse([1], safe=False, status=201)
+        self.assertEqual((response.status_code, response.content), (201, b"[1]"))
+
+    def test_benchmark_command_times_every_backend(self):
+        out = StringIO()
+        call_command("benchmark_json", "--events", "50", "--repeat", "1", stdout=out)
+        for name in json_encoding.BACKENDS:
+            self.assertIn(f"{name}:", out.getvalue())
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import threading
+from datetime import date, time, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import reverse
+from reservations.api import reservation_stream
+from reservations.calendar_events import RESERVATIONS_CHANNEL
+from reservations.models import Reservation, ReservationRequest
+from utils import live_updates
+from utils.live_updates import InProcessBroker, RedisBroker
+
+from .base_test import BaseTestCase
+
+
+class TestInProcessBroker(SimpleTestCase):
+    def test_messages_published_from_other_threads_reach_subscribers(self):
+        broker = InProcessBroker()
+
+        async def receive():
+            subscription = await broker.subscribe("calendar")
+            publisher = threading.Thread(
+                target=broker.publish, args=("calendar", {"id": 1})
+            )
+            publisher.start()
+            try:
+                return await subscription.get(timeout=1)
+            finally:
+                publisher.join()
+                await subscription.close()
+
+        self.assertEqual(asyncio.run(receive()), {"id": 1})
+
+    def test_get_times_out_and_closed_subscriptions_stop_receiving(self):
+        broker = InProcessBroker()
+
+        async def receive():
+            subscription = await broker.subscribe("calendar")
+            timed_out = await subscription.get(timeout=0.01)
+            await subscription.close()
+            broker.publish("calendar", {"id": 1})
+            return timed_out, await subscription.get(timeout=0.01)
+
+        self.assertEqual(asyncio.run(receive()), (None, None))
+
+
+class TestRedisBroker(SimpleTestCase):
+    def redis_client(self):
+        client = MagicMock(aclose=AsyncMock())
+        client.pubsub.return_value = MagicMock(
+            subscribe=AsyncMock(), aclose=AsyncMock()
+        )
+        return client
+
+    def test_closing_a_subscription_closes_its_client(self):
+        client = self.redis_client()
+
+        async def subscribe_and_close():
+            subscription = await RedisBroker("redis://localhost").subscribe("calendar")
+            await subscription.close()
+
+        with patch("redis.asyncio.Redis.from_url", return_value=client):
+            asyncio.run(subscribe_and_close())
+
+        client.pubsub.return_value.subscribe.assert_awaited_once_with("calendar")
+        client.pubsub.return_value.aclose.assert_awaited_once()
+        client.aclose.assert_awaited_once()
+
+    def test_failed_subscription_closes_its_client(self):
+        client = self.redis_client()
+        client.pubsub.return_value.subscribe.side_effect = ConnectionError
+
+        with patch("redis.asyncio.Redis.from_url", return_value=client):
+            with self.assertRaises(ConnectionError):
+                asyncio.run(RedisBroker("redis://localhost").subscribe("calendar"))
+
+        client.aclose.assert_awaited_once()
+
+
+@patch("reservations.calendar_events.live_updates.publish")
+class TestReservationChangesArePublished(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reservation_request = ReservationRequest.objects.create(
+            date=date.today() + timedelta(days=1),
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            service=self.service1,
+            employee=self.employee1,
+        )
+
+    def actions(self, publish):
+        return [call.args[1]["action"] for call in publish.call_args_list]
+
+    def test_booking_lifecycle(self, publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation = Reservation.objects.create(
+                reservation_request=self.reservation_request, name="Alice"
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.status = "CONFIRMED"
+            reservation.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reservation_request.start_time = time(12, 0)
+            self.reservation_request.end_time = time(13, 0)
+            self.reservation_request.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.status = "CANCELLED"
+            reservation.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.delete()
+
+        self.assertEqual(
+            self.actions(publish),
+            ["created", "confirmed", "moved", "cancelled", "deleted"],
+        )
+        moved = publish.call_args_list[2].args[1]
+        self.assertEqual(publish.call_args_list[2].args[0], RESERVATIONS_CHANNEL)
+        self.assertEqual(moved["event"]["extendedProps"]["startTime"], "12:00")
+
+    def test_unrelated_saves_are_not_published(self, publish):
+        reservation = Reservation.objects.create(
+            reservation_request=self.reservation_request, name="Alice"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.name = "Alice Smith"
+            reservation.save()
+            self.reservation_request.save()
+        self.assertEqual(self.actions(publish), [])
+
+    def test_broker_outage_does_not_fail_the_booking(self, publish):
+        publish.side_effect = ConnectionError("broker is down")
+        with (
+            self.assertLogs("django.test", "ERROR"),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            reservation = Reservation.objects.create(
+                reservation_request=self.reservation_request, name="Alice"
+            )
+        with (
+            self.assertLogs("django.test", "ERROR"),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            reservation.delete()
+        self.assertEqual(self.actions(publish), ["created", "deleted"])
+
+    def test_nothing_is_published_when_the_transaction_rolls_back(self, publish):
+        with self.captureOnCommitCallbacks(execute=False):
+            Reservation.objects.create(
+                reservation_request=self.reservation_request, name="Alice"
+            )
+        publish.assert_not_called()
+
+
+class TestReservationStream(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("reservation_stream")
+
+    async def test_owner_receives_pushed_changes(self):
+        await self.async_client.aforce_login(self.users["superuser"])
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b"retry: 5000\n\n")
+        change = {"action": "cancelled", "id": 7}
+        next_chunk = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0)
+        live_updates.publish(RESERVATIONS_CHANNEL, change)
+
+        self.assertEqual(
+            await asyncio.wait_for(next_chunk, 1),
+            f"event: reservation\ndata: {json.dumps(change)}\n\n".encode(),
+        )
+        await response.streaming_content.aclose()
+
+    async def test_other_users_are_rejected(self):
+        await self.async_client.aforce_login(self.users["client1"])
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_wsgi_requests_are_turned_away(self):
+        request = RequestFactory().get(self.url)
+        request.user = self.users["superuser"]
+
+        async def auser():
+            return request.user
+
+        request.auser = auser
+        response = async_to_sync(reservation_stream)(request)
+        self.assertEqual(response.status_code, 503)
@@ -1,9 +1,16 @@
 from datetime import date, time, timedelta
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.core.exceptions import ValidationError
+from django.db import connection, transaction
 from django.utils import timezone
-from reservations.models import Reservation, ReservationRequest, WorkDay
+from reservations.models import (
+    Reservation,
+    ReservationRequest,
+    SlotConflict,
+    WorkDay,
+)
 
 from .base_test import BaseTestCase
 
@@ -157,7 +164,7 @@ class ReservationRequestModelTest(BaseTestCase):
         self.assertIsNotNone(reservation.updated_at)
 
     def test_start_time_after_end_time_rises_error(self):
-        reservation = ReservationRequest.objects.create(
+        reservation = ReservationRequest(
             date=date.today(),
             start_time=time(11, 0),
             end_time=time(10, 0),
@@ -210,6 +217,41 @@ class ReservationRequestModelTest(BaseTestCase):
             reservation.clean()
         self.assertIn("Date cannot be in the past", str(context.exception))
 
+    def create_request(self, start, end, employee=None):
+        return ReservationRequest.objects.create(
+            date=date.today() + timedelta(days=1),
+            start_time=start,
+            end_time=end,
+            service=self.service1,
+            employee=employee,
+        )
+
+    def test_overlapping_requests_of_one_employee_are_rejected(self):
+        self.create_request(time(10, 0), time(11, 0), self.employee1)
+        with self.assertRaises(SlotConflict), transaction.atomic():
+            self.create_request(time(10, 30), time(11, 30), self.employee1)
+
+    def test_adjacent_and_unassigned_requests_are_allowed(self):
+        self.create_request(time(10, 0), time(11, 0), self.employee1)
+        self.create_request(time(11, 0), time(12, 0), self.employee1)
+        self.create_request(time(10, 0), time(11, 0))
+        self.create_request(time(10, 0), time(11, 0))
+        self.assertEqual(ReservationRequest.objects.count(), 4)
+
+    def test_overlap_is_checked_in_python_without_exclusion_constraints(self):
+        self.create_request(time(10, 0), time(11, 0), self.employee1)
+        with patch.object(connection, "vendor", "sqlite"):
+            with self.assertRaises(SlotConflict), transaction.atomic():
+                self.create_request(time(10, 30), time(11, 30), self.employee1)
+            self.create_request(time(11, 0), time(12, 0), self.employee1)
+
+    def test_moving_a_request_onto_another_is_rejected(self):
+        self.create_request(time(10, 0), time(11, 0), self.employee1)
+        other = self.create_request(time(12, 0), time(13, 0), self.employee1)
+        other.start_time = time(10, 45)
+        with self.assertRaises(SlotConflict), transaction.atomic():
+            other.save()
+
 
 class ReservationModelTest(BaseTestCase):
     def setUp(self):
@@ -285,11 +327,11 @@ class ReservationModelTest(BaseTestCase):
 
     def test_status_choices(self):
         statuses = ["PENDING", "CONFIRMED", "CANCELLED", "PAST"]
-        for status in statuses:
+        for hour, status in enumerate(statuses, start=12):
             request = ReservationRequest.objects.create(
                 date=date.today() + timedelta(days=1),
-                start_time=time(10, 0),
-                end_time=time(11, 0),
+                start_time=time(hour, 0),
+                end_time=time(hour + 1, 0),
                 service=self.service1,
                 employee=self.employee1,
             )
@@ -0,0 +1,318 @@
+import json
+from dataclasses import dataclass, field
+from datetime import date, time, timedelta
+from typing import Any, Callable, Optional
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from reservations.models import Reservation, ReservationRequest, WorkDay
+from utils import slot_holds
+
+from .base_test import QueryBudgetTestCase
+
+TODAY = date.today()
+TOMORROW = TODAY + timedelta(days=1)
+# Without the exclusion constraint a request is saved in a savepoint, after
+# an overlap check.
+OVERLAP_CHECK_QUERIES = 0 if connection.vendor == "postgresql" else 3
+WEEK = {"start": TODAY.isoformat(), "end": (TODAY + timedelta(days=7)).isoformat()}
+
+
+@dataclass
+class Endpoint:
+    """A request to measure and the most queries it may run."""
+
+    name: str
+    budget: int
+    user: Optional[str] = None
+    method: str = "get"
+    args: Callable[[QueryBudgetTestCase], list[Any]] = lambda test: []
+    data: Callable[[QueryBudgetTestCase], Any] = lambda test: {}
+    content_type: Optional[str] = None
+    label: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.label = f"{self.method.upper()} {self.name}"
+
+
+def _hold_token(test: QueryBudgetTestCase) -> list[str]:
+    hold = slot_holds.acquire_hold(
+        test.employee1.id, test.service1.id, TOMORROW, time(16, 0), time(17, 0)
+    )
+    return [hold.token]
+
+
+def _client_data(test: QueryBudgetTestCase) -> dict[str, str]:
+    return {
+        "name": "Guest",
+        "email": "guest@test.com",
+        "phone_0": "PL",
+        "phone_1": "600100200",
+    }
+
+
+def _password_reset_args(test: QueryBudgetTestCase) -> list[str]:
+    user = test.users["client1"]
+    return [
+        urlsafe_base64_encode(force_bytes(user.pk)),
+        default_token_generator.make_token(user),
+    ]
+
+
+ENDPOINTS = [
+    # Public pages and the booking funnel
+    Endpoint("home", 0),
+    Endpoint("about", 0),
+    Endpoint("contact", 0),
+    Endpoint("services_list", 2),
+    Endpoint("reservation_request", 3, args=lambda test: [test.service1.id]),
+    Endpoint(
+        "reservation_request",
+        12,
+        method="post",
+        args=lambda test: [test.service1.id],
+        data=lambda test: {
+            "service": test.service1.id,
+            "employee": test.employee1.id,
+            "date": TOMORROW.isoformat(),
+            "start_time": "14:00",
+            "end_time": "15:00",
+        },
+    ),
+    Endpoint("reservation_client_information", 1, args=_hold_token),
+    Endpoint(
+        "reservation_client_information",
+        16 + OVERLAP_CHECK_QUERIES,
+        method="post",
+        args=_hold_token,
+        data=_client_data,
+    ),
+    Endpoint("reservation_success", 0),
+    Endpoint(
+        "get_available_slots",
+        4,
+        data=lambda test: {
+            "selected_date": TOMORROW.isoformat(),
+            "staff_member": test.employee1.id,
+            "service_id": test.service1.id,
+        },
+    ),
+    Endpoint(
+        "get_available_slots_any_staff",
+        2,
+        data=lambda test: {
+            "selected_date": TOMORROW.isoformat(),
+            "service_id": test.service1.id,
+        },
+    ),
+    Endpoint(
+        "get_available_slots_range",
+        5,
+        data=lambda test: {
+            **WEEK,
+            "staff_member": test.employee1.id,
+            "service_id": test.service1.id,
+        },
+    ),
+    Endpoint(
+        "get_next_available_date",
+        3,
+        args=lambda test: [test.service1.id],
+        data=lambda test: {"staff_member": test.employee1.id},
+    ),
+    Endpoint(
+        "get_non_working_days",
+        3,
+        data=lambda test: {"staff_id": test.employee1.id},
+    ),
+    Endpoint(
+        "cancel_reservation",
+        3,
+        args=lambda test: [test.reservation.id_request],
+    ),
+    Endpoint(
+        "employee_calendar_feed",
+        4,
+        args=lambda test: [test.employee1.get_calendar_token()],
+    ),
+    # Accounts
+    Endpoint("login", 0),
+    Endpoint("logout", 4, user="client1", method="post"),
+    Endpoint("register", 0),
+    Endpoint("password_change", 2, user="client1"),
+    Endpoint("password_change_done", 2, user="client1"),
+    Endpoint("password_reset", 0),
+    Endpoint("password_reset_done", 0),
+    Endpoint("password_reset_confirm", 5, args=_password_reset_args),
+    Endpoint("password_reset_complete", 0),
+    Endpoint("profile", 4, user="employee1"),
+    Endpoint("user_reservations_list", 3, user="client1"),
+    Endpoint(
+        "reservation_cancel",
+        5,
+        user="client1",
+        method="post",
+        args=lambda test: [test.reservation.pk],
+    ),
+    # Management
+    Endpoint("employee_list", 4, user="superuser"),
+    Endpoint("employee_create", 4, user="superuser"),
+    Endpoint(
+        "employee_update", 6, user="superuser", args=lambda test: [test.employee1.pk]
+    ),
+    Endpoint(
+        "employee_delete", 3, user="superuser", args=lambda test: [test.employee1.pk]
+    ),
+    Endpoint("manage_services_list", 3, user="superuser"),
+    Endpoint("service_create", 3, user="superuser"),
+    Endpoint(
+        "service_update", 4, user="superuser", args=lambda test: [test.service1.pk]
+    ),
+    Endpoint(
+        "service_delete", 3, user="superuser", args=lambda test: [test.service1.pk]
+    ),
+    Endpoint("workday_list", 3, user="superuser"),
+    Endpoint("workday_create", 3, user="superuser"),
+    Endpoint(
+        "workday_update", 4, user="superuser", args=lambda test: [test.workday.pk]
+    ),
+    Endpoint(
+        "workday_delete", 4, user="superuser", args=lambda test: [test.workday.pk]
+    ),
+    Endpoint("workday_api", 2, user="superuser", data=lambda test: WEEK),
+    Endpoint(
+        "update_workday_date",
+        15,
+        user="superuser",
+        method="post",
+        args=lambda test: [test.workday.pk],
+        data=lambda test: json.dumps(
+            {"date": (TODAY + timedelta(days=30)).isoformat()}
+        ),
+        content_type="application/json",
+    ),
+    Endpoint(
+        "bulk_update_workdays",
+        16,
+        user="superuser",
+        method="post",
+        data=lambda test: json.dumps(
+            {
+                "create": [
+                    {
+                        "employee": test.employee1.id,
+                        "date": (TODAY + timedelta(days=days)).isoformat(),
+                        "start_time": "09:00",
+                        "end_time": "17:00",
+                    }
+                    for days in range(30, 37)
+                ],
+                "move": [
+                    {
+                        "id": test.workday.pk,
+                        "date": (TODAY + timedelta(days=40)).isoformat(),
+                    }
+                ],
+            }
+        ),
+        content_type="application/json",
+    ),
+    Endpoint(
+        "capacity_report",
+        3,
+        user="superuser",
+        data=lambda test: {**WEEK, "durations": "30,60"},
+    ),
+    Endpoint("reservations_api", 1, user="superuser", data=lambda test: WEEK),
+    Endpoint("reservation_stream", 2, user="superuser"),
+    Endpoint("manage_reservations_list", 4, user="superuser"),
+    Endpoint("reservation_create", 4, user="superuser"),
+    Endpoint(
+        "reservation_edit", 7, user="superuser", args=lambda test: [test.reservation.pk]
+    ),
+    Endpoint(
+        "reservation_delete",
+        4,
+        user="superuser",
+        args=lambda test: [test.reservation.pk],
+    ),
+    Endpoint(
+        "reservation_confirm",
+        5,
+        user="superuser",
+        method="post",
+        args=lambda test: [test.reservation.pk],
+    ),
+]
+
+
+def _url_names(patterns: list[Any]) -> set[str]:
+    """Names of the project's own URLs; namespaced ones belong to admin,
+    Silk and the debug toolbar."""
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace is None:
+                names |= _url_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+class TestQueryBudgets(QueryBudgetTestCase):
+    SMALL_SCALE = 1
+    LARGE_SCALE = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        WorkDay.objects.create(
+            employee=cls.employee1,
+            date=TOMORROW,
+            start_time=time(9, 0),
+            end_time=time(17, 0),
+        )
+        reservation_request = ReservationRequest.objects.create(
+            date=TOMORROW,
+            start_time=time(15, 0),
+            end_time=time(16, 0),
+            service=cls.service1,
+            employee=cls.employee1,
+        )
+        cls.reservation = Reservation.objects.create(
+            reservation_request=reservation_request,
+            customer=cls.users["client1"],
+            name="Georges",
+            id_request="budget-request",
+        )
+        cls.seed_salon(cls.SMALL_SCALE)
+
+    def measure(self, endpoint: Endpoint) -> int:
+        # Cached slots would hide the queries of the next measurement.
+        cache.clear()
+        return self.count_queries(
+            reverse(endpoint.name, args=endpoint.args(self)),
+            method=endpoint.method,
+            user=self.users.get(endpoint.user),
+            data=endpoint.data(self),
+            content_type=endpoint.content_type,
+        )
+
+    def test_every_url_has_a_budget(self):
+        self.assertEqual(
+            _url_names(get_resolver().url_patterns),
+            {endpoint.name for endpoint in ENDPOINTS},
+        )
+
+    def test_query_counts_stay_within_budget_as_data_grows(self):
+        small = {endpoint.label: self.measure(endpoint) for endpoint in ENDPOINTS}
+        self.seed_salon(self.LARGE_SCALE - self.SMALL_SCALE)
+        for endpoint in ENDPOINTS:
+            with self.subTest(endpoint.label):
+                large = self.measure(endpoint)
+                self.assertEqual(large, small[endpoint.label], "grows with the data")
+                self.assertLessEqual(large, endpoint.budget, "over budget")
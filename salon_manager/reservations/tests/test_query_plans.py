@@ -0,0 +1,135 @@
+from datetime import date, time, timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from reservations.models import (
+    AvailabilityBlock,
+    Reservation,
+    ReservationRequest,
+    WorkDay,
+)
+from utils.pagination import encode_cursor, keyset_queryset
+
+from .base_test import BaseTestCase
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN output is PostgreSQL's")
+class TestHotQueryPlans(BaseTestCase):
+    """The booking hot paths must be served by indexes, not sequential scans.
+
+    Sequential scans are priced out for the duration of each test, so the
+    planner falls back to one only when no usable index exists. A full scan of
+    an unrelated index is not enough either: the filtered column has to show
+    up in an index condition.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        today = date.today()
+        for offset in range(1, 31):
+            day = today + timedelta(days=offset)
+            WorkDay.objects.create(
+                employee=cls.employee1,
+                date=day,
+                start_time=time(9, 0),
+                end_time=time(17, 0),
+            )
+            for hour in (9, 11, 14):
+                reservation_request = ReservationRequest.objects.create(
+                    date=day,
+                    start_time=time(hour, 0),
+                    end_time=time(hour + 1, 0),
+                    service=cls.service1,
+                    employee=cls.employee1,
+                )
+                Reservation.objects.create(
+                    reservation_request=reservation_request,
+                    name="Test",
+                    status="CONFIRMED" if hour == 9 else "PENDING",
+                )
+        # Without statistics the planner may pick any index with a matching
+        # leading column, the exclusion constraint's included.
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        super().setUp()
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        self.tomorrow = date.today() + timedelta(days=1)
+
+    def assertUsesIndexes(self, queryset, column):
+        plan = queryset.explain()
+        self.assertNotIn("Seq Scan", plan, msg=plan)
+        self.assertTrue(
+            any("Index Cond" in line and column in line for line in plan.splitlines()),
+            msg=plan,
+        )
+
+    def test_reservation_requests_by_employee_and_date(self):
+        self.assertUsesIndexes(
+            ReservationRequest.objects.filter(
+                employee=self.employee1, date=self.tomorrow
+            ).values_list("start_time", "end_time"),
+            "date",
+        )
+
+    def test_work_days_by_employee_and_date(self):
+        self.assertUsesIndexes(
+            WorkDay.objects.filter(employee=self.employee1, date=self.tomorrow),
+            "date",
+        )
+
+    def test_availability_blocks_by_employee_and_date(self):
+        self.assertUsesIndexes(
+            AvailabilityBlock.objects.filter(
+                employee=self.employee1, date=self.tomorrow
+            ).order_by("start_time"),
+            "date",
+        )
+
+    def test_confirmed_reservations_on_date(self):
+        self.assertUsesIndexes(
+            Reservation.objects.filter(
+                reservation_request__date=self.tomorrow, status="CONFIRMED"
+            ),
+            "date",
+        )
+
+    def test_confirmed_reservations_up_to_today(self):
+        plan = Reservation.objects.filter(
+            status="CONFIRMED", reservation_request__date__lte=date.today()
+        ).explain()
+        self.assertNotIn("Seq Scan", plan, msg=plan)
+        self.assertIn("reservation_confirmed", plan)
+
+    def test_reservation_by_cancel_token(self):
+        token = Reservation.objects.values_list("id_request", flat=True).first()
+        self.assertUsesIndexes(
+            Reservation.objects.filter(id_request=token), "id_request"
+        )
+
+    def assertPagedByIndex(self, queryset, date_field, id_field, index):
+        cursor = encode_cursor(self.tomorrow + timedelta(days=10), 10**6)
+        # The planner only bounds the scan by the cursor with real statistics.
+        with connection.cursor() as db_cursor:
+            db_cursor.execute(
+                "ANALYZE reservations_workday, reservations_reservation, "
+                "reservations_reservationrequest"
+            )
+        page = keyset_queryset(queryset, date_field, id_field, cursor)[:21]
+        plan = page.explain()
+        self.assertNotIn("Seq Scan", plan, msg=plan)
+        self.assertIn(index, plan, msg=plan)
+
+    def test_work_day_history_page(self):
+        self.assertPagedByIndex(WorkDay.objects.all(), "date", "id", "workday_date_id")
+
+    def test_reservation_history_page(self):
+        self.assertPagedByIndex(
+            Reservation.objects.filter(status="PENDING"),
+            "reservation_request__date",
+            "reservation_request_id",
+            "request_date_id",
+        )
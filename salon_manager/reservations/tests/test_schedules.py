@@ -0,0 +1,249 @@
+import json
+from datetime import date, time, timedelta
+
+from django.core.exceptions import ValidationError
+from django.test import RequestFactory
+from django.utils import timezone
+from reservations.api import workday_api
+from reservations.models import (
+    AvailabilityBlock,
+    ReservationRequest,
+    ScheduleException,
+    WeeklySchedule,
+    WorkDay,
+)
+from reservations.schedules import expand_schedules, horizon_end, working_dates
+from reservations.service import SlotAvailabilityService
+from reservations.tasks import extend_availability_horizon
+from utils import availability_cache
+from utils.support_functions import _calculate_non_working_days
+
+from .base_test import BaseTestCase
+
+
+class TestWeeklySchedules(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.day = date.today() + timedelta(days=7)
+        self.next_week = self.day + timedelta(days=7)
+        self.schedule = WeeklySchedule.objects.create(
+            employee=self.employee1,
+            weekday=self.day.weekday(),
+            start_time=time(10, 0),
+            end_time=time(14, 0),
+            valid_from=date.today(),
+        )
+
+    def blocks(self, day=None):
+        return list(
+            AvailabilityBlock.objects.filter(
+                employee=self.employee1, date=day or self.day
+            )
+            .order_by("start_time")
+            .values_list("start_time", "end_time", "schedule_id", "work_day_id")
+        )
+
+    def test_expansion_skips_overridden_days_and_days_off(self):
+        window = (self.day, self.next_week)
+        self.assertEqual(
+            [hours.date for hours in expand_schedules(*window)],
+            [self.day, self.next_week],
+        )
+        WorkDay.objects.create(
+            employee=self.employee1,
+            date=self.next_week,
+            start_time=time(8, 0),
+            end_time=time(9, 0),
+        )
+        ScheduleException.objects.create(employee=self.employee1, date=self.day)
+        self.assertEqual(expand_schedules(*window), [])
+        self.assertEqual(working_dates(self.employee1.id, *window), {self.next_week})
+
+    def test_validity_period_limits_the_expansion(self):
+        self.schedule.valid_until = self.day
+        self.schedule.save()
+        self.assertEqual(
+            [hours.date for hours in expand_schedules(self.day, self.next_week)],
+            [self.day],
+        )
+
+    def test_overlapping_schedules_are_rejected(self):
+        with self.assertRaises(ValidationError):
+            WeeklySchedule.objects.create(
+                employee=self.employee1,
+                weekday=self.day.weekday(),
+                start_time=time(13, 0),
+                end_time=time(16, 0),
+                valid_from=self.day,
+            )
+
+    def test_schedule_days_get_availability_blocks(self):
+        self.assertEqual(
+            self.blocks(), [(time(10, 0), time(14, 0), self.schedule.pk, None)]
+        )
+        ReservationRequest.objects.create(
+            date=self.day,
+            start_time=time(11, 0),
+            end_time=time(12, 0),
+            service=self.service1,
+            employee=self.employee1,
+        )
+        self.assertEqual(
+            [block[:2] for block in self.blocks()],
+            [(time(10, 0), time(10, 59)), (time(12, 15), time(14, 0))],
+        )
+
+    def test_day_off_and_override_replace_the_schedule(self):
+        day_off = ScheduleException.objects.create(
+            employee=self.employee1, date=self.day
+        )
+        self.assertEqual(self.blocks(), [])
+        day_off.delete()
+        self.assertEqual(len(self.blocks()), 1)
+
+        work_day = WorkDay.objects.create(
+            employee=self.employee1,
+            date=self.day,
+            start_time=time(15, 0),
+            end_time=time(17, 0),
+        )
+        self.assertEqual(self.blocks(), [(time(15, 0), time(17, 0), None, work_day.pk)])
+
+    def test_deleting_the_schedule_removes_its_blocks(self):
+        self.schedule.delete()
+        self.assertEqual(self.blocks(), [])
+        self.assertEqual(self.blocks(self.next_week), [])
+
+    def test_service_offers_slots_on_schedule_days(self):
+        result = SlotAvailabilityService().get_available_slots_(
+            self.day, self.employee1, self.service1.id
+        )
+        self.assertEqual(result["available_slots"][0], "10:00")
+        self.assertNotIn(
+            self.day.isoformat(), _calculate_non_working_days(self.employee1)
+        )
+
+    def test_horizon_task_builds_the_new_last_day(self):
+        last_day = horizon_end()
+        self.schedule.weekday = last_day.weekday()
+        self.schedule.save()
+        AvailabilityBlock.objects.filter(date=last_day).delete()
+
+        extend_availability_horizon()
+
+        self.assertEqual(
+            self.blocks(last_day), [(time(10, 0), time(14, 0), self.schedule.pk, None)]
+        )
+
+    def test_horizon_task_catches_up_on_missed_runs(self):
+        self.schedule.delete()
+        last_day = horizon_end()
+        for offset in range(3):
+            WeeklySchedule.objects.create(
+                employee=self.employee1,
+                weekday=(last_day - timedelta(days=offset)).weekday(),
+                start_time=time(10, 0),
+                end_time=time(14, 0),
+                valid_from=date.today(),
+            )
+        missed = [last_day - timedelta(days=1), last_day]
+        AvailabilityBlock.objects.filter(date__in=missed).delete()
+
+        extend_availability_horizon()
+
+        for day in missed:
+            self.assertEqual(self.blocks(day)[0][:2], (time(10, 0), time(14, 0)), day)
+
+    def test_schedule_days_beyond_the_horizon_are_not_offered(self):
+        beyond = horizon_end() + timedelta(days=3)
+        self.schedule.weekday = beyond.weekday()
+        self.schedule.save()
+        inside = beyond - timedelta(days=7)
+
+        self.assertEqual(working_dates(self.employee1.id, inside, beyond), {inside})
+        result = SlotAvailabilityService().get_available_slots_range(
+            inside, beyond, self.employee1, self.service1.id
+        )
+        self.assertTrue(result["slots"][inside.isoformat()])
+        self.assertIn(beyond.isoformat(), result["non_working_days"])
+
+    def test_horizon_task_forgets_slots_cached_before_the_blocks(self):
+        last_day = horizon_end()
+        availability_cache.set_day_slots(self.employee1.id, last_day, 60, [])
+
+        extend_availability_horizon()
+
+        self.assertIsNone(
+            availability_cache.get_day_slots(self.employee1.id, last_day, 60)
+        )
+
+    def test_work_day_feed_shows_schedule_hours(self):
+        request = RequestFactory().get(
+            "/",
+            {
+                "start": self.day.isoformat(),
+                "end": (self.day + timedelta(days=1)).isoformat(),
+            },
+        )
+        events = json.loads(b"".join(workday_api(request).streaming_content).decode())
+        self.assertEqual(len(events), 1)
+        self.assertEqual(
+            events[0]["id"], f"schedule-{self.schedule.pk}-{self.day.isoformat()}"
+        )
+        self.assertEqual(events[0]["title"], "Daniel: 10:00 - 14:00")
+        self.assertFalse(events[0]["editable"])
+
+    def delta(self, since):
+        request = RequestFactory().get(
+            "/",
+            {
+                "start": self.day.isoformat(),
+                "end": (self.day + timedelta(days=7)).isoformat(),
+                "updated_since": since.isoformat(),
+            },
+        )
+        return json.loads(workday_api(request).content)
+
+    def test_delta_sync_swaps_schedule_hours_and_work_days(self):
+        scheduled_id = f"schedule-{self.schedule.pk}-{self.day.isoformat()}"
+        since = timezone.now()
+        self.assertEqual(self.delta(since)["events"], [])
+
+        workday = WorkDay.objects.create(
+            employee=self.employee1,
+            date=self.day,
+            start_time=time(8, 0),
+            end_time=time(12, 0),
+        )
+        data = self.delta(since)
+        self.assertEqual([event["id"] for event in data["events"]], [workday.pk])
+        self.assertEqual(data["deleted"], [scheduled_id])
+
+        since = timezone.now()
+        workday_pk = workday.pk
+        workday.delete()
+        data = self.delta(since)
+        self.assertEqual([event["id"] for event in data["events"]], [scheduled_id])
+        self.assertEqual(data["deleted"], [workday_pk])
+
+    def test_delta_sync_drops_hours_of_changed_schedules(self):
+        scheduled_id = f"schedule-{self.schedule.pk}-{self.day.isoformat()}"
+        since = timezone.now()
+        ScheduleException.objects.create(employee=self.employee1, date=self.day)
+        self.assertEqual(self.delta(since)["deleted"], [scheduled_id])
+
+        ScheduleException.objects.all().delete()
+        self.schedule.weekday = (self.day.weekday() + 1) % 7
+        self.schedule.save()
+        data = self.delta(since)
+        moved_id = (
+            f"schedule-{self.schedule.pk}-{(self.day + timedelta(days=1)).isoformat()}"
+        )
+        self.assertEqual([event["id"] for event in data["events"]], [moved_id])
+        self.assertIn(scheduled_id, data["deleted"])
+
+        since = timezone.now()
+        self.schedule.delete()
+        data = self.delta(since)
+        self.assertEqual(data["events"], [])
+        self.assertIn(moved_id, data["deleted"])
@@ -2,12 +2,18 @@ from datetime import date, time, timedelta
 from unittest.mock import Mock, patch
 
 import pytest
+from django.core.cache import cache
 from django.test import TestCase
+from reservations.models import ReservationRequest, WorkDay
 from reservations.service import SlotAvailabilityService
+from users.models import Employee
+
+from .base_test import BaseTestCase
 
 
 class TestSlotAvailabilityService(TestCase):
     def setUp(self):
+        cache.clear()
         self.service = SlotAvailabilityService()
         self.employee = Mock()
         self.employee.id = 1
@@ -16,16 +22,16 @@ class TestSlotAvailabilityService(TestCase):
         self.selected_date = date.today()
         self.available_slots = ["10:00", "12:00", "13:30"]
 
-    @patch("reservations.service.WorkDay.objects.filter")
-    def test_validate_working_day_raises_error_when_no_work_day(self, mock_filter):
-        mock_filter.return_value.exists.return_value = False
+    @patch("reservations.service.working_dates")
+    def test_validate_working_day_raises_error_when_no_work_day(self, mock_dates):
+        mock_dates.return_value = set()
 
         with pytest.raises(ValueError, match="Day off"):
             self.service._validate_working_day(self.employee, self.selected_date)
 
-    @patch("reservations.service.WorkDay.objects.filter")
-    def test_validate_working_day_passes_when_work_day_exists(self, mock_filter):
-        mock_filter.return_value.exists.return_value = True
+    @patch("reservations.service.working_dates")
+    def test_validate_working_day_passes_when_work_day_exists(self, mock_dates):
+        mock_dates.return_value = {self.selected_date}
         self.service._validate_working_day(self.employee, self.selected_date)
 
     @patch("reservations.service.date")
@@ -59,50 +65,39 @@ class TestSlotAvailabilityService(TestCase):
         self.assertEqual(result, service)
         mock_get.assert_called_once_with(id=self.service_id)
 
-    @patch("reservations.service.WorkDay.objects.filter")
-    def test_get_workday_if_getting_correct_data(self, mock_filter):
-        workday = Mock()
-        workday.employee = self.employee
-        mock_filter.return_value = workday
-        self.service._get_work_days(self.employee, self.selected_date)
+    @patch("reservations.service.AvailabilityBlock.objects.filter")
+    def test_get_availability_blocks_if_getting_correct_data(self, mock_filter):
+        self.service._get_availability_blocks(self.employee, self.selected_date)
         mock_filter.assert_called_once_with(
             employee=self.employee.id, date=self.selected_date
         )
 
-    @patch("reservations.service.generate_available_slots")
-    def test_calculate_available_slots(self, mock_generate):
-        mock_workday = Mock()
-        mock_workday.start_time = "10:00"
-        mock_workday.end_time = "12:00"
-        work_days = [mock_workday]
-        service_duration = 30
-        mock_generate.return_value = ["10:00", "10:30"]
-        result = self.service._calculate_available_slots(
-            work_days, service_duration, []
-        )
-        self.assertEqual(result, ["10:00", "10:30"])
-        mock_generate.assert_called_once_with("10:00", "12:00", 30, [])
+    def test_calculate_available_slots(self):
+        blocks = [(time(10, 0), time(10, 44)), (time(11, 30), time(12, 0))]
+        result = self.service._calculate_available_slots(blocks, 30)
+        self.assertEqual(result, ["10:00", "11:30"])
+
+    def test_calculate_available_slots_without_blocks(self):
+        result = self.service._calculate_available_slots([], 30)
+        self.assertEqual(result, [])
 
     @patch("reservations.service.SlotAvailabilityService._filter_past_slots")
     @patch("reservations.service.SlotAvailabilityService._calculate_available_slots")
-    @patch("reservations.service.SlotAvailabilityService._get_existing_reservations")
-    @patch("reservations.service.SlotAvailabilityService._get_work_days")
+    @patch("reservations.service.SlotAvailabilityService._get_availability_blocks")
     @patch("reservations.service.SlotAvailabilityService._get_service")
     @patch("reservations.service.SlotAvailabilityService._validate_working_day")
     def test_get_available_slots_returns_correct_structure(
         self,
         mock_validate,
         mock_get_service,
-        mock_work_days,
-        mock_existing_reservations,
+        mock_blocks,
         mock_calculate,
         mock_filter,
     ):
         mock_service = Mock()
         mock_service.duration = 30
         mock_get_service.return_value = mock_service
-        mock_work_days.return_value = []
-        mock_existing_reservations.return_value = []
+        mock_blocks.return_value = []
         mock_calculate.return_value = ["10:00", "11:00"]
         mock_filter.return_value = ["10:00", "11:00"]
 
@@ -129,23 +124,20 @@ class TestSlotAvailabilityService(TestCase):
 
     @patch("reservations.service.SlotAvailabilityService._filter_past_slots")
     @patch("reservations.service.SlotAvailabilityService._calculate_available_slots")
-    @patch("reservations.service.SlotAvailabilityService._get_existing_reservations")
-    @patch("reservations.service.SlotAvailabilityService._get_work_days")
+    @patch("reservations.service.SlotAvailabilityService._get_availability_blocks")
     @patch("reservations.service.SlotAvailabilityService._get_service")
     @patch("reservations.service.SlotAvailabilityService._validate_working_day")
     def test_get_available_slots_raises_error_when_no_slots_available(
         self,
         mock_validate,
         mock_get_service,
-        mock_work_days,
-        mock_existing_reservations,
+        mock_blocks,
         mock_calculate,
         mock_filter,
     ):
         mock_service = Mock()
         mock_get_service.return_value = mock_service
-        mock_work_days.return_value = []
-        mock_existing_reservations.return_value = []
+        mock_blocks.return_value = []
         mock_calculate.return_value = []
         mock_filter.return_value = []  # <-- Lack of available slots
 
@@ -154,102 +146,223 @@ class TestSlotAvailabilityService(TestCase):
                 self.selected_date, self.employee, self.service_id
             )
 
-    @patch("reservations.service.WorkDay.objects.filter")
-    @patch("reservations.service.SlotAvailabilityService._get_service")
-    def test_get_next_available_date_returns_first_available_date(
-        self, mock_get_service, mock_filter
-    ):
-        mock_service = Mock()
-        mock_service.id = self.service_id
-        mock_get_service.return_value = mock_service
 
-        tomorrow = date.today() + timedelta(days=1)
-        mock_workday1 = Mock()
-        mock_workday1.date = tomorrow
+class TestSlotAvailabilityServiceRange(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tomorrow = date.today() + timedelta(days=1)
+        for offset in range(1, 15):
+            WorkDay.objects.create(
+                employee=cls.employee1,
+                date=date.today() + timedelta(days=offset),
+                start_time=time(9, 0),
+                end_time=time(12, 0),
+            )
+        ReservationRequest.objects.create(
+            date=cls.tomorrow,
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            service=cls.service1,
+            employee=cls.employee1,
+        )
 
-        mock_filter.return_value.order_by.return_value = [mock_workday1]
+    def setUp(self):
+        super().setUp()
+        self.service = SlotAvailabilityService()
 
-        with patch.object(self.service, "get_available_slots_") as mock_get_slots:
-            mock_get_slots.return_value = {
-                "available_slots": ["10:00", "11:00"],
-                "date_chosen": tomorrow.strftime("%a, %B %d, %Y"),
-            }
+    def test_query_count_does_not_grow_with_range(self):
+        # When every date of the range has a work day, the weekly schedules
+        # cannot add any and are not read: one query less.
+        with self.assertNumQueries(3):
+            self.service.get_available_slots_range(
+                self.tomorrow, self.tomorrow, self.employee1, self.service1.id
+            )
+        with self.assertNumQueries(4):
+            self.service.get_available_slots_range(
+                self.tomorrow,
+                self.tomorrow + timedelta(days=20),
+                self.employee1,
+                self.service1.id,
+            )
+        with self.assertNumQueries(4):
+            self.service.get_available_slots_range(
+                self.tomorrow,
+                self.tomorrow + timedelta(days=60),
+                self.employee1,
+                self.service1.id,
+            )
 
-            result = self.service.get_next_available_date(
-                self.employee, self.service_id, date.today()
+    def test_each_day_matches_single_day_lookup(self):
+        result = self.service.get_available_slots_range(
+            self.tomorrow,
+            self.tomorrow + timedelta(days=20),
+            self.employee1,
+            self.service1.id,
+        )
+        self.assertEqual(len(result["slots"]), 14)
+        self.assertEqual(len(result["non_working_days"]), 7)
+        self.assertEqual(result["slots"][self.tomorrow.isoformat()], [])
+        for day, slots in result["slots"].items():
+            try:
+                single_day = self.service.get_available_slots_(
+                    date.fromisoformat(day), self.employee1, self.service1.id
+                )["available_slots"]
+            except ValueError:
+                single_day = []
+            self.assertEqual(slots, single_day)
+
+
+class TestAnyStaffAvailability(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tomorrow = date.today() + timedelta(days=1)
+        cls.employee2 = Employee.objects.create(
+            user=cls.users["employee2"], name="Samantha"
+        )
+        cls.employee2.services.add(cls.service1)
+        other_employee = Employee.objects.create(
+            user=cls.users["client2"], name="Tealc"
+        )
+        for employee, end in (
+            (cls.employee1, time(12, 0)),
+            (cls.employee2, time(11, 0)),
+            (other_employee, time(17, 0)),
+        ):
+            WorkDay.objects.create(
+                employee=employee,
+                date=cls.tomorrow,
+                start_time=time(9, 0),
+                end_time=end,
             )
+        ReservationRequest.objects.create(
+            date=cls.tomorrow,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            service=cls.service1,
+            employee=cls.employee1,
+        )
 
-            self.assertEqual(result, tomorrow)
+    def setUp(self):
+        super().setUp()
+        self.service = SlotAvailabilityService()
 
-    @patch("reservations.service.WorkDay.objects.filter")
-    @patch("reservations.service.SlotAvailabilityService._get_service")
-    def test_get_next_available_date_skips_days_without_slots(
-        self, mock_get_service, mock_filter
-    ):
-        """Test że get_next_available_date pomija dni bez dostępnych slotów."""
-        mock_service = Mock()
-        mock_service.id = self.service_id
-        mock_get_service.return_value = mock_service
+    def test_slots_are_merged_and_assigned_to_a_free_employee(self):
+        result = self.service.get_available_slots_any_staff(
+            self.tomorrow, self.service1.id
+        )
+        assigned = {
+            slot["time"]: slot["staff_member"] for slot in result["available_slots"]
+        }
+        self.assertEqual(
+            assigned,
+            {
+                "09:00": "Samantha",
+                "09:15": "Samantha",
+                "09:30": "Samantha",
+                "09:45": "Samantha",
+                "10:00": "Samantha",
+                "10:15": "Daniel",
+                "10:30": "Daniel",
+                "10:45": "Daniel",
+                "11:00": "Daniel",
+            },
+        )
+        self.assertEqual(
+            result["available_slots"][0]["staff_member_id"], self.employee2.id
+        )
 
-        tomorrow = date.today() + timedelta(days=1)
-        in_two_days = date.today() + timedelta(days=2)
+    def test_uses_one_query_for_all_employees(self):
+        # Service lookup plus the availability blocks of every employee.
+        with self.assertNumQueries(2):
+            self.service.get_available_slots_any_staff(self.tomorrow, self.service1.id)
 
-        mock_workday1 = Mock()
-        mock_workday1.date = tomorrow
-        mock_workday2 = Mock()
-        mock_workday2.date = in_two_days
+    def test_raises_error_when_nobody_is_free(self):
+        with pytest.raises(ValueError, match="No availability"):
+            self.service.get_available_slots_any_staff(
+                self.tomorrow + timedelta(days=1), self.service1.id
+            )
 
-        mock_filter.return_value.order_by.return_value = [mock_workday1, mock_workday2]
 
-        with patch.object(self.service, "get_available_slots_") as mock_get_slots:
-            # Pierwszy dzień - brak slotów (ValueError)
-            # Drugi dzień - są sloty
-            mock_get_slots.side_effect = [
-                ValueError("No availability"),
-                {"available_slots": ["10:00", "11:00"]},
-            ]
+class TestGetNextAvailableDate(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = SlotAvailabilityService()
+        self.workday.delete()
+
+    def add_work_day(self, offset, start=time(9, 0), end=time(10, 0)):
+        return WorkDay.objects.create(
+            employee=self.employee1,
+            date=date.today() + timedelta(days=offset),
+            start_time=start,
+            end_time=end,
+        )
 
-            result = self.service.get_next_available_date(
-                self.employee, self.service_id, date.today()
-            )
+    def book(self, offset, start=time(9, 0), end=time(10, 0)):
+        return ReservationRequest.objects.create(
+            date=date.today() + timedelta(days=offset),
+            start_time=start,
+            end_time=end,
+            service=self.service1,
+            employee=self.employee1,
+        )
 
-            self.assertEqual(result, in_two_days)
+    def test_returns_first_available_date(self):
+        self.add_work_day(2)
+        self.add_work_day(5)
 
-    @patch("reservations.service.WorkDay.objects.filter")
-    @patch("reservations.service.SlotAvailabilityService._get_service")
-    def test_get_next_available_date_raises_error_when_no_working_days(
-        self, mock_get_service, mock_filter
-    ):
-        mock_service = Mock()
-        mock_service.id = self.service_id
-        mock_get_service.return_value = mock_service
+        result = self.service.get_next_available_date(
+            self.employee1, self.service1.id, date.today()
+        )
+        self.assertEqual(result, date.today() + timedelta(days=2))
+
+    def test_skips_fully_booked_days(self):
+        self.add_work_day(1)
+        self.book(1)
+        self.add_work_day(2)
 
-        mock_filter.return_value.order_by.return_value = []
+        result = self.service.get_next_available_date(
+            self.employee1, self.service1.id, date.today()
+        )
+        self.assertEqual(result, date.today() + timedelta(days=2))
+
+    def test_ignores_from_date_itself(self):
+        self.add_work_day(1)
+        self.add_work_day(3)
+
+        result = self.service.get_next_available_date(
+            self.employee1, self.service1.id, date.today() + timedelta(days=1)
+        )
+        self.assertEqual(result, date.today() + timedelta(days=3))
 
+    def test_raises_error_when_no_working_days(self):
         with pytest.raises(ValueError, match="No available dates found"):
             self.service.get_next_available_date(
-                self.employee, self.service_id, date.today()
+                self.employee1, self.service1.id, date.today()
             )
 
-    @patch("reservations.service.WorkDay.objects.filter")
-    @patch("reservations.service.SlotAvailabilityService._get_service")
-    def test_get_next_available_date_raises_error_when_no_slots_in_any_day(
-        self, mock_get_service, mock_filter
-    ):
-        mock_service = Mock()
-        mock_service.id = self.service_id
-        mock_get_service.return_value = mock_service
-
-        tomorrow = date.today() + timedelta(days=1)
-        mock_workday = Mock()
-        mock_workday.date = tomorrow
+    def test_raises_error_when_no_slots_in_any_day(self):
+        for offset in range(1, 4):
+            self.add_work_day(offset)
+            self.book(offset)
 
-        mock_filter.return_value.order_by.return_value = [mock_workday]
+        with pytest.raises(ValueError, match="No available dates found"):
+            self.service.get_next_available_date(
+                self.employee1, self.service1.id, date.today()
+            )
 
-        with patch.object(self.service, "get_available_slots_") as mock_get_slots:
-            mock_get_slots.side_effect = ValueError("No availability")
+    def test_query_count_is_per_chunk_not_per_day(self):
+        self.service.NEXT_DATE_CHUNK_SIZE = 10
+        for offset in range(1, 26):
+            self.add_work_day(offset, end=time(11, 0))
+            self.book(offset, time(9, 30), time(10, 0))
+        self.add_work_day(26)
 
-            with pytest.raises(ValueError, match="No available dates found"):
-                self.service.get_next_available_date(
-                    self.employee, self.service_id, date.today()
-                )
+        # Service lookup plus one query per chunk of ten blocks: two blocks
+        # that are too short on each of the 25 busy days, then the free day.
+        with self.assertNumQueries(1 + 6):
+            result = self.service.get_next_available_date(
+                self.employee1, self.service1.id, date.today()
+            )
+        self.assertEqual(result, date.today() + timedelta(days=26))
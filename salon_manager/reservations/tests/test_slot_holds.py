@@ -0,0 +1,185 @@
+from datetime import date, time, timedelta
+from importlib import import_module
+from unittest.mock import patch
+
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import override_settings
+from django.utils import timezone
+from reservations.models import (
+    AvailabilityBlock,
+    Reservation,
+    ReservationRequest,
+    WeeklySchedule,
+    WorkDay,
+)
+from reservations.service import SlotAvailabilityService
+from utils import slot_holds
+
+from .base_test import BaseTestCase
+
+
+class TestSlotHolds(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tomorrow = date.today() + timedelta(days=1)
+        WorkDay.objects.create(
+            employee=cls.employee1,
+            date=cls.tomorrow,
+            start_time=time(9, 0),
+            end_time=time(12, 0),
+        )
+
+    def hold(self, start, end):
+        return slot_holds.acquire_hold(
+            self.employee1.id, self.service1.id, self.tomorrow, start, end
+        )
+
+    def test_overlapping_hold_is_refused(self):
+        self.assertIsNotNone(self.hold(time(10, 0), time(11, 0)))
+        self.assertIsNone(self.hold(time(10, 30), time(11, 30)))
+        self.assertIsNotNone(self.hold(time(11, 0), time(12, 0)))
+
+    def test_hold_over_a_booking_is_refused(self):
+        ReservationRequest.objects.create(
+            date=self.tomorrow,
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            service=self.service1,
+            employee=self.employee1,
+        )
+        self.assertIsNone(self.hold(time(9, 30), time(10, 30)))
+
+    def test_released_hold_frees_the_slot(self):
+        hold = self.hold(time(10, 0), time(11, 0))
+        slot_holds.release_hold(hold)
+        self.assertIsNone(slot_holds.get_hold(hold.token))
+        self.assertIsNotNone(self.hold(time(10, 0), time(11, 0)))
+
+    def test_expired_hold_frees_the_slot(self):
+        with override_settings(SLOT_HOLD_TIMEOUT=-1):
+            self.hold(time(10, 0), time(11, 0))
+        self.assertEqual(slot_holds.live_holds(self.employee1.id, self.tomorrow), [])
+        self.assertIsNotNone(self.hold(time(10, 0), time(11, 0)))
+
+    def test_holds_do_not_write_to_the_database(self):
+        with self.assertNumQueries(1):
+            self.hold(time(10, 0), time(11, 0))
+        self.assertFalse(ReservationRequest.objects.exists())
+
+    def test_slot_engine_treats_holds_as_busy(self):
+        service = SlotAvailabilityService()
+        self.hold(time(9, 0), time(10, 0))
+
+        slots = service.get_available_slots_(
+            self.tomorrow, self.employee1, self.service1.id
+        )["available_slots"]
+        self.assertEqual(slots, ["10:15", "10:30", "10:45", "11:00"])
+
+        range_slots = service.get_available_slots_range(
+            self.tomorrow, self.tomorrow, self.employee1, self.service1.id
+        )["slots"]
+        self.assertEqual(range_slots[self.tomorrow.isoformat()], slots)
+
+    def test_holds_are_read_once_for_all_employees_and_days(self):
+        service = SlotAvailabilityService()
+        self.hold(time(9, 0), time(12, 0))
+
+        with patch.object(
+            slot_holds, "live_holds", side_effect=AssertionError("one key read")
+        ):
+            with self.assertRaises(ValueError):
+                service.get_available_slots_any_staff(self.tomorrow, self.service1.id)
+            with self.assertRaises(ValueError):
+                service.get_next_available_date(
+                    self.employee1, self.service1.id, date.today()
+                )
+
+    def test_release_under_a_held_lock_leaves_the_hold_to_expire(self):
+        hold = self.hold(time(10, 0), time(11, 0))
+        with (
+            patch.object(
+                slot_holds, "_day_lock", side_effect=slot_holds.HoldLockTimeout
+            ),
+            self.assertLogs("utils.slot_holds", "WARNING"),
+        ):
+            slot_holds.release_hold(hold)
+        self.assertEqual(slot_holds.get_hold(hold.token), hold)
+
+
+stale_requests = import_module("reservations.migrations.0026_delete_stale_requests")
+
+
+class TestStaleRequestsMigration(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tomorrow = date.today() + timedelta(days=1)
+        WorkDay.objects.create(
+            employee=cls.employee1,
+            date=cls.tomorrow,
+            start_time=time(9, 0),
+            end_time=time(12, 0),
+        )
+        cls.scheduled_day = cls.tomorrow + timedelta(days=1)
+        WeeklySchedule.objects.create(
+            employee=cls.employee1,
+            weekday=cls.scheduled_day.weekday(),
+            start_time=time(13, 0),
+            end_time=time(16, 0),
+            valid_from=date.today(),
+        )
+
+    def request(self, day, start, end, expires_in=-10):
+        return ReservationRequest.objects.create(
+            date=day,
+            start_time=start,
+            end_time=end,
+            service=self.service1,
+            employee=self.employee1,
+            expires_at=timezone.now() + timedelta(minutes=expires_in),
+        )
+
+    def migrate(self):
+        apps = (
+            MigrationLoader(connection)
+            .project_state(("reservations", "0026_delete_stale_requests"))
+            .apps
+        )
+        stale_requests.delete_stale_requests(apps, None)
+
+    def blocks(self, day):
+        return list(
+            AvailabilityBlock.objects.filter(employee=self.employee1, date=day)
+            .order_by("start_time")
+            .values_list("start_time", "end_time")
+        )
+
+    def test_unconfirmed_expired_requests_are_deleted(self):
+        stale = self.request(self.tomorrow, time(10, 0), time(10, 30))
+        confirmed = self.request(self.tomorrow, time(11, 0), time(11, 30))
+        Reservation.objects.create(reservation_request=confirmed, name="Client")
+        pending = self.request(self.tomorrow, time(9, 0), time(9, 30), expires_in=10)
+
+        self.migrate()
+
+        self.assertEqual(
+            set(ReservationRequest.objects.values_list("pk", flat=True)),
+            {confirmed.pk, pending.pk},
+        )
+        self.assertFalse(ReservationRequest.objects.filter(pk=stale.pk).exists())
+
+    def test_days_taken_by_stale_requests_are_given_back(self):
+        self.request(self.tomorrow, time(10, 0), time(11, 0))
+        self.request(self.scheduled_day, time(14, 0), time(15, 0))
+
+        self.migrate()
+
+        self.assertEqual(self.blocks(self.tomorrow), [(time(9, 0), time(12, 0))])
+        self.assertEqual(self.blocks(self.scheduled_day), [(time(13, 0), time(16, 0))])
+        self.assertTrue(
+            AvailabilityBlock.objects.filter(
+                date=self.scheduled_day, schedule__isnull=False
+            ).exists()
+        )
@@ -0,0 +1,81 @@
+from datetime import time, timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import override_settings
+from django.utils.timezone import now
+from reservations.models import Reservation, ReservationRequest
+from reservations.tasks import REMINDER_CHUNK_SIZE, send_upcoming_reminder
+
+from .base_test import BaseTestCase
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class TestSendUpcomingReminder(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        mail.outbox = []
+        self.tomorrow = now().date() + timedelta(days=1)
+
+    def seed_day(self, count, status="CONFIRMED", email=True):
+        # Without an employee the requests may overlap, so a whole busy day
+        # fits in one bulk insert.
+        requests = ReservationRequest.objects.bulk_create(
+            ReservationRequest(
+                date=self.tomorrow,
+                start_time=time(9 + number % 8, 0),
+                end_time=time(10 + number % 8, 0),
+                service=self.service1,
+                expires_at=now(),
+            )
+            for number in range(count)
+        )
+        Reservation.objects.bulk_create(
+            Reservation(
+                reservation_request=reservation_request,
+                name=f"Client {reservation_request.pk}",
+                email=f"client{reservation_request.pk}@test.com" if email else None,
+                status=status,
+            )
+            for reservation_request in requests
+        )
+
+    def test_a_busy_day_is_sent_in_chunks_over_one_connection(self):
+        count = REMINDER_CHUNK_SIZE * 2 + 5
+        self.seed_day(count)
+        self.seed_day(3, status="PENDING")
+        self.seed_day(2, email=False)
+
+        with (
+            patch("reservations.tasks.get_connection", wraps=get_connection) as connect,
+            patch.object(
+                EmailBackend,
+                "send_messages",
+                autospec=True,
+                side_effect=EmailBackend.send_messages,
+            ) as send_messages,
+            self.assertNumQueries(1),
+        ):
+            result = send_upcoming_reminder()
+
+        self.assertEqual(result, f"Sent {count} reminder emails.")
+        connect.assert_called_once_with()
+        self.assertEqual(send_messages.call_count, 3)
+        self.assertEqual(len(mail.outbox), count)
+
+    def test_reminder_content(self):
+        self.seed_day(1)
+        reservation = Reservation.objects.get()
+
+        send_upcoming_reminder()
+
+        email = mail.outbox[0]
+        self.assertEqual(email.subject, "Your appointment is tomorrow!")
+        self.assertEqual(email.to, [reservation.email])
+        self.assertIn("tomorrow at 09:00:00", email.body)
+        html, mimetype = email.alternatives[0]
+        self.assertEqual(mimetype, "text/html")
+        self.assertIn("Manicure classic", html)
+        self.assertIn(f"Hello {reservation.name}", html)
@@ -1,9 +1,22 @@
+import json
 from datetime import date, time, timedelta
 from unittest.mock import patch
 
+from django.test import RequestFactory
 from django.urls import reverse
 from django.utils import timezone
-from reservations.models import WorkDay
+from reservations.api import bulk_update_workdays, reservations_api, workday_api
+from reservations.models import (
+    AvailabilityBlock,
+    CalendarTombstone,
+    Reservation,
+    ReservationRequest,
+    WorkDay,
+)
+from reservations.tasks import prune_calendar_tombstones
+from users.models import Employee
+from utils.error_codes import ErrorCode
+from utils.support_functions import check_for_conflicting_work_day
 
 from salon_manager.reservations.tests.base_test import BaseTestCase
 
@@ -68,6 +81,148 @@ class TestGetAvailableSlots(BaseTestCase):
         self.assertEqual(response.json()["message"], "Date is in the past")
 
 
+class TestGetAvailableSlotsAnyStaff(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("get_available_slots_any_staff")
+        self.tomorrow = date.today() + timedelta(days=1)
+        WorkDay.objects.create(
+            employee=self.employee1,
+            date=self.tomorrow,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+        )
+
+    def test_returns_slots_with_assigned_staff_member(self):
+        response = self.client.get(
+            self.url,
+            {
+                "selected_date": self.tomorrow.isoformat(),
+                "service_id": self.service1.id,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["success"])
+        self.assertEqual(
+            response.json()["available_slots"],
+            [
+                {
+                    "time": "09:00",
+                    "staff_member_id": self.employee1.id,
+                    "staff_member": "Daniel",
+                }
+            ],
+        )
+
+    def test_unknown_service_returns_error(self):
+        response = self.client.get(
+            self.url, {"selected_date": self.tomorrow.isoformat(), "service_id": 0}
+        )
+        self.assertFalse(response.json()["success"])
+        self.assertEqual(response.json()["message"], "Service not found")
+
+
+class TestGetAvailableSlotsRange(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tomorrow = date.today() + timedelta(days=1)
+        cls.in_three_days = date.today() + timedelta(days=3)
+        for day in (cls.tomorrow, cls.in_three_days):
+            WorkDay.objects.create(
+                employee=cls.employee1,
+                date=day,
+                start_time=time(9, 0),
+                end_time=time(11, 0),
+            )
+        ReservationRequest.objects.create(
+            date=cls.tomorrow,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            service=cls.service1,
+            employee=cls.employee1,
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("get_available_slots_range")
+
+    def get_range(self, start, end, **extra):
+        data = {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "staff_member": self.employee1.id,
+            "service_id": self.service1.id,
+        }
+        data.update(extra)
+        return self.client.get(self.url, data)
+
+    def test_returns_slots_for_every_day_in_range(self):
+        response = self.get_range(self.tomorrow, self.in_three_days)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(
+            data["slots"],
+            {
+                self.tomorrow.isoformat(): [],
+                self.in_three_days.isoformat(): [
+                    "09:00",
+                    "09:15",
+                    "09:30",
+                    "09:45",
+                    "10:00",
+                ],
+            },
+        )
+        self.assertEqual(
+            data["non_working_days"],
+            [(self.tomorrow + timedelta(days=1)).isoformat()],
+        )
+
+    def test_matches_single_day_endpoint(self):
+        single_day = self.client.get(
+            reverse("get_available_slots"),
+            {
+                "selected_date": self.in_three_days.isoformat(),
+                "staff_member": self.employee1.id,
+                "service_id": self.service1.id,
+            },
+        ).json()
+        data = self.get_range(self.in_three_days, self.in_three_days).json()
+        self.assertEqual(
+            data["slots"][self.in_three_days.isoformat()],
+            single_day["available_slots"],
+        )
+
+    def test_past_days_are_left_out(self):
+        data = self.get_range(date.today() - timedelta(days=5), self.tomorrow).json()
+        self.assertNotIn(
+            (date.today() - timedelta(days=1)).isoformat(), data["non_working_days"]
+        )
+        self.assertIn(self.tomorrow.isoformat(), data["slots"])
+
+    def test_end_before_start(self):
+        data = self.get_range(self.in_three_days, self.tomorrow).json()
+        self.assertTrue(data["error"])
+        self.assertEqual(data["message"], "End date cannot be before start date")
+
+    def test_range_too_long(self):
+        data = self.get_range(self.tomorrow, self.tomorrow + timedelta(days=100)).json()
+        self.assertTrue(data["error"])
+        self.assertIn("cannot exceed", data["message"])
+
+    def test_invalid_staff_member(self):
+        data = self.get_range(self.tomorrow, self.tomorrow, staff_member=9999).json()
+        self.assertTrue(data["error"])
+        self.assertEqual(data["message"], "Staff member does not exist")
+
+    def test_service_not_found(self):
+        data = self.get_range(self.tomorrow, self.tomorrow, service_id=9999).json()
+        self.assertTrue(data["error"])
+        self.assertEqual(data["message"], "Service not found")
+
+
 class TestNextAvailableDate(BaseTestCase):
     @classmethod
     def setUpTestData(cls):
@@ -187,7 +342,7 @@ class TestGetNonWorkingDays(BaseTestCase):
             self.assertRegex(date_str, r"^\d{4}-\d{2}-\d{2}$")
 
     def test_non_working_days_excludes_working_days(self):
-        today = timezone.now().date()
+        today = timezone.localdate()
         response = self.client.get(self.url, {"staff_id": str(self.employee1.id)})
         data = response.json()
 
@@ -216,7 +371,7 @@ class TestGetNonWorkingDays(BaseTestCase):
         self.assertEqual(len(data["non_working_days"]), 61)
 
     def test_employee_working_all_days(self):
-        today = timezone.now().date()
+        today = timezone.localdate()
         for i in range(61):
             WorkDay.objects.create(
                 employee=self.employee1,
@@ -230,3 +385,443 @@ class TestGetNonWorkingDays(BaseTestCase):
 
         self.assertTrue(data["success"])
         self.assertEqual(len(data["non_working_days"]), 0)
+
+
+class TestUpdateWorkdayDate(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.day_after = date.today() + timedelta(days=2)
+        self.url = reverse("update_workday_date", kwargs={"pk": self.workday.pk})
+
+    def move_to(self, new_date):
+        return self.client.post(
+            self.url,
+            data=json.dumps({"date": new_date.isoformat()}),
+            content_type="application/json",
+        )
+
+    def test_moves_work_day(self):
+        response = self.move_to(self.day_after)
+        self.assertEqual(response.status_code, 200)
+        self.workday.refresh_from_db()
+        self.assertEqual(self.workday.date, self.day_after)
+
+    def test_overlapping_work_day_is_rejected(self):
+        WorkDay.objects.create(
+            employee=self.employee1,
+            date=self.day_after,
+            start_time=time(16, 0),
+            end_time=time(20, 0),
+        )
+        response = self.move_to(self.day_after)
+        self.assertEqual(response.status_code, 409)
+        self.workday.refresh_from_db()
+        self.assertEqual(self.workday.date, date.today())
+
+    def test_overlap_is_checked_with_one_query(self):
+        with self.assertNumQueries(1):
+            check_for_conflicting_work_day(
+                self.employee1.id, date.today(), time(8, 0), time(9, 30)
+            )
+
+
+class CalendarFeedTestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for offset in range(1, 40):
+            day = date.today() + timedelta(days=offset)
+            WorkDay.objects.create(
+                employee=cls.employee1,
+                date=day,
+                start_time=time(9, 0),
+                end_time=time(17, 0),
+            )
+            reservation_request = ReservationRequest.objects.create(
+                date=day,
+                start_time=time(10, 0),
+                end_time=time(11, 0),
+                service=cls.service1,
+                employee=cls.employee1,
+            )
+            Reservation.objects.create(
+                reservation_request=reservation_request,
+                name="Alice",
+                status="CONFIRMED" if offset % 2 else "PENDING",
+            )
+
+    def setUp(self):
+        super().setUp()
+        self.start = date.today() + timedelta(days=7)
+        self.window = {
+            "start": f"{self.start.isoformat()}T00:00:00+01:00",
+            "end": f"{(self.start + timedelta(days=7)).isoformat()}T00:00:00+01:00",
+        }
+
+    def feed(self, view, params):
+        return view(RequestFactory().get("/", params))
+
+    def payload(self, view, params):
+        response = self.feed(view, params)
+        if response.streaming:
+            return json.loads(b"".join(response.streaming_content))
+        return json.loads(response.content)
+
+
+class TestCalendarFeeds(CalendarFeedTestCase):
+    def test_work_days_are_limited_to_the_visible_range(self):
+        events = self.payload(workday_api, self.window)
+        self.assertEqual(
+            [event["start"][:10] for event in events],
+            [(self.start + timedelta(days=offset)).isoformat() for offset in range(7)],
+        )
+        self.assertEqual(events[0]["title"], "Daniel: 09:00 - 17:00")
+        self.assertEqual(events[0]["extendedProps"]["employeeId"], self.employee1.id)
+
+    def test_reservations_are_limited_to_the_visible_range(self):
+        events = self.payload(reservations_api, self.window)
+        self.assertEqual(len(events), 7)
+        self.assertEqual(events[0]["title"], "Manicure classic, Alice ")
+        self.assertEqual(events[0]["start"], f"{self.start.isoformat()}T10:00")
+        self.assertIn(events[0]["color"], ("#28a745", "#ffc107"))
+
+    def test_feeds_without_a_range_return_everything(self):
+        events = self.payload(workday_api, {})
+        self.assertEqual(len(events), WorkDay.objects.count())
+
+    def test_each_feed_is_one_query(self):
+        # Plus one for the weekly schedules expanded into the work day feed.
+        with self.assertNumQueries(2):
+            self.payload(workday_api, self.window)
+        with self.assertNumQueries(1):
+            self.payload(
+                reservations_api, {**self.window, "employee": self.employee1.id}
+            )
+
+    def test_invalid_range_is_rejected(self):
+        response = self.feed(workday_api, {"start": "next week"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            json.loads(response.content)["errorCode"], ErrorCode.INVALID_DATE.value
+        )
+
+    def test_reservations_for_several_employees_in_one_query(self):
+        employee2 = Employee.objects.create(
+            user=self.users["employee2"], name="Samantha"
+        )
+        reservation_request = ReservationRequest.objects.create(
+            date=self.start,
+            start_time=time(12, 0),
+            end_time=time(13, 0),
+            service=self.service1,
+            employee=employee2,
+        )
+        Reservation.objects.create(
+            reservation_request=reservation_request, name="Bob", status="PENDING"
+        )
+        params = {**self.window, "employee": [self.employee1.id, employee2.id]}
+
+        with self.assertNumQueries(1):
+            events = self.payload(reservations_api, params)
+
+        self.assertEqual(len(events), 8)
+        self.assertEqual(
+            {event["extendedProps"]["employeeName"] for event in events},
+            {"Daniel", "Samantha"},
+        )
+        only_samantha = self.payload(
+            reservations_api, {**self.window, "employee": employee2.id}
+        )
+        self.assertEqual(
+            [event["title"] for event in only_samantha], ["Manicure classic, Bob "]
+        )
+
+    def test_comma_separated_employee_ids(self):
+        events = self.payload(
+            reservations_api, {**self.window, "employee": f"{self.employee1.id},0"}
+        )
+        self.assertEqual(len(events), 7)
+
+    def test_invalid_employee_ids_are_rejected(self):
+        response = self.feed(reservations_api, {"employee": "daniel"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            json.loads(response.content)["errorCode"], ErrorCode.INVALID_DATA.value
+        )
+
+    async def test_feeds_stream_asynchronously_under_asgi(self):
+        await self.async_client.aforce_login(self.users["superuser"])
+        response = await self.async_client.get(reverse("workday_api"), self.window)
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(json.loads(body)), 7)
+
+
+class TestCalendarDeltaSync(CalendarFeedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.since = timezone.now()
+        self.window_days = list(
+            WorkDay.objects.filter(
+                date__gte=self.start, date__lt=self.start + timedelta(days=7)
+            ).order_by("date")
+        )
+
+    def delta(self, view, params=None):
+        return self.payload(
+            view, {**self.window, "updated_since": self.since, **(params or {})}
+        )
+
+    def test_full_feed_hands_out_a_cursor(self):
+        response = self.feed(workday_api, self.window)
+        self.assertIn("X-Sync-Cursor", response)
+
+    def test_work_day_changes_and_deletions(self):
+        edited, moved, removed = self.window_days[:3]
+        edited.end_time = time(15, 0)
+        edited.save()
+        moved.date = self.start + timedelta(days=30)
+        moved.save()
+        removed_pk = removed.pk
+        removed.delete()
+
+        data = self.delta(workday_api)
+
+        self.assertEqual([event["id"] for event in data["events"]], [edited.pk])
+        self.assertEqual(data["events"][0]["title"], "Daniel: 09:00 - 15:00")
+        self.assertEqual(data["deleted"], sorted([moved.pk, removed_pk]))
+
+    def test_nothing_changed(self):
+        data = self.delta(workday_api)
+        self.assertEqual((data["events"], data["deleted"]), ([], []))
+
+    def test_reservation_changes_follow_their_request(self):
+        moved = Reservation.objects.get(reservation_request__date=self.start)
+        moved.reservation_request.start_time = time(12, 0)
+        moved.reservation_request.end_time = time(13, 0)
+        moved.reservation_request.save()
+        removed = Reservation.objects.get(
+            reservation_request__date=self.start + timedelta(days=1)
+        )
+        removed_pk = removed.pk
+        removed.reservation_request.delete()
+
+        data = self.delta(reservations_api, {"employee": self.employee1.id})
+
+        self.assertEqual([event["id"] for event in data["events"]], [moved.pk])
+        self.assertEqual(data["events"][0]["start"], f"{self.start}T12:00")
+        self.assertEqual(data["deleted"], [removed_pk])
+
+    def test_reservation_leaving_the_employee_filter_is_dropped(self):
+        employee2 = Employee.objects.create(
+            user=self.users["employee2"], name="Samantha"
+        )
+        reassigned = Reservation.objects.get(reservation_request__date=self.start)
+        reassigned.reservation_request.employee = employee2
+        reassigned.reservation_request.save()
+
+        data = self.delta(reservations_api, {"employee": self.employee1.id})
+
+        self.assertEqual(data["events"], [])
+        self.assertEqual(data["deleted"], [reassigned.pk])
+
+    def test_expired_cursor_asks_for_a_reload(self):
+        response = self.feed(
+            workday_api, {"updated_since": timezone.now() - timedelta(days=30)}
+        )
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(
+            json.loads(response.content)["errorCode"],
+            ErrorCode.SYNC_CURSOR_EXPIRED.value,
+        )
+
+    def test_old_tombstones_are_pruned(self):
+        old, recent = self.window_days[:2]
+        recent_pk = recent.pk
+        old.delete()
+        CalendarTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=8))
+        recent.delete()
+
+        prune_calendar_tombstones()
+
+        self.assertEqual(
+            list(CalendarTombstone.objects.values_list("object_id", flat=True)),
+            [recent_pk],
+        )
+
+
+class TestBulkUpdateWorkdays(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("bulk_update_workdays")
+        self.client.force_login(self.users["superuser"])
+        self.employee2 = Employee.objects.create(
+            user=self.users["employee2"], name="Samantha"
+        )
+        self.monday = date.today() + timedelta(days=7 - date.today().weekday())
+
+    def post(self, payload):
+        return self.client.post(
+            self.url, data=json.dumps(payload), content_type="application/json"
+        )
+
+    def month(self, employee):
+        return [
+            {
+                "employee": employee.pk,
+                "date": (self.monday + timedelta(days=offset)).isoformat(),
+                "start_time": "09:00",
+                "end_time": "17:00",
+            }
+            for offset in range(28)
+        ]
+
+    def test_month_for_several_employees_takes_a_fixed_number_of_queries(self):
+        payload = {"create": self.month(self.employee1) + self.month(self.employee2)}
+        request = RequestFactory().post(
+            self.url, data=json.dumps(payload), content_type="application/json"
+        )
+        request.user = self.users["superuser"]
+        with self.assertNumQueries(12):
+            response = bulk_update_workdays(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["created"], 56)
+        self.assertEqual(
+            AvailabilityBlock.objects.filter(date__gte=self.monday).count(), 56
+        )
+
+    def test_move_copy_and_delete_in_one_request(self):
+        self.post({"create": self.month(self.employee1)[:7]})
+        first, second, *rest = WorkDay.objects.filter(date__gte=self.monday).order_by(
+            "date"
+        )
+        next_monday = self.monday + timedelta(days=7)
+        response = self.post(
+            {
+                "move": [
+                    {
+                        "id": first.pk,
+                        "date": (self.monday + timedelta(days=14)).isoformat(),
+                    }
+                ],
+                "delete": [second.pk],
+                "copy_week": {
+                    "source": self.monday.isoformat(),
+                    "target": next_monday.isoformat(),
+                },
+            }
+        )
+        self.assertEqual(
+            {key: response.json()[key] for key in ("moved", "deleted", "copied")},
+            {"moved": 1, "deleted": 1, "copied": 5},
+        )
+        self.assertFalse(WorkDay.objects.filter(pk=second.pk).exists())
+        self.assertTrue(
+            CalendarTombstone.objects.filter(feed="WORKDAY", object_id=second.pk)
+        )
+        self.assertEqual(
+            WorkDay.objects.filter(
+                date__range=(next_monday, next_monday + timedelta(days=6))
+            ).count(),
+            5,
+        )
+        self.assertFalse(
+            AvailabilityBlock.objects.filter(
+                employee=self.employee1, date=self.monday + timedelta(days=1)
+            ).exists()
+        )
+        self.assertTrue(
+            AvailabilityBlock.objects.filter(
+                work_day=first, date=self.monday + timedelta(days=14)
+            ).exists()
+        )
+
+    def test_days_between_the_changes_keep_their_blocks(self):
+        self.post({"create": self.month(self.employee1)})
+        first = WorkDay.objects.get(employee=self.employee1, date=self.monday)
+        between = AvailabilityBlock.objects.get(
+            employee=self.employee1, date=self.monday + timedelta(days=10)
+        )
+
+        self.post(
+            {
+                "move": [
+                    {
+                        "id": first.pk,
+                        "date": self.monday.isoformat(),
+                        "start_time": "10:00",
+                    }
+                ],
+                "delete": [
+                    WorkDay.objects.get(
+                        employee=self.employee1, date=self.monday + timedelta(days=20)
+                    ).pk
+                ],
+            }
+        )
+
+        self.assertTrue(AvailabilityBlock.objects.filter(pk=between.pk).exists())
+        self.assertEqual(
+            AvailabilityBlock.objects.get(work_day=first).start_time, time(10, 0)
+        )
+        self.assertFalse(
+            AvailabilityBlock.objects.filter(
+                employee=self.employee1, date=self.monday + timedelta(days=20)
+            ).exists()
+        )
+        self.assertEqual(CalendarTombstone.objects.filter(feed="WORKDAY").count(), 1)
+
+    def test_overlap_rejects_the_whole_batch(self):
+        day = self.monday.isoformat()
+        response = self.post(
+            {
+                "create": [
+                    {
+                        "employee": self.employee2.pk,
+                        "date": day,
+                        "start_time": "09:00",
+                        "end_time": "12:00",
+                    },
+                    {
+                        "employee": self.employee1.pk,
+                        "date": day,
+                        "start_time": "09:00",
+                        "end_time": "12:00",
+                    },
+                    {
+                        "employee": self.employee1.pk,
+                        "date": day,
+                        "start_time": "11:00",
+                        "end_time": "13:00",
+                    },
+                ]
+            }
+        )
+        self.assertEqual(response.status_code, 409)
+        data = response.json()
+        self.assertEqual(data["errorCode"], ErrorCode.WORKING_HOURS_CONFLICT.value)
+        self.assertEqual((data["employeeId"], data["date"]), (self.employee1.pk, day))
+        self.assertFalse(WorkDay.objects.filter(date=self.monday).exists())
+
+    def test_invalid_items_are_rejected(self):
+        cases = [
+            ({"create": [{"employee": self.employee1.pk}]}, 400),
+            ({"delete": ["1"]}, 400),
+            (
+                {
+                    "delete": [self.workday.pk],
+                    "move": [{"id": self.workday.pk, "date": "2030-01-01"}],
+                },
+                400,
+            ),
+            ({"delete": [self.workday.pk + 1000]}, 404),
+            ({"create": [{**self.month(self.employee1)[0], "end_time": "08:00"}]}, 400),
+        ]
+        for payload, status in cases:
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, status)
+        self.assertTrue(WorkDay.objects.filter(pk=self.workday.pk).exists())
+
+    def test_only_the_owner_may_edit(self):
+        self.client.force_login(self.users["employee1"])
+        self.assertEqual(self.post({"delete": [self.workday.pk]}).status_code, 403)
@@ -3,13 +3,43 @@ from datetime import date, time, timedelta
 from unittest.mock import patch
 
 from django.contrib.messages import get_messages
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
 from reservations.models import Reservation, ReservationRequest, WorkDay
+from reservations.views import (
+    ManageReservationsListView,
+    UserReservationsListView,
+    WorkDayListView,
+)
 
 from salon_manager.reservations.tests.base_test import BaseTestCase
 
 
+def count_render_queries(view_class, user):
+    # Rendered through RequestFactory so that Silk's own queries stay out.
+    request = RequestFactory().get("/")
+    request.user = user
+    with CaptureQueriesContext(connection) as queries:
+        view_class.as_view()(request).render()
+    return len(queries)
+
+
+def book(test_case, day, hour, customer=None, employee=None):
+    reservation_request = ReservationRequest.objects.create(
+        date=day,
+        start_time=time(hour, 0),
+        end_time=time(hour + 1, 0),
+        service=test_case.service1,
+        employee=employee,
+    )
+    return Reservation.objects.create(
+        customer=customer, reservation_request=reservation_request, name="Guest"
+    )
+
+
 class UserReservationsListViewTest(BaseTestCase):
     def setUp(self):
         super().setUp()
@@ -144,6 +174,17 @@ class UserReservationsListViewTest(BaseTestCase):
         self.assertIn("PENDING", statuses)
         self.assertIn("PAST", statuses)
 
+    def test_query_count_does_not_grow_with_rows(self):
+        customer = self.users["client1"]
+        before = count_render_queries(UserReservationsListView, customer)
+        for offset in range(10, 15):
+            book(
+                self, date.today() + timedelta(days=offset), 9, customer, self.employee1
+            )
+        self.assertEqual(
+            count_render_queries(UserReservationsListView, customer), before
+        )
+
 
 class CancelUserReservationViewTest(BaseTestCase):
     def setUp(self):
@@ -292,6 +333,39 @@ class WorkDayListViewTest(BaseTestCase):
 
         self.assertEqual(workdays[0], self.workday)
 
+    def test_same_day_work_days_are_paged_by_id(self):
+        for hour in (6, 18):
+            WorkDay.objects.create(
+                employee=self.employee1,
+                date=self.workday.date,
+                start_time=time(hour, 0),
+                end_time=time(hour + 1, 0),
+            )
+        self.client.force_login(self.users["superuser"])
+        seen, query = [], ""
+        with patch("reservations.views.WorkDayListView.page_size", 2):
+            while query is not None:
+                response = self.client.get(f"{self.url}?{query}")
+                seen += response.context["workdays"]
+                query = response.context["next_page_query"]
+
+        self.assertEqual(
+            [workday.pk for workday in seen],
+            sorted(WorkDay.objects.values_list("pk", flat=True), reverse=True),
+        )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        owner = self.users["superuser"]
+        before = count_render_queries(WorkDayListView, owner)
+        for offset in range(1, 6):
+            WorkDay.objects.create(
+                employee=self.employee1,
+                date=date.today() + timedelta(days=offset),
+                start_time=time(9, 0),
+                end_time=time(17, 0),
+            )
+        self.assertEqual(count_render_queries(WorkDayListView, owner), before)
+
 
 class WorkDayCreateViewTest(BaseTestCase):
     def setUp(self):
@@ -443,7 +517,10 @@ class WorkDayUpdateViewTest(BaseTestCase):
         self.assertEqual(response.status_code, 400)
         json_data = response.json()
         self.assertEqual(json_data["status"], "error")
-        self.assertIn("errors", json_data)
+        self.assertEqual(
+            json_data["errors"]["end_time"],
+            ["The end time must be later than the start time!"],
+        )
 
     def test_invalid_workday_id_returns_404(self):
         self.client.force_login(self.users["superuser"])
@@ -548,7 +625,51 @@ class ManageReservationsListViewTest(BaseTestCase):
         self.client.force_login(self.users["superuser"])
         response = self.client.get(self.url)
 
-        self.assertEqual(response.context["reservations"].count(), 2)
+        self.assertEqual(len(response.context["reservations"]), 2)
+
+    def test_pages_follow_the_cursor(self):
+        self.client.force_login(self.users["superuser"])
+        with patch("reservations.views.ManageReservationsListView.page_size", 1):
+            first = self.client.get(self.url, {"status": "PENDING"})
+            second = self.client.get(f"{self.url}?{first.context['next_page_query']}")
+
+        self.assertEqual(list(first.context["reservations"]), [self.reservation1])
+        self.assertEqual(list(second.context["reservations"]), [self.reservation2])
+        self.assertIn("status=PENDING", first.context["next_page_query"])
+        self.assertIsNone(second.context["next_page_query"])
+        self.assertEqual(second.context["first_page_query"], "status=PENDING")
+
+    def test_filters_by_status_and_date(self):
+        self.reservation2.status = "CONFIRMED"
+        self.reservation2.save()
+        self.client.force_login(self.users["superuser"])
+
+        confirmed = self.client.get(self.url, {"status": "CONFIRMED"})
+        later = self.client.get(
+            self.url, {"date_from": (date.today() + timedelta(days=4)).isoformat()}
+        )
+
+        self.assertEqual(list(confirmed.context["reservations"]), [self.reservation2])
+        self.assertEqual(list(later.context["reservations"]), [self.reservation1])
+
+    def test_invalid_cursor_shows_the_first_page(self):
+        self.client.force_login(self.users["superuser"])
+        response = self.client.get(self.url, {"cursor": "yesterday"})
+
+        self.assertEqual(len(response.context["reservations"]), 2)
+        self.assertIn("cursor", response.context["filter_form"].errors)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        owner = self.users["superuser"]
+        before = count_render_queries(ManageReservationsListView, owner)
+        for offset in range(10, 15):
+            book(
+                self, date.today() + timedelta(days=offset), 9, employee=self.employee1
+            )
+        book(self, date.today() + timedelta(days=20), 9)
+        self.assertEqual(
+            count_render_queries(ManageReservationsListView, owner), before
+        )
 
 
 class ReservationCreateViewTest(BaseTestCase):
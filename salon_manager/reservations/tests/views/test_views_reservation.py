@@ -1,4 +1,4 @@
-from datetime import date, timedelta
+from datetime import date, time, timedelta
 from unittest.mock import patch
 
 from django.contrib.messages import get_messages
@@ -7,6 +7,8 @@ from django.urls import reverse
 from reservations.models import Reservation, ReservationRequest, WorkDay
 from reservations.views_reservation import create_reservation
 from users.models import CustomUser, Employee
+from utils import slot_holds
+from utils.error_codes import ErrorCode
 
 from salon_manager.reservations.tests.base_test import BaseTestCase
 
@@ -40,22 +42,23 @@ class TestReservationRequestView(BaseTestCase):
 
         self.assertEqual(response.status_code, 404)
 
-    def test_post_valid_data_creates_reservation(self):
+    def test_post_valid_data_holds_the_slot_without_writing_it(self):
         initial_count = ReservationRequest.objects.count()
 
         response = self.client.post(self.url, data=self.valid_form_data)
 
-        self.assertEqual(ReservationRequest.objects.count(), initial_count + 1)
-
-        reservation = ReservationRequest.objects.latest("id")
+        self.assertEqual(ReservationRequest.objects.count(), initial_count)
+        tomorrow = date.today() + timedelta(days=1)
+        self.assertEqual(
+            slot_holds.live_holds(self.employee1.id, tomorrow),
+            [(time(10, 0), time(11, 0))],
+        )
+        id_request = response.url.rstrip("/").rsplit("/", 1)[-1]
+        self.assertEqual(slot_holds.get_hold(id_request).start_time, time(10, 0))
         self.assertRedirects(
             response,
             reverse(
-                "reservation_client_information",
-                kwargs={
-                    "reservation_request_id": reservation.id,
-                    "id_request": reservation.id_request,
-                },
+                "reservation_client_information", kwargs={"id_request": id_request}
             ),
         )
 
@@ -73,6 +76,68 @@ class TestReservationRequestView(BaseTestCase):
         messages = list(get_messages(response.wsgi_request))
         self.assertGreater(len(messages), 0)
 
+    def test_post_overlapping_slot_is_rejected(self):
+        self.client.post(self.url, data=self.valid_form_data)
+        overlapping = {
+            **self.valid_form_data,
+            "start_time": "10:30",
+            "end_time": "11:30",
+        }
+
+        response = self.client.post(self.url, data=overlapping)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "This time slot is no longer available",
+            response.context["form"].non_field_errors(),
+        )
+
+    @patch("reservations.forms.check_for_conflicting_reservation", return_value=False)
+    def test_concurrent_booking_returns_appointment_conflict(self, mock_check):
+        self.client.post(self.url, data=self.valid_form_data)
+
+        response = self.client.post(
+            self.url,
+            data=self.valid_form_data,
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            response.json()["errorCode"], ErrorCode.APPOINTMENT_CONFLICT.value
+        )
+
+    @patch(
+        "reservations.views_reservation.slot_holds.acquire_hold",
+        side_effect=slot_holds.HoldLockTimeout,
+    )
+    def test_lock_contention_returns_appointment_conflict(self, mock_acquire):
+        response = self.client.post(
+            self.url,
+            data=self.valid_form_data,
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            response.json()["errorCode"], ErrorCode.APPOINTMENT_CONFLICT.value
+        )
+
+    def test_post_adjacent_slot_is_accepted(self):
+        self.client.post(self.url, data=self.valid_form_data)
+        adjacent = {**self.valid_form_data, "start_time": "11:00", "end_time": "12:00"}
+
+        self.client.post(self.url, data=adjacent)
+
+        self.assertEqual(
+            len(
+                slot_holds.live_holds(
+                    self.employee1.id, date.today() + timedelta(days=1)
+                )
+            ),
+            2,
+        )
+
     def test_form_preselects_employee_if_only_one(self):
         response = self.client.get(self.url)
         self.assertEqual(response.context["staff_member"], self.employee1)
@@ -98,21 +163,18 @@ class TestReservationClientInformationView(BaseTestCase):
         self.client = Client()
         self.client_user = self.users["client1"]
 
-        self.reservation_request = ReservationRequest.objects.create(
-            date=date.today(),
-            start_time="10:00",
-            end_time="11:00",
-            service=self.service1,
-            employee=self.employee1,
-            id_request=1234567890,
+        self.hold = slot_holds.acquire_hold(
+            self.employee1.id,
+            self.service1.id,
+            date.today() + timedelta(days=1),
+            time(10, 0),
+            time(11, 0),
         )
+        self.reservation_request = self.hold.to_reservation_request()
 
         self.url = reverse(
             "reservation_client_information",
-            kwargs={
-                "reservation_request_id": self.reservation_request.id,
-                "id_request": self.reservation_request.id_request,
-            },
+            kwargs={"id_request": self.hold.token},
         )
         self.valid_client_data_form = {
             "name": "Georges Hammond",
@@ -144,9 +206,8 @@ class TestReservationClientInformationView(BaseTestCase):
         self.assertEqual(client_form.initial["email"], self.client_user.email)
 
     def test_get_view_already_submitted(self):
-        session = self.client.session
-        session["reservation_completed_1234567890"] = True
-        session.save()
+        post_data = {**self.valid_client_data_form, **self.valid_reservation_form}
+        self.client.post(self.url, data=post_data)
 
         response = self.client.get(self.url)
         self.assertTemplateUsed(response, "reservations/304_already_submitted.html")
@@ -162,9 +223,66 @@ class TestReservationClientInformationView(BaseTestCase):
         self.assertRedirects(response, reverse("reservation_success"))
         mock_create_reservation.assert_called_once()
         self.assertTrue(
-            self.client.session.get(
-                f"reservation_completed_{self.reservation_request.id_request}", False
-            )
+            self.client.session.get(f"reservation_completed_{self.hold.token}", False)
+        )
+        self.assertIsNone(slot_holds.get_hold(self.hold.token))
+
+    def test_post_valid_forms_persists_the_booking(self):
+        post_data = {**self.valid_client_data_form, **self.valid_reservation_form}
+
+        self.client.post(self.url, data=post_data)
+
+        reservation = Reservation.objects.get(id_request=self.hold.token)
+        self.assertEqual(reservation.reservation_request.start_time, time(10, 0))
+        self.assertEqual(reservation.reservation_request.id_request, self.hold.token)
+        self.assertEqual(slot_holds.live_holds(self.employee1.id, self.hold.date), [])
+
+    def test_expired_hold_redirects_home(self):
+        slot_holds.release_hold(self.hold)
+
+        response = self.client.get(self.url)
+
+        self.assertRedirects(response, reverse("home"))
+        self.assertFalse(ReservationRequest.objects.exists())
+
+    def test_slot_booked_by_staff_meanwhile_returns_appointment_conflict(self):
+        ReservationRequest.objects.create(
+            date=self.hold.date,
+            start_time=time(10, 30),
+            end_time=time(11, 30),
+            service=self.service1,
+            employee=self.employee1,
+        )
+        post_data = {**self.valid_client_data_form, **self.valid_reservation_form}
+
+        response = self.client.post(
+            self.url, data=post_data, HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            response.json()["errorCode"], ErrorCode.APPOINTMENT_CONFLICT.value
+        )
+        self.assertIsNone(slot_holds.get_hold(self.hold.token))
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_slot_booked_by_staff_meanwhile_offers_other_times(self):
+        ReservationRequest.objects.create(
+            date=self.hold.date,
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            service=self.service1,
+            employee=self.employee1,
+        )
+        post_data = {**self.valid_client_data_form, **self.valid_reservation_form}
+
+        response = self.client.post(self.url, data=post_data)
+
+        self.assertTemplateUsed(response, "reservations/reservation_create.html")
+        self.assertEqual(response.context["service"], self.service1)
+        self.assertIn(
+            "This time slot is no longer available",
+            response.context["form"].non_field_errors(),
         )
 
     @patch("reservations.views_reservation.create_reservation")
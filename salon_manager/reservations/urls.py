@@ -26,7 +26,7 @@ urlpatterns = [
         name="reservation_request",
     ),
     path(
-        "client-info/<int:reservation_request_id>/<str:id_request>/",  # request/.../client-info/
+        "client-info/<str:id_request>/",  # request/.../client-info/
         views_reservation.reservation_client_information,
         name="reservation_client_information",
     ),
@@ -36,6 +36,16 @@ urlpatterns = [
         api.get_available_slots,
         name="get_available_slots",
     ),
+    path(
+        "available_slots_any_staff/",
+        api.get_available_slots_any_staff,
+        name="get_available_slots_any_staff",
+    ),
+    path(
+        "available_slots_range/",
+        api.get_available_slots_range,
+        name="get_available_slots_range",
+    ),
     path(
         "request_next_available_slot/<int:service_id>/",
         api.get_next_available_date,
@@ -65,14 +75,26 @@ urlpatterns = [
     ),
     # API endpoints for FullCalendar
     path("api/workdays/", api.workday_api, name="workday_api"),  # api/calendar/workdays
+    path("api/workdays/bulk/", api.bulk_update_workdays, name="bulk_update_workdays"),
     path(
         "workdays/<int:pk>/update-date/",
         api.update_workday_date,
         name="update_workday_date",
     ),
+    path("api/capacity/", api.capacity_report, name="capacity_report"),
     path(
         "api/reservations/", api.reservations_api, name="reservations_api"
     ),  # api/calendar/reservations
+    path(
+        "calendar/<str:token>.ics",
+        api.employee_calendar_feed,
+        name="employee_calendar_feed",
+    ),
+    path(
+        "api/reservations/stream/",
+        api.reservation_stream,
+        name="reservation_stream",
+    ),
     # Reservation Management URLs
     path(
         "manage-reservations/",  #
@@ -6,7 +6,7 @@ from typing import Any
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
 from django.utils.timezone import now
@@ -20,9 +20,17 @@ from django.views.generic import (
     View,
 )
 from users.models import Employee
-from utils.mixins import OwnerRequiredMixin
-
-from .forms import ClientDataForm, ReservationForm, ReservationRequestForm, WorkDayForm
+from utils.json_encoding import FastJsonResponse
+from utils.mixins import KeysetPaginationMixin, OwnerRequiredMixin
+
+from .forms import (
+    ClientDataForm,
+    HistoryFilterForm,
+    ReservationForm,
+    ReservationHistoryFilterForm,
+    ReservationRequestForm,
+    WorkDayForm,
+)
 from .models import Reservation, WorkDay
 from .tasks import send_confirmation_email
 
@@ -39,8 +47,10 @@ class UserReservationsListView(LoginRequiredMixin, UserPassesTestMixin, ListView
     context_object_name = "reservations"
 
     def get_queryset(self) -> QuerySet[Reservation]:
-        return Reservation.objects.filter(customer=self.request.user).order_by(
-            "-reservation_request__date"
+        return (
+            Reservation.objects.filter(customer=self.request.user)
+            .with_request_details()
+            .order_by("-reservation_request__date")
         )
 
     def test_func(self) -> bool:
@@ -64,13 +74,14 @@ class CancelUserReservationView(LoginRequiredMixin, UserPassesTestMixin, View):
 
 
 # WorkDay Management ###################
-class WorkDayListView(OwnerRequiredMixin, ListView):
+class WorkDayListView(OwnerRequiredMixin, KeysetPaginationMixin, ListView):
     model = WorkDay
     template_name = "reservations/workday_list.html"
     context_object_name = "workdays"
+    filter_form_class = HistoryFilterForm
 
     def get_queryset(self) -> QuerySet[WorkDay]:
-        return WorkDay.objects.all().order_by("-date")
+        return WorkDay.objects.select_related("employee")
 
 
 class WorkDayCreateView(OwnerRequiredMixin, CreateView):
@@ -95,7 +106,7 @@ class WorkDayUpdateView(OwnerRequiredMixin, UpdateView):
 
         if is_ajax:
             self.object = form.save()
-            return JsonResponse(
+            return FastJsonResponse(
                 {
                     "status": "success",
                     "message": "Work day updated successfully!",
@@ -109,7 +120,9 @@ class WorkDayUpdateView(OwnerRequiredMixin, UpdateView):
         is_ajax = self.request.headers.get("x-requested-with") == "XMLHttpRequest"
 
         if is_ajax:
-            return JsonResponse({"status": "error", "errors": form.errors}, status=400)
+            return FastJsonResponse(
+                {"status": "error", "errors": form.errors}, status=400
+            )
         return super().form_invalid(form)
 
     def get_form_kwargs(self):
@@ -135,13 +148,26 @@ class WorkDayDeleteView(OwnerRequiredMixin, DeleteView):
 
 
 # Reservations Management ########
-class ManageReservationsListView(OwnerRequiredMixin, ListView):
+class ManageReservationsListView(OwnerRequiredMixin, KeysetPaginationMixin, ListView):
     model = Reservation
     template_name = "reservations/manage_reservations_list.html"
     context_object_name = "reservations"
+    filter_form_class = ReservationHistoryFilterForm
+    # A reservation has exactly one request, so the request's (date, id)
+    # orders reservations as well and is covered by the request_date_id index.
+    keyset_date_field = "reservation_request__date"
+    keyset_id_field = "reservation_request_id"
 
     def get_queryset(self) -> QuerySet[Reservation]:
-        return Reservation.objects.all().order_by("-reservation_request__date")
+        return Reservation.objects.with_request_details()
+
+    def filter_queryset(
+        self, queryset: QuerySet[Reservation], filters: dict[str, Any]
+    ) -> QuerySet[Reservation]:
+        queryset = super().filter_queryset(queryset, filters)
+        if filters.get("status"):
+            queryset = queryset.filter(status=filters["status"])
+        return queryset
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
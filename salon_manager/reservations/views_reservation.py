@@ -2,27 +2,46 @@ import logging
 from typing import Any
 
 from django.contrib import messages
+from django.db import transaction
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.translation import gettext as _
 from services.models import Service
 from users.models import CustomUser, Employee
+from utils import slot_holds
+from utils.error_codes import ErrorCode
 from utils.support_functions import (
     _build_request_reservation_context,
     _calculate_non_working_days,
-    check_for_conflicting_reservation,
-    generate_available_slots,
     handle_invalid_form,
     json_response,
 )
 
 from .forms import ClientDataForm, ReservationForm, ReservationRequestForm
-from .models import Reservation, ReservationRequest
+from .models import Reservation, ReservationRequest, SlotConflict
 from .tasks import send_reservation_notification
 
 logger = logging.getLogger(__name__)
 
 
+def _slot_taken_response(
+    request: HttpRequest, form: ReservationRequestForm, context: dict[str, Any]
+) -> HttpResponse:
+    message = _("This time slot is no longer available")
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        return json_response(
+            message=message,
+            status=409,
+            success=False,
+            error_code=ErrorCode.APPOINTMENT_CONFLICT,
+        )
+    # A form bound to the taken slot reports it by itself.
+    if message not in form.non_field_errors():
+        form.add_error(None, message)
+    context["form"] = form
+    return render(request, "reservations/reservation_create.html", context)
+
+
 def reservation_request(request: HttpRequest, service_id: int) -> HttpResponse:
     service = get_object_or_404(Service, id=service_id)
     context = _build_request_reservation_context(request, service)
@@ -30,15 +49,22 @@ def reservation_request(request: HttpRequest, service_id: int) -> HttpResponse:
     if request.method == "POST":
         form = ReservationRequestForm(request.POST)
         if form.is_valid():
-            reservation_request = form.save()
-            request.session[
-                f"reservation_completed_{reservation_request.id_request}"
-            ] = False
-            return redirect(
-                "reservation_client_information",
-                reservation_request_id=reservation_request.id,
-                id_request=reservation_request.id_request,
-            )
+            try:
+                hold = slot_holds.acquire_hold(
+                    form.cleaned_data["employee"].id,
+                    form.cleaned_data["service"].id,
+                    form.cleaned_data["date"],
+                    form.cleaned_data["start_time"],
+                    form.cleaned_data["end_time"],
+                )
+            except slot_holds.HoldLockTimeout:
+                # Other customers are picking times of the same employee
+                # and day; this one can simply try again.
+                hold = None
+            if hold is None:
+                return _slot_taken_response(request, form, context)
+            request.session[f"reservation_completed_{hold.token}"] = False
+            return redirect("reservation_client_information", id_request=hold.token)
         else:
             messages.error(
                 request,
@@ -54,21 +80,27 @@ def reservation_request(request: HttpRequest, service_id: int) -> HttpResponse:
 
 
 def reservation_client_information(
-    request: HttpRequest, reservation_request_id: int, id_request: int
+    request: HttpRequest, id_request: str
 ) -> HttpResponse:
-    reservation_request_obj = get_object_or_404(
-        ReservationRequest, pk=reservation_request_id
-    )
-
     if request.session.get(f"reservation_completed_{id_request}", False):
+        reservation = get_object_or_404(Reservation, id_request=id_request)
         context = {
             "user": request.user,
-            "service_id": reservation_request_obj.service.id,
+            "service_id": reservation.get_service().id,
         }
         return render(
             request, "reservations/304_already_submitted.html", context=context
         )
 
+    hold = slot_holds.get_hold(id_request)
+    if hold is None:
+        messages.error(
+            request,
+            _("Your reservation time has expired. Please choose a time again."),
+        )
+        return redirect("home")
+    reservation_request_obj = hold.to_reservation_request()
+
     if request.method == "POST":
         reservation_form = ReservationForm(request.POST)
         client_data_form = ClientDataForm(request.POST)
@@ -77,12 +109,35 @@ def reservation_client_information(
             client_data = client_data_form.cleaned_data
             reservation_data = reservation_form.cleaned_data
 
-            response = create_reservation(
-                reservation_request_obj, id_request, client_data, reservation_data
-            )
+            try:
+                with transaction.atomic():
+                    response = create_reservation(
+                        reservation_request_obj,
+                        id_request,
+                        client_data,
+                        reservation_data,
+                    )
+            except SlotConflict:
+                # Booked by staff while the customer held the slot; the
+                # customer picks another time.
+                slot_holds.release_hold(hold)
+                form = ReservationRequestForm(
+                    {
+                        "service": reservation_request_obj.service_id,
+                        "employee": reservation_request_obj.employee_id,
+                        "date": reservation_request_obj.date,
+                        "start_time": reservation_request_obj.start_time,
+                        "end_time": reservation_request_obj.end_time,
+                    }
+                )
+                context = _build_request_reservation_context(
+                    request, reservation_request_obj.service
+                )
+                return _slot_taken_response(request, form, context)
 
             if response:
-                request.session.setdefault(f"reservation_completed_{id_request}", True)
+                slot_holds.release_hold(hold)
+                request.session[f"reservation_completed_{id_request}"] = True
                 return redirect("reservation_success")
             else:
                 messages.error(
@@ -111,7 +166,6 @@ def reservation_client_information(
         client_data_form = ClientDataForm(initial=initial_data)
 
     context = {
-        "reservation_request_id": reservation_request_id,
         "id_request": id_request,
         "ar": reservation_request_obj,
         "form": reservation_form,
@@ -136,6 +190,9 @@ def create_reservation(
 
     customer = CustomUser.objects.filter(email=email).first()
 
+    if reservation_request_obj.pk is None:
+        reservation_request_obj.save()
+
     reservation = Reservation.objects.create(
         reservation_request=reservation_request_obj,
         customer=customer,
@@ -12,7 +12,7 @@ class ServiceListView(ListView):
     model = Service
     template_name = "services/services_list.html"
     context_object_name = "services"
-    queryset = Service.objects.all()
+    queryset = Service.objects.select_related("category")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -25,6 +25,7 @@ class ManageServicesListView(OwnerRequiredMixin, ListView):
     model = Service
     template_name = "services/manage_services_list.html"
     context_object_name = "services"
+    queryset = Service.objects.select_related("category")
 
 
 class ServiceCreateView(OwnerRequiredMixin, CreateView):
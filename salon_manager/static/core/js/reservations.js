@@ -7,6 +7,11 @@ let staffId = $('#staff_id').val() || null;
 // const service_id = $('#djangoAppt-wrapper').data('service-id');
 let previouslySelectedCell = null;
 let isRequestInProgress = false;
+// Slots of a whole range of dates, fetched once and reused for every date
+// clicked within it.
+let loadedRange = null;
+let slotsByDate = {};
+let daysOffInRange = [];
 
 
 const calendar = new FullCalendar.Calendar(calendarEl, {
@@ -142,6 +147,7 @@ body.on('click', '.btn-submit-appointment', function () {
 
 $('#staff_id').on('change', function () {
     staffId = $(this).val() || null;  // If staffId is an empty string, set it to null
+    loadedRange = null;
     let currentDate = null
     if (selectedDate == null) {
         currentDate = moment.tz(timezone).format('YYYY-MM-DD');
@@ -218,10 +224,75 @@ function formatTime(date) {
     return (hours < 10 ? '0' + hours : hours) + ':' + (minutes < 10 ? '0' + minutes : minutes);
 }
 
+function toDateString(dt) {
+    return dt.toISOString().split('T')[0];
+}
+
+function slotsRangeFor(selectedDate) {
+    // The visible dates when they include the selected one, otherwise the
+    // week starting on it.
+    const view = calendar.view;
+    const start = toDateString(view.activeStart);
+    const end = toDateString(new Date(view.activeEnd.getTime() - 86400000));
+    if (start <= selectedDate && selectedDate <= end) {
+        return {start: start, end: end};
+    }
+    return {
+        start: selectedDate,
+        end: moment.utc(selectedDate).add(6, 'days').format('YYYY-MM-DD'),
+    };
+}
+
+function loadSlotsRange(selectedDate, staffId, callback) {
+    if (loadedRange && loadedRange.staffId === staffId
+        && loadedRange.start <= selectedDate && selectedDate <= loadedRange.end) {
+        callback(true);
+        return;
+    }
+    const range = slotsRangeFor(selectedDate);
+    $.ajax({
+        url: availableSlotsRangeURL,
+        data: {
+            'start': range.start,
+            'end': range.end,
+            'staff_member': staffId,
+            'service_id': serviceId,
+        },
+        dataType: 'json',
+        success: function (data) {
+            if (data.error) {
+                console.error('Error fetching available slots:', data.message);
+                callback(false);
+                return;
+            }
+            loadedRange = {staffId: staffId, start: range.start, end: range.end};
+            slotsByDate = data.slots;
+            daysOffInRange = data.non_working_days;
+            callback(true);
+        },
+        error: function () {
+            callback(false);
+        }
+    });
+}
+
+function daySlots(selectedDate) {
+    // Same shape as a single day's answer from the slots endpoint.
+    const slots = slotsByDate[selectedDate] || [];
+    let message = noAvailabilityTxt;
+    if (daysOffInRange.includes(selectedDate)) {
+        message = dayOffTxt;
+    }
+    return {
+        available_slots: slots,
+        date_chosen: moment.utc(selectedDate).locale('en').format('ddd, MMMM DD, YYYY'),
+        message: message,
+    };
+}
+
 function getAvailableSlots(selectedDate, staffId = null) {
     // Update the slot list with the available slots for the selected date
     const slotList = $('#slot-list');
-    const slotContainer = $('.slot-container');
     const errorMessageContainer = $('.error-message');
 
     // Clear previous error messages and slots
@@ -243,12 +314,6 @@ function getAvailableSlots(selectedDate, staffId = null) {
         return; // Exit the function early
     }
 
-    let ajaxData = {
-        'selected_date': selectedDate,
-        'staff_member': staffId,
-        'service_id': serviceId,
-    };
-
     fetchNonWorkingDays(staffId, function (nonWorkingDays) {
         // Check if nonWorkingDays is an array
         if (Array.isArray(nonWorkingDays)) {
@@ -261,78 +326,80 @@ function getAvailableSlots(selectedDate, staffId = null) {
         }
     });
 
-    // Send an AJAX request to get the available slots for the selected date
+    // Slots come from the range loaded for the calendar; only a date outside
+    // of it sends a request
     if (isRequestInProgress) {
         return; // Exit the function if a request is already in progress
     }
     isRequestInProgress = true;
-    $.ajax({
-        url: availableSlotsAjaxURL,
-        data: ajaxData,
-        dataType: 'json',
-        success: function (data) {
-            if (data.available_slots.length === 0) {
-                const selectedDateObj = moment.tz(selectedDate, timezone);
-                const selectedD = selectedDateObj.toDate();
-                const today = new Date();
-                today.setHours(0, 0, 0, 0);
-
-                if (selectedD < today) {
-                    // Show an error message
-                    errorMessageContainer.append('<p class="djangoAppt_no-availability-text">' + dateInPastErrorTxt + '</p>');
-                    if (slotContainer.find('.djangoAppt_btn-request-next-slot').length === 0) {
-                        slotContainer.append(`<button class="btn btn-danger djangoAppt_btn-request-next-slot" data-service-id="${serviceId}">` + requestNonAvailableSlotBtnTxt + `</button>`);
-                    }
-                    // Disable the 'submit' button
-                    $('.btn-submit-appointment').attr('disabled', 'disabled');
-                } else {
-                    errorMessageContainer.find('.djangoAppt_no-availability-text').remove();
-                    if (errorMessageContainer.find('.djangoAppt_no-availability-text').length === 0) {
-                        errorMessageContainer.append(`<p class="djangoAppt_no-availability-text">${data.message}</p>`);
-                    }
-                    // Check if the returned message is 'No availability'
-                    if (data.message.toLowerCase() === 'no availability') {
-                        if (slotContainer.find('.djangoAppt_btn-request-next-slot').length === 0) {
-                            slotContainer.append(`<button class="btn btn-danger djangoAppt_btn-request-next-slot" data-service-id="${serviceId}">` + requestNonAvailableSlotBtnTxt + `</button>`);
-                        }
-                    } else {
-                        $('.djangoAppt_btn-request-next-slot').remove();
-                    }
+    loadSlotsRange(selectedDate, staffId, function (loaded) {
+        isRequestInProgress = false;
+        if (loaded) {
+            showAvailableSlots(selectedDate, daySlots(selectedDate));
+        }
+    });
+}
+
+function showAvailableSlots(selectedDate, data) {
+    const slotContainer = $('.slot-container');
+    const errorMessageContainer = $('.error-message');
+    const slotList = $('#slot-list');
+    if (data.available_slots.length === 0) {
+        const selectedDateObj = moment.tz(selectedDate, timezone);
+        const selectedD = selectedDateObj.toDate();
+        const today = new Date();
+        today.setHours(0, 0, 0, 0);
+
+        if (selectedD < today) {
+            // Show an error message
+            errorMessageContainer.append('<p class="djangoAppt_no-availability-text">' + dateInPastErrorTxt + '</p>');
+            if (slotContainer.find('.djangoAppt_btn-request-next-slot').length === 0) {
+                slotContainer.append(`<button class="btn btn-danger djangoAppt_btn-request-next-slot" data-service-id="${serviceId}">` + requestNonAvailableSlotBtnTxt + `</button>`);
+            }
+            // Disable the 'submit' button
+            $('.btn-submit-appointment').attr('disabled', 'disabled');
+        } else {
+            errorMessageContainer.find('.djangoAppt_no-availability-text').remove();
+            if (errorMessageContainer.find('.djangoAppt_no-availability-text').length === 0) {
+                errorMessageContainer.append(`<p class="djangoAppt_no-availability-text">${data.message}</p>`);
+            }
+            // Check if the returned message is 'No availability'
+            if (data.message === noAvailabilityTxt) {
+                if (slotContainer.find('.djangoAppt_btn-request-next-slot').length === 0) {
+                    slotContainer.append(`<button class="btn btn-danger djangoAppt_btn-request-next-slot" data-service-id="${serviceId}">` + requestNonAvailableSlotBtnTxt + `</button>`);
                 }
             } else {
-                // remove the button to request for next available slot
-                $('.djangoAppt_no-availability-text').remove();
                 $('.djangoAppt_btn-request-next-slot').remove();
-                const uniqueSlots = [...new Set(data.available_slots)]; // remove duplicates
-                for (let i = 0; i < uniqueSlots.length; i++) {
-                    slotList.append('<li class="djangoAppt_appointment-slot">' + uniqueSlots[i] + '</li>');
-                }
+            }
+        }
+    } else {
+        // remove the button to request for next available slot
+        $('.djangoAppt_no-availability-text').remove();
+        $('.djangoAppt_btn-request-next-slot').remove();
+        const uniqueSlots = [...new Set(data.available_slots)]; // remove duplicates
+        for (let i = 0; i < uniqueSlots.length; i++) {
+            slotList.append('<li class="djangoAppt_appointment-slot">' + uniqueSlots[i] + '</li>');
+        }
 
-                // Attach click event to the slots
-                $('.djangoAppt_appointment-slot').on('click', function () {
-                    // Remove the 'selected' class from all other appointment slots
-                    $('.djangoAppt_appointment-slot').removeClass('selected');
+        // Attach click event to the slots
+        $('.djangoAppt_appointment-slot').on('click', function () {
+            // Remove the 'selected' class from all other appointment slots
+            $('.djangoAppt_appointment-slot').removeClass('selected');
 
-                    // Add the 'selected' class to the clicked appointment slot
-                    $(this).addClass('selected');
+            // Add the 'selected' class to the clicked appointment slot
+            $(this).addClass('selected');
 
-                    // Enable the submit button
-                    $('.btn-submit-appointment').removeAttr('disabled');
+            // Enable the submit button
+            $('.btn-submit-appointment').removeAttr('disabled');
 
-                    // Continue with the existing logic
-                    const selectedSlot = $(this).text();
-                    $('#service-datetime-chosen').text(data.date_chosen + ' ' + selectedSlot);
-                });
-            }
-            // Update the date chosen
-            $('.djangoAppt_date_chosen').text(data.date_chosen);
-            $('#service-datetime-chosen').text(data.date_chosen);
-            isRequestInProgress = false;
-        },
-        error: function() {
-            isRequestInProgress = false; // Ensure the flag is reset even if the request fails
-        }
-    });
+            // Continue with the existing logic
+            const selectedSlot = $(this).text();
+            $('#service-datetime-chosen').text(data.date_chosen + ' ' + selectedSlot);
+        });
+    }
+    // Update the date chosen
+    $('.djangoAppt_date_chosen').text(data.date_chosen);
+    $('#service-datetime-chosen').text(data.date_chosen);
 }
 
 function requestNextAvailableSlot(serviceId) {
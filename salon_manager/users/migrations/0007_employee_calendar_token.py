@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0006_alter_employee_user"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employee",
+            name="calendar_token",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True, unique=True
+            ),
+        ),
+    ]
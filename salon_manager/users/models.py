@@ -1,3 +1,5 @@
+import secrets
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from phonenumber_field.modelfields import PhoneNumberField
@@ -32,10 +34,20 @@ class Employee(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
     services = models.ManyToManyField(Service, related_name="employees")
+    # Secret part of the employee's calendar subscription URL.
+    calendar_token = models.CharField(
+        max_length=64, unique=True, null=True, blank=True, editable=False
+    )
 
     def __str__(self):
         return self.name
 
+    def get_calendar_token(self) -> str:
+        if not self.calendar_token:
+            self.calendar_token = secrets.token_urlsafe(32)
+            self.save(update_fields=["calendar_token"])
+        return self.calendar_token
+
     def save(self, *args, **kwargs):
         if self.user.role != CustomUser.Role.EMPLOYEE:
             self.user.role = CustomUser.Role.EMPLOYEE
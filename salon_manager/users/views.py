@@ -1,7 +1,7 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, render
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views.generic import CreateView, DeleteView, FormView, ListView, UpdateView
 from utils.mixins import OwnerRequiredMixin
 
@@ -56,11 +56,13 @@ def profile(request):
         user_form = UserUpdateForm(instance=request.user)
         profile_form = ProfileUpdateForm(instance=request.user.profile)
 
-    return render(
-        request,
-        "users/profile.html",
-        {"user_form": user_form, "profile_form": profile_form},
-    )
+    context = {"user_form": user_form, "profile_form": profile_form}
+    employee = Employee.objects.filter(user=request.user).first()
+    if employee is not None:
+        context["calendar_feed_url"] = request.build_absolute_uri(
+            reverse("employee_calendar_feed", args=[employee.get_calendar_token()])
+        )
+    return render(request, "users/profile.html", context)
 
 
 # Employee Views
@@ -68,6 +70,7 @@ class EmployeeListView(OwnerRequiredMixin, ListView):
     model = Employee
     template_name = "users/employee_list.html"
     context_object_name = "employees"
+    queryset = Employee.objects.prefetch_related("services")
 
 
 class EmployeeCreateView(OwnerRequiredMixin, CreateView):
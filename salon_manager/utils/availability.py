@@ -0,0 +1,165 @@
+from datetime import time
+from typing import Iterable, List, Tuple
+
+SLOT_STEP_MINUTES = 15
+
+MICROSECONDS_PER_MINUTE = 60 * 1_000_000
+
+BlockedRange = Tuple[int, int]
+
+
+def time_to_microseconds(value: time) -> int:
+    return (
+        (value.hour * 60 + value.minute) * 60 + value.second
+    ) * 1_000_000 + value.microsecond
+
+
+def blocked_start_ranges(
+    booked: Iterable[Tuple[time, time]], service_duration: int
+) -> List[BlockedRange]:
+    """Turn booked intervals into sorted, merged ranges of forbidden slot starts.
+
+    A slot ``[s, s + duration]`` collides with a booking ``[start, end]`` when
+    ``s <= end`` and ``s + duration >= start``, so every booking forbids the
+    closed range of starts ``[start - duration, end]``.
+    """
+    duration = service_duration * MICROSECONDS_PER_MINUTE
+    ranges = sorted(
+        (time_to_microseconds(start) - duration, time_to_microseconds(end))
+        for start, end in booked
+    )
+
+    merged: List[BlockedRange] = []
+    for low, high in ranges:
+        if low > high:
+            continue
+        if merged and low <= merged[-1][1]:
+            if high > merged[-1][1]:
+                merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return merged
+
+
+def exclude_booked(
+    slots: List[str], booked: Iterable[Tuple[time, time]], service_duration: int
+) -> List[str]:
+    """Drop the slots, given in time order, that collide with a booked interval."""
+    booked = list(booked)
+    if not slots or not booked:
+        return slots
+    blocked = blocked_start_ranges(booked, service_duration)
+
+    available_slots = []
+    index = 0
+    for slot in slots:
+        hour, minute = slot.split(":")
+        current = (int(hour) * 60 + int(minute)) * MICROSECONDS_PER_MINUTE
+        while index < len(blocked) and blocked[index][1] < current:
+            index += 1
+        if index == len(blocked) or blocked[index][0] > current:
+            available_slots.append(slot)
+    return available_slots
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _minute_floor(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _minute_ceil(value: time) -> int:
+    minutes = _minute_floor(value)
+    if value.second or value.microsecond:
+        minutes += 1
+    return minutes
+
+
+def _bit_range(start: int, end: int) -> int:
+    """Mask with bits ``start`` to ``end - 1`` set."""
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+class DayGrid:
+    """Availability of one employee on one day as minute-resolution bitmasks.
+
+    Bit ``k`` stands for the minute ``[k, k + 1]``. A booking marks every
+    minute it touches as busy, so a slot is free only when none of the minutes
+    it covers is busy: a slot touching a booking overlaps it. Times with
+    seconds are rounded outwards, so sub-minute data can only make the grid
+    more conservative.
+    """
+
+    __slots__ = ("windows", "busy")
+
+    def __init__(self, windows: Tuple[Tuple[int, int], ...], busy: int) -> None:
+        self.windows = windows
+        self.busy = busy
+
+    @classmethod
+    def build(
+        cls,
+        work_hours: Iterable[Tuple[time, time]],
+        booked: Iterable[Tuple[time, time]],
+    ) -> "DayGrid":
+        windows = tuple(
+            (_minute_ceil(start), _minute_floor(end)) for start, end in work_hours
+        )
+        busy = 0
+        for start, end in booked:
+            first = max(_minute_floor(start) - 1, 0)
+            last = min(_minute_ceil(end), MINUTES_PER_DAY - 1)
+            busy |= _bit_range(first, last + 1)
+        return cls(windows, busy)
+
+    def free_mask(self, window: Tuple[int, int]) -> int:
+        return _bit_range(*window) & ~self.busy
+
+    def free_blocks(self) -> List[Tuple[int, int, int]]:
+        """Free runs of every work window as ``(window index, first start, end)``.
+
+        ``first start`` is the first 15-minute candidate of the window that
+        falls inside the run, so slots can be read back from a block alone.
+        Runs too short to hold any candidate start are left out.
+        """
+        blocks = []
+        for index, window in enumerate(self.windows):
+            free = self.free_mask(window)
+            while free:
+                run_start = (free & -free).bit_length() - 1
+                run = free >> run_start
+                run_end = run_start + (run ^ (run + 1)).bit_length() - 1
+                free &= ~_bit_range(run_start, run_end)
+
+                offset = (run_start - window[0]) % SLOT_STEP_MINUTES
+                first_start = (
+                    run_start + (SLOT_STEP_MINUTES - offset) % SLOT_STEP_MINUTES
+                )
+                if first_start < run_end:
+                    blocks.append((index, first_start, run_end))
+        return blocks
+
+
+def minutes_to_time(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
+
+
+def slots_in_blocks(
+    blocks: Iterable[Tuple[time, time]], service_duration: int
+) -> List[str]:
+    """Slot starts of a service in precomputed free blocks.
+
+    Each block starts on its work day's 15-minute grid and ends where the
+    free time runs out, as produced by ``DayGrid.free_blocks``.
+    """
+    available_slots = []
+    for start, end in blocks:
+        current = _minute_floor(start)
+        last_start = _minute_floor(end) - service_duration
+        while current <= last_start:
+            available_slots.append(f"{current // 60:02d}:{current % 60:02d}")
+            current += SLOT_STEP_MINUTES
+    return available_slots
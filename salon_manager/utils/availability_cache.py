@@ -0,0 +1,108 @@
+import uuid
+from datetime import date
+from typing import Any, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Entries never get deleted one by one. Each key embeds a version token, and
+# invalidation throws the token away so that every entry built on it becomes
+# unreachable and simply expires.
+
+
+def _cache() -> Any:
+    return caches[getattr(settings, "AVAILABILITY_CACHE_ALIAS", "default")]
+
+
+def _timeout() -> int:
+    return getattr(settings, "AVAILABILITY_CACHE_TIMEOUT", 60 * 60)
+
+
+def _day_version_key(employee_id: int, day: date) -> str:
+    return f"availability:version:{employee_id}:{day.isoformat()}"
+
+
+def _employee_version_key(employee_id: int) -> str:
+    return f"availability:version:{employee_id}"
+
+
+def _version(key: str) -> str:
+    cache = _cache()
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, _timeout())
+        version = cache.get(key)
+    return version
+
+
+def _day_slots_key(employee_id: int, day: date, service_duration: int) -> str:
+    version = _version(_day_version_key(employee_id, day))
+    return f"availability:slots:{employee_id}:{day.isoformat()}:{service_duration}:{version}"
+
+
+def _non_working_days_key(employee_id: int, today: date, days_ahead: int) -> str:
+    version = _version(_employee_version_key(employee_id))
+    return f"availability:non_working_days:{employee_id}:{today.isoformat()}:{days_ahead}:{version}"
+
+
+def get_day_slots(
+    employee_id: int, day: date, service_duration: int
+) -> Optional[List[str]]:
+    return _cache().get(_day_slots_key(employee_id, day, service_duration))
+
+
+def set_day_slots(
+    employee_id: int, day: date, service_duration: int, slots: List[str]
+) -> None:
+    _cache().set(_day_slots_key(employee_id, day, service_duration), slots, _timeout())
+
+
+def get_non_working_days(
+    employee_id: int, today: date, days_ahead: int
+) -> Optional[List[str]]:
+    return _cache().get(_non_working_days_key(employee_id, today, days_ahead))
+
+
+def set_non_working_days(
+    employee_id: int, today: date, days_ahead: int, non_working_days: List[str]
+) -> None:
+    _cache().set(
+        _non_working_days_key(employee_id, today, days_ahead),
+        non_working_days,
+        _timeout(),
+    )
+
+
+def _invalidate(keys: List[str]) -> None:
+    # Drop the versions straight away and again once the surrounding
+    # transaction commits, so a reader racing the write cannot keep stale
+    # data alive under the new version.
+    _cache().delete_many(keys)
+    transaction.on_commit(lambda: _cache().delete_many(keys))
+
+
+def invalidate_day(employee_id: Optional[int], day: Optional[date]) -> None:
+    """Forget cached slots of one employee on one day."""
+    if employee_id is None or day is None:
+        return
+    _invalidate([_day_version_key(employee_id, day)])
+
+
+def invalidate_work_day(employee_id: Optional[int], day: Optional[date]) -> None:
+    """Forget slots of the day and the employee's cached non-working days."""
+    if employee_id is None or day is None:
+        return
+    _invalidate(
+        [_day_version_key(employee_id, day), _employee_version_key(employee_id)]
+    )
+
+
+def invalidate_employee(employee_id: Optional[int], days: Iterable[date]) -> None:
+    """Forget slots of the given days and the employee's non-working days."""
+    if employee_id is None:
+        return
+    _invalidate(
+        [_day_version_key(employee_id, day) for day in days]
+        + [_employee_version_key(employee_id)]
+    )
@@ -18,3 +18,4 @@ class ErrorCode(Enum):
     SERVICE_ID_REQUIRED = auto()
     STAFF_MEMBER_NOT_FOUND = auto()
     NO_AVAILABLE_SLOTS = auto()
+    SYNC_CURSOR_EXPIRED = auto()
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from datetime import timezone as dt_timezone
+from typing import Iterable, Iterator
+
+from django.utils import timezone
+
+# A minimal RFC 5545 writer for read-only subscription feeds. Times are
+# written in UTC so that calendar apps need no VTIMEZONE definitions.
+
+PRODUCT_ID = "-//Salon Manager//Schedule//EN"
+MAX_LINE_OCTETS = 75
+
+
+@dataclass(frozen=True)
+class CalendarEvent:
+    uid: str
+    start: datetime
+    end: datetime
+    summary: str
+    stamp: datetime
+    description: str = ""
+
+
+def local_datetime(day: date, at: time) -> datetime:
+    """A wall-clock time of the salon as an aware datetime."""
+    return timezone.make_aware(datetime.combine(day, at))
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _utc(value: datetime) -> str:
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _fold(line: str) -> Iterator[str]:
+    """Split a content line into chunks of at most 75 octets."""
+    chunk, size = "", 0
+    for char in line:
+        width = len(char.encode())
+        if size + width > MAX_LINE_OCTETS:
+            yield chunk
+            # Continuation lines start with a space that counts as an octet.
+            chunk, size = " ", 1
+        chunk += char
+        size += width
+    yield chunk
+
+
+def _event_lines(event: CalendarEvent) -> Iterator[str]:
+    yield "BEGIN:VEVENT"
+    yield f"UID:{event.uid}"
+    yield f"DTSTAMP:{_utc(event.stamp)}"
+    yield f"DTSTART:{_utc(event.start)}"
+    yield f"DTEND:{_utc(event.end)}"
+    yield f"SUMMARY:{escape_text(event.summary)}"
+    if event.description:
+        yield f"DESCRIPTION:{escape_text(event.description)}"
+    yield "END:VEVENT"
+
+
+def build_calendar(name: str, events: Iterable[CalendarEvent]) -> str:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ]
+    for event in events:
+        lines.extend(_event_lines(event))
+    lines.append("END:VCALENDAR")
+    return "".join(f"{folded}\r\n" for line in lines for folded in _fold(line))
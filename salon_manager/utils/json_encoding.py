@@ -0,0 +1,88 @@
+import json
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# The backends write the same bytes for what the views send: compact
+# separators, UTF-8 text, string, integer and None keys, and dates, times,
+# Decimals, UUIDs and lazy translations formatted the way DjangoJSONEncoder
+# formats them. They differ on edge cases only: orjson writes NaN and
+# infinity as null where the standard library writes non-standard tokens,
+# and writes date keys, which the standard library refuses. Anything orjson
+# cannot encode, such as integers beyond 64 bits, goes to the standard
+# library instead.
+
+_django_default = DjangoJSONEncoder().default
+
+
+def _stdlib_dumps(data: Any) -> bytes:
+    return json.dumps(
+        data, cls=DjangoJSONEncoder, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+BACKENDS: Dict[str, Callable[[Any], bytes]] = {"stdlib": _stdlib_dumps}
+
+if orjson is not None:
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+    def _orjson_default(value: Any) -> Any:
+        # Subclasses of the builtins come here: form ErrorLists are also
+        # UserLists whose list part is empty, so orjson would write them
+        # as []. Dates and times go through the Django formatting as well;
+        # orjson would otherwise keep microseconds and write UTC as "+00:00".
+        for builtin in (str, int, list, dict):
+            if isinstance(value, builtin):
+                return builtin(value)
+        return _django_default(value)
+
+    def _orjson_dumps(data: Any) -> bytes:
+        try:
+            return orjson.dumps(data, default=_orjson_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            return _stdlib_dumps(data)
+
+    BACKENDS["orjson"] = _orjson_dumps
+
+
+def backend_name() -> str:
+    """The backend selected by ``JSON_ENCODER_BACKEND`` (``"auto"`` picks
+    orjson when it is installed)."""
+    name = getattr(settings, "JSON_ENCODER_BACKEND", "auto")
+    if name == "auto":
+        return "orjson" if "orjson" in BACKENDS else "stdlib"
+    if name not in BACKENDS:
+        raise ImproperlyConfigured(
+            f"JSON_ENCODER_BACKEND {name!r} is not available, "
+            f"choose one of: auto, {', '.join(sorted(BACKENDS))}"
+        )
+    return name
+
+
+def dumps(data: Any) -> bytes:
+    return BACKENDS[backend_name()](data)
+
+
+class FastJsonResponse(JsonResponse):
+    """``JsonResponse`` encoded with the configured backend."""
+
+    def __init__(self, data: Any, safe: bool = True, **kwargs: Any) -> None:
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+        kwargs.setdefault("content_type", "application/json")
+        HttpResponse.__init__(self, content=dumps(data), **kwargs)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+from django.conf import settings
+
+# Messages are published from ordinary synchronous code (signal handlers,
+# Celery tasks) and consumed by async streaming views. Without a Redis URL
+# everything stays inside the process, which is enough for a single server
+# and for tests. With LIVE_UPDATES_REDIS_URL set, messages go through a Redis
+# channel so that every node sees changes made on any other node.
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class InProcessSubscription:
+    def __init__(self, broker: "InProcessBroker", channel: str) -> None:
+        self._broker = broker
+        self._channel = channel
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+    def _deliver(self, message: Dict[str, Any]) -> None:
+        # A dashboard that stopped reading loses messages instead of
+        # growing the queue without bound.
+        if not self._queue.full():
+            self._queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next message, or ``None`` when nothing arrived within ``timeout``."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self._broker._unsubscribe(self._channel, self)
+
+
+class InProcessBroker:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[InProcessSubscription]] = {}
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._deliver, message)
+            except RuntimeError:
+                # The subscriber's event loop is gone.
+                self._unsubscribe(channel, subscription)
+
+    async def subscribe(self, channel: str) -> InProcessSubscription:
+        subscription = InProcessSubscription(self, channel)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, channel: str, subscription: InProcessSubscription) -> None:
+        with self._lock:
+            self._subscribers.get(channel, set()).discard(subscription)
+
+
+class RedisSubscription:
+    def __init__(self, client: Any, pubsub: Any) -> None:
+        self._client = client
+        self._pubsub = pubsub
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        message = await self._pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=timeout
+        )
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+    async def close(self) -> None:
+        try:
+            await self._pubsub.aclose()
+        finally:
+            await self._client.aclose()
+
+
+class RedisBroker:
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self._url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self._client.publish(channel, json.dumps(message))
+
+    async def subscribe(self, channel: str) -> RedisSubscription:
+        import redis.asyncio
+
+        # Async clients belong to the event loop they were created on, so
+        # each subscription has its own and closes it with the pubsub.
+        client = redis.asyncio.Redis.from_url(self._url)
+        subscription = RedisSubscription(client, client.pubsub())
+        try:
+            await subscription._pubsub.subscribe(channel)
+        except BaseException:
+            await subscription.close()
+            raise
+        return subscription
+
+
+_broker: Optional[Tuple[Optional[str], Any]] = None
+
+
+def get_broker() -> Any:
+    """The broker for the configured transport, created once per process."""
+    global _broker
+    url = getattr(settings, "LIVE_UPDATES_REDIS_URL", None)
+    if _broker is None or _broker[0] != url:
+        _broker = (url, RedisBroker(url) if url else InProcessBroker())
+    return _broker[1]
+
+
+def publish(channel: str, message: Dict[str, Any]) -> None:
+    get_broker().publish(channel, message)
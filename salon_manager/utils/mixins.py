@@ -1,6 +1,9 @@
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.db.models import QuerySet
 from django.shortcuts import redirect
 
+from .pagination import keyset_page
+
 
 class OwnerRequiredMixin(UserPassesTestMixin):
     def test_func(self):
@@ -10,3 +13,50 @@ class OwnerRequiredMixin(UserPassesTestMixin):
         if self.request.user.is_authenticated:
             return redirect("home")
         return super().handle_no_permission()
+
+
+class KeysetPaginationMixin:
+    """Pages a ListView newest first by ``(keyset_date_field,
+    keyset_id_field)`` and filters it with ``filter_form_class``, whose
+    ``date_from``, ``date_to`` and ``cursor`` fields it reads."""
+
+    page_size = 50
+    keyset_date_field = "date"
+    keyset_id_field = "id"
+    filter_form_class = None
+
+    def filter_queryset(self, queryset: QuerySet, filters: dict) -> QuerySet:
+        if filters.get("date_from"):
+            queryset = queryset.filter(
+                **{f"{self.keyset_date_field}__gte": filters["date_from"]}
+            )
+        if filters.get("date_to"):
+            queryset = queryset.filter(
+                **{f"{self.keyset_date_field}__lte": filters["date_to"]}
+            )
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        filter_form = self.filter_form_class(self.request.GET)
+        # Invalid fields are left out of cleaned_data and simply not applied.
+        filter_form.is_valid()
+        filters = filter_form.cleaned_data
+        page = keyset_page(
+            self.filter_queryset(self.object_list, filters),
+            self.keyset_date_field,
+            self.keyset_id_field,
+            filters.get("cursor"),
+            self.page_size,
+        )
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
+        context["filter_form"] = filter_form
+        params = self.request.GET.copy()
+        params.pop("cursor", None)
+        context["first_page_query"] = (
+            params.urlencode() if filters.get("cursor") else None
+        )
+        context["next_page_query"] = None
+        if page.next_cursor:
+            params["cursor"] = page.next_cursor
+            context["next_page_query"] = params.urlencode()
+        return context
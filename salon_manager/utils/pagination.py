@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Optional
+
+from django.db.models import F, Q, QuerySet
+
+# History lists are paged by keyset: a page starts after the (date, id) of
+# the last row shown, so the database walks an index from there instead of
+# skipping OFFSET rows, and a page is one row longer than shown to tell
+# whether another one follows instead of counting the table.
+
+
+@dataclass
+class KeysetPage:
+    object_list: list[Any]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(day: date, pk: int) -> str:
+    return f"{day.isoformat()}.{pk}"
+
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    """Raises ``ValueError`` for a cursor not made by ``encode_cursor``."""
+    day, _, pk = cursor.partition(".")
+    return date.fromisoformat(day), int(pk)
+
+
+def keyset_queryset(
+    queryset: QuerySet, date_field: str, id_field: str, cursor: Optional[str]
+) -> QuerySet:
+    """``queryset`` newest first by ``(date, id)``, from after ``cursor``."""
+    queryset = queryset.annotate(_page_date=F(date_field), _page_id=F(id_field))
+    if cursor:
+        day, pk = decode_cursor(cursor)
+        # The redundant bound lets the index scan start at the cursor.
+        queryset = queryset.filter(**{f"{date_field}__lte": day}).filter(
+            Q(**{f"{date_field}__lt": day})
+            | Q(**{date_field: day, f"{id_field}__lt": pk})
+        )
+    return queryset.order_by(f"-{date_field}", f"-{id_field}")
+
+
+def keyset_page(
+    queryset: QuerySet,
+    date_field: str,
+    id_field: str,
+    cursor: Optional[str],
+    page_size: int,
+) -> KeysetPage:
+    rows = list(
+        keyset_queryset(queryset, date_field, id_field, cursor)[: page_size + 1]
+    )
+    if len(rows) <= page_size:
+        return KeysetPage(rows, None)
+    rows = rows[:page_size]
+    return KeysetPage(rows, encode_cursor(rows[-1]._page_date, rows[-1]._page_id))
@@ -0,0 +1,185 @@
+import logging
+import time as clock
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+
+from .support_functions import (
+    check_for_conflicting_reservation,
+    generate_random_id,
+    get_timestamp,
+)
+
+logger = logging.getLogger(__name__)
+
+# A customer picking a time gets a hold that lives only in the cache and
+# expires on its own. The ReservationRequest row is written once the booking
+# is completed, so abandoned funnels never touch the database.
+#
+# The holds of one employee on one day share an index entry. Every change to
+# it happens under a short lock taken with cache.add(), which is atomic on
+# both Redis and locmem, so checking for overlaps and writing the new hold
+# behave like a single compare-and-set.
+
+LOCK_TIMEOUT = 5
+LOCK_ATTEMPTS = 50
+LOCK_RETRY_DELAY = 0.02
+
+HeldRange = Tuple[time, time, float]
+
+
+@dataclass(frozen=True)
+class SlotHold:
+    token: str
+    employee_id: int
+    service_id: int
+    date: date
+    start_time: time
+    end_time: time
+
+    def to_reservation_request(self) -> Any:
+        """Unsaved ReservationRequest to persist when the booking completes."""
+        ReservationRequest = apps.get_model("reservations", "ReservationRequest")
+        return ReservationRequest(
+            date=self.date,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            service_id=self.service_id,
+            employee_id=self.employee_id,
+            id_request=self.token,
+        )
+
+
+class HoldLockTimeout(Exception):
+    pass
+
+
+def _cache() -> Any:
+    return caches[getattr(settings, "AVAILABILITY_CACHE_ALIAS", "default")]
+
+
+def _timeout() -> int:
+    return getattr(settings, "SLOT_HOLD_TIMEOUT", 15 * 60)
+
+
+def _hold_key(token: str) -> str:
+    return f"holds:{token}"
+
+
+def _index_key(employee_id: int, day: date) -> str:
+    return f"holds:index:{employee_id}:{day.isoformat()}"
+
+
+def _lock_key(employee_id: int, day: date) -> str:
+    return f"holds:lock:{employee_id}:{day.isoformat()}"
+
+
+@contextmanager
+def _day_lock(employee_id: int, day: date) -> Iterator[None]:
+    cache = _cache()
+    key = _lock_key(employee_id, day)
+    owner = generate_random_id()
+    for _ in range(LOCK_ATTEMPTS):
+        if cache.add(key, owner, LOCK_TIMEOUT):
+            break
+        clock.sleep(LOCK_RETRY_DELAY)
+    else:
+        raise HoldLockTimeout(key)
+    try:
+        yield
+    finally:
+        if cache.get(key) == owner:
+            cache.delete(key)
+
+
+def _live(index: Optional[Dict[str, HeldRange]]) -> Dict[str, HeldRange]:
+    now = clock.time()
+    return {token: held for token, held in (index or {}).items() if held[2] > now}
+
+
+def acquire_hold(
+    employee_id: int, service_id: int, day: date, start_time: time, end_time: time
+) -> Optional[SlotHold]:
+    """Hold the slot, or return ``None`` when a booking or hold overlaps it."""
+    cache = _cache()
+    with _day_lock(employee_id, day):
+        holds = _live(cache.get(_index_key(employee_id, day)))
+        if any(
+            start_time < held_end and end_time > held_start
+            for held_start, held_end, _ in holds.values()
+        ):
+            return None
+        if check_for_conflicting_reservation(employee_id, day, start_time, end_time):
+            return None
+
+        hold = SlotHold(
+            token=f"{get_timestamp()}{service_id}{generate_random_id()}",
+            employee_id=employee_id,
+            service_id=service_id,
+            date=day,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        holds[hold.token] = (start_time, end_time, clock.time() + _timeout())
+        cache.set_many(
+            {_hold_key(hold.token): hold, _index_key(employee_id, day): holds},
+            _timeout(),
+        )
+    return hold
+
+
+def get_hold(token: str) -> Optional[SlotHold]:
+    return _cache().get(_hold_key(token))
+
+
+def release_hold(hold: SlotHold) -> None:
+    """Drop the hold. When the day stays locked the hold is left to expire,
+    as the booking it was taken for is already saved or given up."""
+    cache = _cache()
+    try:
+        with _day_lock(hold.employee_id, hold.date):
+            holds = _live(cache.get(_index_key(hold.employee_id, hold.date)))
+            holds.pop(hold.token, None)
+            cache.set(_index_key(hold.employee_id, hold.date), holds, _timeout())
+            cache.delete(_hold_key(hold.token))
+    except HoldLockTimeout:
+        logger.warning("Slot hold %s left to expire", hold.token)
+
+
+def live_holds(employee_id: int, day: date) -> List[Tuple[time, time]]:
+    """Time ranges of the employee's unexpired holds on that day."""
+    holds = _live(_cache().get(_index_key(employee_id, day)))
+    return [(start_time, end_time) for start_time, end_time, _ in holds.values()]
+
+
+def live_holds_for_employees(
+    employee_ids: Iterable[int], day: date
+) -> Dict[int, List[Tuple[time, time]]]:
+    """``live_holds`` of many employees on one day with one cache round trip."""
+    keys = {_index_key(employee_id, day): employee_id for employee_id in employee_ids}
+    indexes = _cache().get_many(list(keys))
+    return {
+        keys[key]: [
+            (start_time, end_time) for start_time, end_time, _ in _live(index).values()
+        ]
+        for key, index in indexes.items()
+    }
+
+
+def live_holds_for_days(
+    employee_id: int, days: Iterable[date]
+) -> Dict[date, List[Tuple[time, time]]]:
+    """``live_holds`` for many days with one cache round trip."""
+    keys = {_index_key(employee_id, day): day for day in days}
+    indexes = _cache().get_many(list(keys))
+    return {
+        keys[key]: [
+            (start_time, end_time) for start_time, end_time, _ in _live(index).values()
+        ]
+        for key, index in indexes.items()
+    }
@@ -1,12 +1,22 @@
 import uuid
 from datetime import date, datetime, time, timedelta
-from typing import TYPE_CHECKING, Any, List, Optional
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from asgiref.sync import sync_to_async
 from django.apps import apps
 from django.db.models import QuerySet
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 
+from . import availability_cache, json_encoding
 from .error_codes import ErrorCode
 
 if TYPE_CHECKING:
@@ -24,86 +34,55 @@ def get_work_day_model():
     return apps.get_model("reservations", "WorkDay")
 
 
-def generate_available_slots(
+def get_reservation_request_model():
+    return apps.get_model("reservations", "ReservationRequest")
+
+
+def _overlap_exists(
+    rows: QuerySet,
     start_time: time,
     end_time: time,
-    service_duration: int,
-    existing_reservations: QuerySet["ReservationRequest"],
-) -> List[str]:
-    """Generate available time slots based on work hours and existing reservations"""
-    # Convert times to datetime for easier manipulation
-    base_date = datetime.now().date()
-    start_datetime = datetime.combine(base_date, start_time)
-    end_datetime = datetime.combine(base_date, end_time)
-
-    # Calculate slot duration in minutes
-    # Adding 15 minutes buffer between appointments
-    # slot_duration = timedelta(minutes=service_duration + 15)
-
-    # Create a list of existing reservation times
-    booked_slots = []
-    for reservation in existing_reservations:
-        start = reservation.start_time
-        # Calculate end time using the property from the model
-        end = reservation.end_time
-        booked_slots.append((start, end))
-
-    # Generate potential slots
-    available_slots = []
-    current_slot_start = start_datetime
-
-    while current_slot_start + timedelta(minutes=service_duration) <= end_datetime:
-        # Calculate slot end time
-        current_slot_end = current_slot_start + timedelta(minutes=service_duration)
-
-        # Check if slot overlaps with any existing reservation
-        is_available = True
-        for start, end in booked_slots:
-            # Convert all times to comparable format
-            res_start = datetime.combine(base_date, start)
-            res_end = datetime.combine(base_date, end)
-
-            # Check for overlap
-            if current_slot_start <= res_end and current_slot_end >= res_start:
-                is_available = False
-                break
-
-        # If slot is available, add to list
-        if is_available:
-            available_slots.append(current_slot_start.strftime("%H:%M"))
-
-        # Move to next potential slot (15-minute intervals)
-        current_slot_start += timedelta(minutes=15)
-    return available_slots
+    exclude_id: Optional[int] = None,
+) -> bool:
+    """Whether any row overlaps ``[start_time, end_time)``, as one EXISTS query."""
+    rows = rows.filter(start_time__lt=end_time, end_time__gt=start_time)
+    if exclude_id:
+        rows = rows.exclude(pk=exclude_id)
+    return rows.exists()
 
 
 def check_for_conflicting_reservation(
+    employee_id: Optional[int],
     reservation_date: date,
     start_time: time,
-    duration: int,
-    conflicting_reservations: QuerySet["ReservationRequest"],
+    end_time: time,
     exclude_id: Optional[int] = None,
 ) -> bool:
-    """Check if there's a conflicting reservation"""
-    # Calculate end time
-    start_datetime = datetime.combine(reservation_date, start_time)
-    end_datetime = start_datetime + timedelta(minutes=duration)
-    end_time = end_datetime.time()
-
-    # Exclude current reservation if updating
-    if exclude_id:
-        conflicting_reservations = conflicting_reservations.exclude(id=exclude_id)
-
-    # Check for time conflicts
-    for reservation in conflicting_reservations:
-        res_start = reservation.start_time
-        res_end = reservation.end_time
+    """Check if the employee already has a reservation overlapping the slot"""
+    return _overlap_exists(
+        get_reservation_request_model().objects.filter(
+            employee_id=employee_id, date=reservation_date
+        ),
+        start_time,
+        end_time,
+        exclude_id,
+    )
 
-        # Check if slots overlap
-        if start_time < res_end and end_time > res_start:
-            return True
 
-    return False
+def check_for_conflicting_work_day(
+    employee_id: int,
+    work_date: date,
+    start_time: time,
+    end_time: time,
+    exclude_id: Optional[int] = None,
+) -> bool:
+    """Check if the employee already works hours overlapping these on that date"""
+    return _overlap_exists(
+        get_work_day_model().objects.filter(employee_id=employee_id, date=work_date),
+        start_time,
+        end_time,
+        exclude_id,
+    )
 
 
 def json_response(
@@ -120,7 +99,55 @@ def json_response(
         response_data["errorCode"] = error_code.value
     if custom_data:
         response_data.update(custom_data)
-    return JsonResponse(response_data, status=status, **kwargs)
+    return json_encoding.FastJsonResponse(response_data, status=status, **kwargs)
+
+
+def _json_array_chunks(items: Iterable[Any], batch_size: int) -> Iterator[bytes]:
+    dumps = json_encoding.dumps
+    separator = b""
+    yield b"["
+    batch: List[bytes] = []
+    for item in items:
+        batch.append(dumps(item))
+        if len(batch) == batch_size:
+            yield separator + b",".join(batch)
+            separator, batch = b",", []
+    if batch:
+        yield separator + b",".join(batch)
+    yield b"]"
+
+
+async def _async_chunks(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    # Every chunk is encoded in the thread the view ran in, where its lazy
+    # queryset keeps its database connection.
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def streaming_json_response(
+    items: Iterable[Any],
+    batch_size: int = 500,
+    asynchronous: bool = False,
+    **kwargs: Any,
+) -> StreamingHttpResponse:
+    """Return a JSON array that is encoded while it is sent, with the
+    configured JSON backend.
+
+    Only ``batch_size`` encoded items are held at once, so pass a lazy
+    iterable such as ``queryset.iterator()`` to keep memory flat. Under ASGI
+    pass ``asynchronous=True``: Django would otherwise read a synchronous
+    stream into a list before sending any of it.
+    """
+    chunks = _json_array_chunks(items, batch_size)
+    return StreamingHttpResponse(
+        _async_chunks(chunks) if asynchronous else chunks,
+        content_type="application/json",
+        **kwargs,
+    )
 
 
 def handle_invalid_form(slot_form: "SlotForm") -> JsonResponse:
@@ -183,16 +210,16 @@ def time_difference(time1: time, time2: time) -> timedelta:
 def _calculate_non_working_days(
     employee: "Employee", days_ahead: int = 60
 ) -> List[str]:
-    WorkDay = get_work_day_model()
+    from reservations.schedules import working_dates
+
+    today = timezone.localdate()
+    cached = availability_cache.get_non_working_days(employee.id, today, days_ahead)
+    if cached is not None:
+        return cached
 
-    today = timezone.now().date()
     end_date = today + timedelta(days=days_ahead)
 
-    working_days = set(
-        WorkDay.objects.filter(
-            employee=employee, date__range=(today, end_date)
-        ).values_list("date", flat=True)
-    )
+    working_days = working_dates(employee.id, today, end_date)
 
     non_working_days = []
 
@@ -202,6 +229,9 @@ def _calculate_non_working_days(
             formatted_date = current_date.strftime("%Y-%m-%d")
             non_working_days.append(formatted_date)
 
+    availability_cache.set_non_working_days(
+        employee.id, today, days_ahead, non_working_days
+    )
     return non_working_days
 
 